@@ -0,0 +1,63 @@
+import math
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wave_geometry import WaveGeometry
+
+HEIGHT = 600
+WAVE_CENTER = HEIGHT - 200
+AMPLITUDE = 4
+PERIOD = 50
+
+
+def legacy_frame(width, step, offset):
+    # The per-frame loop LiquidAnimation.animate used before WaveGeometry
+    water_coords = [(0, HEIGHT)]
+    for x in range(0, width + 1, step):
+        y = WAVE_CENTER + AMPLITUDE * math.sin((x + offset) / PERIOD)
+        water_coords.append((x, y))
+    water_coords.append((width, HEIGHT))
+    return tuple(coord for point in water_coords for coord in point)
+
+
+def per_frame_us(fn, number):
+    # Best of five runs, in microseconds per frame
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    print(f"{'points':>8} {'legacy us':>11} {'geometry us':>12} {'+tolist us':>11} {'speedup':>8}")
+    for points in (85, 1_000, 10_000, 100_000):
+        width = 1400
+        step = max(1, width // points)
+        if points > width:
+            width, step = points, 1
+        geometry = WaveGeometry(width, HEIGHT, WAVE_CENTER, AMPLITUDE, PERIOD, step)
+        number = max(10, 200_000 // points)
+
+        offset = [0]
+
+        def legacy():
+            offset[0] += 1
+            legacy_frame(width, step, offset[0])
+
+        def vectorized():
+            offset[0] += 1
+            geometry.update(offset[0])
+
+        def vectorized_for_tk():
+            offset[0] += 1
+            geometry.update(offset[0]).tolist()
+
+        legacy_us = per_frame_us(legacy, number)
+        geometry_us = per_frame_us(vectorized, number)
+        tk_us = per_frame_us(vectorized_for_tk, number)
+        print(f"{geometry.point_count:>8} {legacy_us:>11.1f} {geometry_us:>12.1f} {tk_us:>11.1f} "
+              f"{legacy_us / tk_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+from collections import Counter
+
+from offscreen import HeadlessCanvas
+
+# Canvas methods that are a round-trip to the Tcl interpreter on a real tk.Canvas
+TK_CALLS = ["create_polygon", "create_rectangle", "create_text", "coords", "move", "itemconfig", "itemcget",
+            "tag_lower", "delete", "batch"]
+
+
+class RecordingCanvas(HeadlessCanvas):
+    # Stand-in for tk.Canvas that keeps item state in memory and counts every
+    # call that would have been a round-trip to the Tcl interpreter
+    def __init__(self, width=800, height=600):
+        super().__init__(width, height)
+        self.calls = Counter()
+
+    @property
+    def call_count(self):
+        return sum(self.calls.values())
+
+    def reset_calls(self):
+        self.calls.clear()
+
+
+def _recorded(name):
+    method = getattr(HeadlessCanvas, name)
+
+    def recorded(self, *args, **kwargs):
+        self.calls[name] += 1
+        return method(self, *args, **kwargs)
+
+    recorded.__name__ = name
+    return recorded
+
+
+for _name in TK_CALLS:
+    setattr(RecordingCanvas, _name, _recorded(_name))
+RecordingCanvas.itemconfigure = RecordingCanvas.itemconfig
@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import decode_frame, read_websocket_message
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def masked_frame(payload, opcode=0x1):
+    # Client frames must be masked
+    mask = os.urandom(4)
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, 0x80 | length)
+    else:
+        header = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, length)
+    masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return header + mask + masked
+
+
+async def connect(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    response = await reader.readuntil(b"\r\n\r\n")
+    if b" 101 " not in response.split(b"\r\n")[0]:
+        raise ConnectionError(response.decode("latin-1"))
+    return reader, writer
+
+
+async def run_client(host, port, seconds, rng, results):
+    # One simulated student: drops a few objects, drags the slider and counts what comes back
+    reader, writer = await connect(host, port)
+    opcode, payload = await read_websocket_message(reader)
+    materials = json.loads(payload)["materials"]
+    frames = received = 0
+    latest_tick = None
+    deadline = time.monotonic() + seconds
+    next_input = time.monotonic()
+    while time.monotonic() < deadline:
+        if time.monotonic() >= next_input:
+            if rng.random() < 0.3:
+                message = {"type": "add", "material": materials[rng.integers(len(materials))]}
+            else:
+                message = {"type": "density", "value": round(float(rng.uniform(0.5, 2.0)), 2)}
+            writer.write(masked_frame(json.dumps(message).encode()))
+            next_input += rng.uniform(0.2, 1.0)
+        try:
+            opcode, payload = await asyncio.wait_for(read_websocket_message(reader), timeout=1.0)
+        except asyncio.TimeoutError:
+            continue
+        received += len(payload)
+        if opcode == 0x2:
+            frames += 1
+            latest_tick = decode_frame(payload)["tick"]
+    writer.write(masked_frame(b"\x03\xe8", opcode=0x8))
+    writer.close()
+    results.append({"frames": frames, "bytes": received, "tick": latest_tick})
+
+
+async def run_clients(host, port, clients, seconds, seed):
+    results = []
+    rngs = [np.random.default_rng(seed + i) for i in range(clients)]
+    await asyncio.gather(*(run_client(host, port, seconds, rng, results) for rng in rngs))
+    return results
+
+
+def fetch_stats(host, port):
+    with urllib.request.urlopen(f"http://{host}:{port}/stats") as response:
+        return json.load(response)
+
+
+def wait_for_server(host, port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return fetch_stats(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open many WebSocket sessions against the simulator server.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--external", action="store_true", help="use a server that is already running")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if not args.external:
+        server = subprocess.Popen([sys.executable, os.path.join(CODE_DIR, "server.py"), "--host", args.host,
+                                   "--port", str(args.port)], stdout=subprocess.DEVNULL)
+    try:
+        wait_for_server(args.host, args.port)
+        started = time.monotonic()
+        results = asyncio.run(run_clients(args.host, args.port, args.clients, args.seconds, args.seed))
+        elapsed = time.monotonic() - started
+        stats = fetch_stats(args.host, args.port)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    fps = np.array([result["frames"] for result in results]) / elapsed
+    kilobytes = sum(result["bytes"] for result in results) / elapsed / 1024
+    print(f"clients            {len(results)}")
+    print(f"frames/s per client min {fps.min():.1f}  mean {fps.mean():.1f}")
+    print(f"traffic            {kilobytes:.1f} KiB/s total")
+    print(f"server fps         {stats.get('fps')}  broadcast p95 {stats.get('frame_ms_p95')} ms  "
+          f"p99 {stats.get('frame_ms_p99')} ms")
+    print(f"server dropped     {stats.get('dropped_frames')} ticks, {stats.get('dropped_client_frames')} client frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+
+from startup import FRAME_CACHE_PATH, MILESTONES
+
+# What main.py used to import before drawing anything; it now imports them after the first paint
+DEFERRED_MODULES = ["simulation", "scene", "physics", "scheduler", "instrumentation", "materials", "layers",
+                    "executor", "recording", "uncertainty", "buoyancy", "utils"]
+
+IMPORT_PROBE = """
+import sys, time
+started = time.perf_counter()
+import {modules}
+print(time.perf_counter() - started, "numpy" in sys.modules)
+"""
+
+
+def time_import(modules, repeat=5):
+    # Median import time in a fresh interpreter each run, so nothing is already loaded
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(modules=", ".join(modules))],
+                                cwd=CODE_DIR, capture_output=True, text=True, check=True)
+        seconds, numpy_loaded = result.stdout.split()
+        samples.append(float(seconds) * 1000)
+    return statistics.median(samples), numpy_loaded == "True"
+
+
+def time_interpreter(repeat=5):
+    samples = []
+    for _ in range(repeat):
+        spawned = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        samples.append((time.perf_counter() - spawned) * 1000)
+    return statistics.median(samples)
+
+
+def time_launch(repeat=5, cold=False):
+    # Milliseconds from spawning `main.py --startup-report` to each milestone (median over runs).
+    # A cold launch has no first-frame cache to draw from. Returns (None, reason) without a display.
+    samples = []
+    for _ in range(repeat):
+        if cold and os.path.exists(FRAME_CACHE_PATH):
+            os.remove(FRAME_CACHE_PATH)
+        spawned = time.time()
+        result = subprocess.run([sys.executable, os.path.join(CODE_DIR, "main.py"), "--startup-report"],
+                                cwd=CODE_DIR, capture_output=True, text=True, timeout=60)
+        if result.returncode:
+            return None, (result.stderr.strip().splitlines() or ["failed"])[-1]
+        times = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append({name: (times[name] - spawned) * 1000 for name in MILESTONES})
+    return {name: statistics.median(sample[name] for sample in samples) for name in MILESTONES}, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first frame of the simulator.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'imports':<32} {'ms':>8}  numpy loaded")
+    print(f"{'(interpreter start)':<32} {time_interpreter(args.repeat):>8.1f}")
+    for label, modules in (("main", ["main"]), ("deferred simulation modules", DEFERRED_MODULES)):
+        milliseconds, numpy_loaded = time_import(modules, args.repeat)
+        print(f"{label:<32} {milliseconds:>8.1f}  {'yes' if numpy_loaded else 'no'}")
+
+    print()
+    print(f"{'launch (ms from spawn)':<32} " + " ".join(f"{name:>12}" for name in MILESTONES))
+    for label, repeat, cold in (("cold (no first-frame cache)", 1, True), ("warm", args.repeat, False)):
+        milestones, error = time_launch(repeat, cold)
+        if milestones is None:
+            print(f"{label:<32} skipped: {error}")
+            continue
+        print(f"{label:<32} " + " ".join(f"{milestones[name]:>12.1f}" for name in MILESTONES))
+
+
+if __name__ == "__main__":
+    main()
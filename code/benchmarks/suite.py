@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_canvas import RecordingCanvas
+from main import CanvasFrame
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation, ObjectAnimation
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Relative slack allowed over the baseline before a run counts as a regression.
+# Tk calls are deterministic, so they get none. Tail latencies are reported but
+# too noisy on shared machines to gate on.
+DEFAULT_THRESHOLD = 0.5
+GATED_METRICS = ("p50_us", "alloc_bytes_per_frame", "tk_calls_per_frame")
+EXACT_METRICS = ("tk_calls_per_frame",)
+
+
+class FrameClock:
+    # Deterministic clock for the scheduler: every tick is exactly one interval later
+    def __init__(self, interval_ms=25):
+        self.now = 0.0
+        self.interval = interval_ms / 1000
+
+    def __call__(self):
+        return self.now
+
+    def advance(self):
+        self.now += self.interval
+
+
+def make_world(step=None):
+    canvas = RecordingCanvas()
+    clock = FrameClock()
+    scheduler = FrameScheduler(canvas, clock=clock)
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=scheduler, step=step)
+    return canvas, clock, scheduler, liquid
+
+
+def drive(canvas, clock, scheduler):
+    # One frame through the real scheduler path
+    def frame():
+        clock.advance()
+        canvas.run_timers()
+    return frame
+
+
+def case_liquid(step):
+    canvas, clock, scheduler, liquid = make_world(step)
+    liquid.animate()
+    return canvas, drive(canvas, clock, scheduler)
+
+
+def case_ripples():
+    canvas, clock, scheduler, liquid = make_world()
+    liquid.set_ripples(True)
+    liquid.animate()
+    tick = drive(canvas, clock, scheduler)
+    xs = iter(np.tile(np.linspace(50, 750, 37), 1000))
+
+    def frame():
+        liquid.ripples.splash_at(next(xs), 40, 80)
+        tick()
+    return canvas, frame
+
+
+def case_color_transition():
+    canvas, clock, scheduler, liquid = make_world()
+    densities = iter(np.tile(np.linspace(0.5, 2.0, 40), 1000))
+
+    def frame():
+        liquid.set_density(next(densities))
+        liquid.transition_color()
+    return canvas, frame
+
+
+def case_object_animations(count):
+    canvas, clock, scheduler, liquid = make_world()
+    animations = []
+    for i in range(count):
+        cube = canvas.create_rectangle(i, 0, i + 10, 10, fill="black", outline="")
+        animations.append(ObjectAnimation(canvas, cube, liquid))
+
+    def restart():
+        for i, animation in enumerate(animations):
+            if i % 2:
+                animation.float_cube()
+            else:
+                animation.sink_cube()
+
+    restart()
+    tick = drive(canvas, clock, scheduler)
+
+    def frame():
+        if len(scheduler.animations) == 0:
+            restart()
+        tick()
+    return canvas, frame
+
+
+def case_scene(count):
+    canvas, clock, scheduler, liquid = make_world()
+    scene = ObjectScene(canvas, liquid, 800)
+    rng = np.random.default_rng(0)
+    scene.add_many(rng.uniform(0.5, 3.0, count), np.full(count, 5.0), ["black"] * count)
+    tick = drive(canvas, clock, scheduler)
+    densities = iter(np.tile(np.concatenate([np.linspace(0.5, 2.0, 100), np.linspace(2.0, 0.5, 100)]), 1000))
+
+    def frame():
+        # Keep objects moving by sweeping the liquid density
+        scene.set_liquid_density(next(densities))
+        tick()
+    return canvas, frame
+
+
+def case_check_float_or_sink(count):
+    canvas, clock, scheduler, liquid = make_world()
+
+    class Frame:
+        liquid_animation = liquid
+
+    frame_stub = Frame()
+    rng = np.random.default_rng(0)
+    masses = rng.uniform(20, 100, count).tolist()
+    volumes = rng.uniform(1, 15, count).tolist()
+
+    def frame():
+        for mass, volume in zip(masses, volumes):
+            CanvasFrame.check_float_or_sink(frame_stub, mass, volume)
+    return canvas, frame
+
+
+CASES = {
+    "liquid[lod]": lambda: case_liquid(None),
+    "liquid[step=17]": lambda: case_liquid(17),
+    "liquid[step=4]": lambda: case_liquid(4),
+    "liquid[step=1]": lambda: case_liquid(1),
+    "liquid[ripples]": case_ripples,
+    "transition_color": case_color_transition,
+    "object_animations[1]": lambda: case_object_animations(1),
+    "object_animations[50]": lambda: case_object_animations(50),
+    "object_animations[500]": lambda: case_object_animations(500),
+    "scene[1]": lambda: case_scene(1),
+    "scene[50]": lambda: case_scene(50),
+    "scene[500]": lambda: case_scene(500),
+    "check_float_or_sink[1]": lambda: case_check_float_or_sink(1),
+    "check_float_or_sink[100]": lambda: case_check_float_or_sink(100),
+}
+
+
+def measure(case, frames=200, warmup=20, repeat=3):
+    canvas, frame = case()
+    for _ in range(warmup):
+        frame()
+
+    # Latency and Tk calls. The median is taken from the quietest of several
+    # runs so that a busy machine does not read as a regression.
+    canvas.reset_calls()
+    timings = np.empty((repeat, frames))
+    for run in range(repeat):
+        for i in range(frames):
+            start = time.perf_counter_ns()
+            frame()
+            timings[run, i] = time.perf_counter_ns() - start
+    tk_calls = canvas.call_count / (repeat * frames)
+
+    # Allocations: peak traced memory above the starting point, per frame
+    tracemalloc.start()
+    peaks = np.empty(min(frames, 50))
+    for i in range(len(peaks)):
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        frame()
+        peaks[i] = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+
+    timings /= 1000
+    p50 = np.median(timings, axis=1).min()
+    p95, p99 = np.percentile(timings, [95, 99])
+    return {
+        "p50_us": round(float(p50), 1),
+        "p95_us": round(float(p95), 1),
+        "p99_us": round(float(p99), 1),
+        "alloc_bytes_per_frame": round(float(np.mean(peaks))),
+        "tk_calls_per_frame": round(tk_calls, 3),
+    }
+
+
+def run(names=None, frames=200, repeat=3):
+    return {name: measure(CASES[name], frames, repeat=repeat) for name in (names or CASES)}
+
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    # Returns a list of human-readable regressions (empty when everything is within bounds)
+    regressions = []
+    for name, metrics in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        for metric, value in metrics.items():
+            if metric not in GATED_METRICS or metric not in baseline:
+                continue
+            slack = 0 if metric in EXACT_METRICS else threshold
+            limit = baseline[metric] * (1 + slack)
+            if value > limit:
+                regressions.append(f"{name} {metric}: {value} > {baseline[metric]} (limit {limit:.1f})")
+    return regressions
+
+
+def load_baselines(path=BASELINE_PATH):
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the animation and physics hot paths on a fake canvas.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baselines")
+    parser.add_argument("--check", action="store_true", help="fail if a case regressed beyond the threshold")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baselines", default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    results = run(args.cases, args.frames, args.repeat)
+    print(f"{'case':<28} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'alloc B':>9} {'tk calls':>9}")
+    for name, metrics in results.items():
+        print(f"{name:<28} {metrics['p50_us']:>9} {metrics['p95_us']:>9} {metrics['p99_us']:>9} "
+              f"{metrics['alloc_bytes_per_frame']:>9} {metrics['tk_calls_per_frame']:>9}")
+
+    if args.save:
+        with open(args.baselines, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=4, sort_keys=True)
+            baseline_file.write("\n")
+    if args.check:
+        regressions = compare(results, load_baselines(args.baselines), args.threshold)
+        for regression in regressions:
+            print("REGRESSION:", regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
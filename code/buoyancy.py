@@ -0,0 +1,78 @@
+from collections import namedtuple
+
+import numpy as np
+
+GRAVITY = 9.81
+
+# Result of a batch evaluation. Every field is a NumPy array with the broadcast
+# shape of the inputs:
+#   floats             - True where the buoyant force can hold the object up
+#   net_force          - buoyant force minus weight when fully submerged (N, up is positive)
+#   submerged_fraction - fraction of the object's volume below the surface at rest
+BuoyancyResult = namedtuple("BuoyancyResult", ["floats", "net_force", "submerged_fraction"])
+
+
+def evaluate(masses, volumes, liquid_densities, gravity=GRAVITY):
+    # Accept scalars, lists or arrays and broadcast them against each other
+    masses = np.asarray(masses, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    liquid_densities = np.asarray(liquid_densities, dtype=np.float64)
+
+    weight = masses * gravity  # Weight of the object: mass * gravity
+    buoyant_force = liquid_densities * volumes * gravity  # Buoyant force when fully submerged
+
+    floats = buoyant_force >= weight
+    net_force = buoyant_force - weight
+
+    # A floating object displaces its own mass of liquid, so the submerged
+    # fraction is the density ratio, capped at 1 for objects that sink
+    with np.errstate(divide="ignore", invalid="ignore"):
+        submerged_fraction = np.where(buoyant_force > 0, weight / buoyant_force, 1.0)
+    np.minimum(submerged_fraction, 1.0, out=submerged_fraction)
+
+    return BuoyancyResult(floats, net_force, submerged_fraction)
+
+
+class CriticalDensityIndex:
+    # Objects sorted by their critical liquid density: the lowest liquid density
+    # that still holds them up, i.e. their own density. An object floats exactly
+    # when liquid_density >= critical, so moving the liquid from one density to
+    # another flips only the objects whose critical density lies in between,
+    # and those are one contiguous slice found by bisection.
+    def __init__(self, critical_densities, ids):
+        critical_densities = np.asarray(critical_densities, dtype=np.float64)
+        order = np.argsort(critical_densities, kind="stable")
+        self.critical = critical_densities[order]
+        self.ids = np.asarray(ids)[order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def floating(self, liquid_density):
+        return self.ids[:np.searchsorted(self.critical, liquid_density, side="right")]
+
+    def flipped(self, old_density, new_density):
+        low, high = sorted((old_density, new_density))
+        start = np.searchsorted(self.critical, low, side="right")
+        stop = np.searchsorted(self.critical, high, side="right")
+        return self.ids[start:stop]
+
+
+def rest_positions(densities, sizes, layer_tops, layer_densities, floor_y):
+    # Top edge of each cube at rest in a stack of immiscible layers (sorted
+    # lightest first, so layer_tops increase downwards). A cube whose density
+    # lies between layers k-1 and k straddles their interface, with the part
+    # below it given by the lever rule; above the top layer is air (density 0).
+    # Cubes denser than every layer rest on the floor.
+    densities = np.asarray(densities, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    layer_tops = np.atleast_1d(np.asarray(layer_tops, dtype=np.float64))
+    layer_densities = np.atleast_1d(np.asarray(layer_densities, dtype=np.float64))
+
+    layer = np.searchsorted(layer_densities, densities, side="left")
+    sinks = layer == len(layer_densities)
+    layer = np.minimum(layer, len(layer_densities) - 1)
+    above = np.concatenate(([0.0], layer_densities))[layer]
+    below_fraction = (densities - above) / (layer_densities[layer] - above)
+    y = layer_tops[layer] - (1 - below_fraction) * sizes
+    return np.where(sinks, floor_y - sizes, np.minimum(y, floor_y - sizes))
@@ -0,0 +1,106 @@
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import queue
+import threading
+
+
+class Job:
+    # One submitted piece of work; `cancel_event` is set once it has been superseded or cancelled
+    def __init__(self, tag, on_result, on_error):
+        self.tag = tag
+        self.on_result = on_result
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class BackgroundExecutor:
+    # Runs heavy work (sweeps, catalogue loads, offscreen renders) off the Tk
+    # thread and hands results back on it.
+    #
+    # Jobs run on a small thread pool; CPU-bound ones can fan out further over
+    # `process_pool`. A finished job puts itself on a thread-safe queue, which
+    # the executor drains once per frame as a scheduler animation, so callbacks
+    # always run on the Tk thread between frames. Jobs are submitted under a
+    # tag and a new submission supersedes the one before it: a job still
+    # waiting is cancelled outright, a running one is told through its
+    # cancel_event and its result is dropped.
+    def __init__(self, scheduler, key="executor", threads=2, processes=None):
+        self.scheduler = scheduler
+        self.key = key
+        self.threads = threads
+        self.processes = processes
+        self.jobs = {}
+        self.results = queue.SimpleQueue()
+        self._thread_pool = None
+        self._process_pool = None
+
+    @property
+    def process_pool(self):
+        # Spawned rather than forked workers: the GUI process holds Tk and other threads
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+        return self._process_pool
+
+    def submit(self, tag, function, *args, on_result=None, on_error=None, cancellable=False, **kwargs):
+        # Run function(*args, **kwargs) in the background; with `cancellable` it also
+        # receives the job's cancel_event so it can stop early
+        self.cancel(tag)
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.threads)
+
+        job = Job(tag, on_result, on_error)
+        if cancellable:
+            kwargs["cancel_event"] = job.cancel_event
+        self.jobs[tag] = job
+        job.future = self._thread_pool.submit(function, *args, **kwargs)
+        job.future.add_done_callback(lambda future: self.results.put(job))
+        self.scheduler.add(self.key, self)
+        return job
+
+    def cancel(self, tag):
+        job = self.jobs.pop(tag, None)
+        if job is not None:
+            job.cancel_event.set()
+            job.future.cancel()
+
+    def pending(self, tag):
+        return tag in self.jobs
+
+    def step(self):
+        # Stay registered while work is outstanding or results are waiting to be delivered
+        return bool(self.jobs) or not self.results.empty()
+
+    def render(self):
+        # Deliver everything that finished since the last frame
+        while not self.results.empty():
+            job = self.results.get()
+            if self.jobs.get(job.tag) is not job:
+                continue  # Superseded or cancelled
+            del self.jobs[job.tag]
+            try:
+                result = job.future.result()
+            except CancelledError:
+                continue
+            except Exception as error:
+                if job.on_error is not None:
+                    job.on_error(error)
+                continue
+            if job.on_result is not None:
+                job.on_result(result)
+
+    def shutdown(self):
+        for tag in list(self.jobs):
+            self.cancel(tag)
+        self.scheduler.remove(self.key)
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
@@ -0,0 +1,126 @@
+import json
+
+import numpy as np
+
+
+class RingBuffer:
+    # Fixed-size float history; the newest `capacity` samples are kept
+    def __init__(self, capacity):
+        self.values = np.zeros(capacity)
+        self.count = 0
+
+    def append(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+
+    def recent(self):
+        if self.count <= len(self.values):
+            return self.values[:self.count]
+        start = self.count % len(self.values)
+        return np.concatenate((self.values[start:], self.values[:start]))
+
+
+class FrameMetrics:
+    # Opt-in frame timing collected by FrameScheduler.
+    #
+    # Per tick it keeps the frame time (how long the tick took), the gap since
+    # the previous tick (the real interval against the requested one), frames
+    # dropped and the number of live Tk timers. Each animation's step and
+    # render time is kept as its own group, since those are the Tk call groups.
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.frame_ms = RingBuffer(capacity)
+        self.gap_ms = RingBuffer(capacity)
+        self.dropped = RingBuffer(capacity)
+        self.timers = RingBuffer(capacity)
+        self.groups = {}
+
+    @property
+    def frames(self):
+        return self.frame_ms.count
+
+    def record_frame(self, frame_ms, gap_ms, dropped, timers):
+        self.frame_ms.append(frame_ms)
+        self.gap_ms.append(gap_ms)
+        self.dropped.append(dropped)
+        self.timers.append(timers)
+
+    def record_group(self, name, elapsed_ms):
+        if name not in self.groups:
+            self.groups[name] = RingBuffer(self.capacity)
+        self.groups[name].append(elapsed_ms)
+
+    def summary(self):
+        frame_ms = self.frame_ms.recent()
+        gap_ms = self.gap_ms.recent()
+        if not len(frame_ms):
+            return {"frames": 0}
+        p95, p99 = np.percentile(frame_ms, [95, 99])
+        mean_gap = float(np.mean(gap_ms))
+        return {
+            "frames": self.frames,
+            "fps": round(1000 / mean_gap, 1) if mean_gap > 0 else 0.0,
+            "frame_ms_p50": round(float(np.median(frame_ms)), 3),
+            "frame_ms_p95": round(float(p95), 3),
+            "frame_ms_p99": round(float(p99), 3),
+            "gap_ms_mean": round(mean_gap, 3),
+            "gap_ms_max": round(float(np.max(gap_ms)), 3),
+            "dropped_frames": int(np.sum(self.dropped.recent())),
+            "live_timers": int(self.timers.recent()[-1]),
+            "groups_ms_p95": {name: round(float(np.percentile(buffer.recent(), 95)), 3)
+                              for name, buffer in self.groups.items()},
+        }
+
+    def dump(self, path):
+        # Summary plus the raw recent history, for offline analysis
+        data = {
+            "summary": self.summary(),
+            "frame_ms": self.frame_ms.recent().tolist(),
+            "gap_ms": self.gap_ms.recent().tolist(),
+            "dropped": self.dropped.recent().astype(int).tolist(),
+            "timers": self.timers.recent().astype(int).tolist(),
+            "groups_ms": {name: buffer.recent().tolist() for name, buffer in self.groups.items()},
+        }
+        with open(path, "w", encoding="utf-8") as metrics_file:
+            json.dump(data, metrics_file, indent=2)
+
+
+def count_timers(widget):
+    # Pending Tk `after` events; a headless canvas keeps them in a dict instead
+    if hasattr(widget, "tk"):
+        return len(widget.tk.splitlist(widget.tk.call("after", "info")))
+    return len(getattr(widget, "timers", ()))
+
+
+class PerformanceHUD:
+    # Small text overlay in the corner of the canvas showing fps and p95/p99
+    # frame time. The text is refreshed every `every` frames so the overlay
+    # itself costs almost nothing.
+    def __init__(self, canvas, metrics, scheduler, every=10):
+        self.metrics = metrics
+        self.scheduler = scheduler
+        self.canvas = scheduler.render_layer(canvas)
+        self.every = every
+        self.frames = 0
+        self.text = self.canvas.create_text(8, 8, anchor="nw", text="", fill="black", font=("Courier", 10))
+
+    def show(self):
+        self.scheduler.add("hud", self)
+
+    def hide(self):
+        self.scheduler.remove("hud")
+        self.canvas.itemconfig(self.text, text="")
+
+    def step(self):
+        return True
+
+    def render(self):
+        self.frames += 1
+        if self.frames % self.every:
+            return
+        summary = self.metrics.summary()
+        if not summary["frames"]:
+            return
+        self.canvas.itemconfig(self.text, text=(
+            f"{summary['fps']:5.1f} fps  p95 {summary['frame_ms_p95']:.2f} ms  p99 {summary['frame_ms_p99']:.2f} ms"
+            f"  dropped {summary['dropped_frames']}  timers {summary['live_timers']}"))
@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+import numpy as np
+
+from scheduler import FrameScheduler
+from wave_geometry import DEFAULT_TOLERANCE, column_count, lod_step, wave_tables
+
+LiquidLayer = namedtuple("LiquidLayer", ["name", "density", "thickness", "color"])
+
+# The liquids the density slider's colour bands stand for, stacked in one tank
+DEFAULT_LAYERS = [
+    LiquidLayer("Water", 1.0, 60, "#5cb5e1"),
+    LiquidLayer("Oil", 1.2, 60, "#ffee8c"),
+    LiquidLayer("Soap", 1.45, 60, "#ffd1dc"),
+    LiquidLayer("Honey", 1.75, 60, "#bc9337"),
+]
+
+
+class LayeredLiquid:
+    # N immiscible liquids stacked by density, lightest on top, each with its
+    # own animated surface.
+    #
+    # Every layer's polygon runs from its surface down to the bottom of the
+    # canvas and deeper layers are drawn over shallower ones, like the single
+    # LiquidAnimation polygon. All surfaces share one precomputed sin/cos table
+    # and are phase-shifted together into a (layers x coords) buffer in one
+    # vectorized pass per frame.
+    def __init__(self, canvas, width, height, layers=DEFAULT_LAYERS, scheduler=None, amplitude=4, period=50,
+                 step=None, tolerance=DEFAULT_TOLERANCE):
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler(canvas)
+        self.canvas = self.scheduler.render_layer(canvas)
+        self.width = width
+        self.height = height
+        self.period = period
+        self.offset = 0
+
+        self.layers = sorted(layers, key=lambda layer: layer.density)
+        self.densities = np.array([layer.density for layer in self.layers], dtype=np.float64)
+        thickness = np.array([layer.thickness for layer in self.layers], dtype=np.float64)
+        # Top of each layer, measured down from the top of the canvas
+        self.tops = height - np.cumsum(thickness[::-1])[::-1]
+        # Deeper interfaces are heavier and move less, and drift at their own pace
+        count = len(self.layers)
+        self.amplitudes = amplitude / np.arange(1, count + 1)
+        self.speeds = 1 / np.arange(1, count + 1)
+
+        if step is None:
+            step = lod_step(amplitude, period, tolerance)
+        xs, self._sin, self._cos = wave_tables(width, column_count(width, step), period)
+        self._scratch = np.empty((count, len(xs)))
+
+        self.coords = np.empty((count, 2 * (len(xs) + 2)), dtype=np.float64)
+        self.coords[:, 0:2] = (0, height)
+        self.coords[:, 2:-2:2] = xs
+        self.coords[:, -2:] = (width, height)
+        self.ys = self.coords[:, 3:-2:2]
+
+        self.polygons = []
+        self.create_layers()
+
+    @property
+    def wave_center(self):
+        # Surface of the top layer, where objects are dropped in
+        return float(self.tops[0])
+
+    def create_layers(self):
+        self.update_surfaces()
+        for layer, coords in zip(self.layers, self.coords.tolist()):
+            self.polygons.append(self.canvas.create_polygon(coords, fill=layer.color, outline=""))
+        # Keep the liquids behind any objects already on the canvas, deepest layer frontmost
+        for polygon in reversed(self.polygons):
+            self.canvas.tag_lower(polygon)
+
+    def update_surfaces(self):
+        phases = self.offset * self.speeds / self.period
+        np.multiply(self._sin, (self.amplitudes * np.cos(phases))[:, None], out=self.ys)
+        np.multiply(self._cos, (self.amplitudes * np.sin(phases))[:, None], out=self._scratch)
+        self.ys += self._scratch
+        self.ys += self.tops[:, None]
+        return self.coords
+
+    def layer_index(self, density):
+        # Index of the layer whose top interface an object of this density rests on;
+        # len(layers) means it sinks through every layer
+        return np.searchsorted(self.densities, density, side="left")
+
+    def interface_y(self, density):
+        index = self.layer_index(density)
+        return np.where(index < len(self.layers), self.tops[np.minimum(index, len(self.layers) - 1)], self.height)
+
+    def animate(self):
+        self.scheduler.add("layers", self)
+
+    def step(self):
+        self.offset += 1
+        return True
+
+    def render(self):
+        for polygon, coords in zip(self.polygons, self.update_surfaces().tolist()):
+            self.canvas.coords(polygon, coords)
+
+    def destroy(self):
+        self.scheduler.remove("layers")
+        for polygon in self.polygons:
+            self.canvas.delete(polygon)
+        self.polygons = []
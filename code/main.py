@@ -1,26 +1,155 @@
+import argparse
+import atexit
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
-from simulation import LiquidAnimation, ObjectAnimation
-import math
+from startup import StartupTimes, read_first_frame, write_first_frame
+
+# Only tkinter and the standard library are imported up front. numpy and the
+# simulation modules take most of the launch time, so they are imported
+# inside the methods that need them, once the canvas is already on screen.
 
 class DensitySimulatorUI:
-    def __init__(self, root):
+    # The window comes up in two stages. The constructor builds just the
+    # canvas and, from the on-disk first-frame cache, the still liquid; once
+    # that has been painted, finish_startup() imports the simulation, starts
+    # the animation and adds the controls.
+    def __init__(self, root, hud=False, metrics_out=None, record=None, startup=None):
         self.root = root
         self.root.title("Density Simulator")
+        self.hud_enabled = hud
+        self.metrics_out = metrics_out
+        self.record = record
+        self.startup = startup if startup is not None else StartupTimes()
+        self.started = False
 
         # Main frame
         self.main_frame = ttk.Frame(self.root, padding="17")
         self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
+        # Let the canvas take up any extra room when the window is resized
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        self.main_frame.columnconfigure(0, weight=1)
+        self.main_frame.rowconfigure(1, weight=1)
+
         # Create custom widget containing canvas and slider
         self.canvas_frame = CanvasFrame(self.main_frame, width=800, height=600)
-        self.canvas_frame.grid(row=1, column=0, columnspan=2)
+        self.canvas_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # The cache is keyed on the size asked for here, before the window manager settles the real one,
+        # so that the next launch looks up the same key this one writes
+        self.cache_size = (self.canvas_frame.canvas_width, self.canvas_frame.canvas_height)
+        self.placeholder = self.canvas_frame.draw_cached_liquid(*self.cache_size, density=1.0)
+
+        # Everything else waits until the canvas has been drawn once. A window that starts minimized
+        # is never exposed, so don't wait for that forever.
+        self.canvas_frame.canvas.bind("<Expose>", self.on_first_paint, add="+")
+        self.root.after(1000, self.on_first_paint)
+
+    def on_first_paint(self, event=None):
+        if self.started:
+            return
+        self.started = True
+        self.canvas_frame.canvas.unbind("<Expose>")
+        self.startup.mark("first_paint")
+        # Runs after Tk's own redraw of the canvas, which is already queued
+        self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        from instrumentation import FrameMetrics, PerformanceHUD
+        from recording import SessionRecorder
+        from scheduler import FrameScheduler
+        from simulation import LiquidAnimation
+
+        # Frame timing is only collected when something will read it
+        self.metrics = FrameMetrics() if self.hud_enabled or self.metrics_out else None
+        self.scheduler = FrameScheduler(self.canvas_frame.canvas, metrics=self.metrics)
 
         # Initialize the animation with default density
-        self.liquid_animation = LiquidAnimation(self.canvas_frame.canvas, 800, 600, density=1.0)  # Use 1.0 for default
+        self.liquid_animation = LiquidAnimation(self.canvas_frame.canvas, self.canvas_frame.canvas_width,
+                                                self.canvas_frame.canvas_height, density=1.0,
+                                                scheduler=self.scheduler)  # Use 1.0 for default
+        self.cache_first_frame()
         self.canvas_frame.set_liquid_animation(self.liquid_animation)
         self.liquid_animation.animate()
+        self.scheduler.add_observer(lambda steps: self.startup.mark("first_frame"))
+
+        self.hud = None
+        if self.hud_enabled:
+            self.hud = PerformanceHUD(self.canvas_frame.canvas, self.metrics, self.scheduler)
+            self.hud.show()
+        if self.metrics_out:
+            atexit.register(self.metrics.dump, self.metrics_out)
+
+        # Session recording: one record per tick, written into a memory-mapped file
+        self.recorder = None
+        if self.record:
+            scene = self.canvas_frame.scene
+            self.recorder = SessionRecorder(self.record, scene, max_objects=scene.capacity,
+                                            interval=self.scheduler.interval)
+            self.recorder.attach(self.scheduler)
+            atexit.register(self.recorder.close)
+
+        self.canvas_frame.build_controls()
+        self.startup.mark("ready")
+
+    def cache_first_frame(self):
+        # The real liquid replaces the cached one; if there was none (first launch, or the simulation
+        # code changed) it is saved for next time, as drawn at the canvas's actual size
+        liquid = self.liquid_animation
+        if self.placeholder is not None:
+            self.canvas_frame.canvas.delete(self.placeholder)
+            return
+        try:
+            write_first_frame(*self.cache_size, liquid.density, liquid.canvas.coords(liquid.water_polygon),
+                              liquid.color_transition.color)
+        except OSError:
+            pass  # A read-only install still works, just without the cache
+
+
+class ReplayUI:
+    # Plays back a recorded session: scrub to any frame, or play it forwards or backwards
+    def __init__(self, root, path):
+        from recording import ReplayAnimation, SessionPlayer
+        from scheduler import FrameScheduler
+
+        self.root = root
+        self.root.title("Density Simulator - Replay")
+        self.player = SessionPlayer(path)
+        if not len(self.player):
+            raise ValueError(f"{path} has no recorded frames")
+        first = self.player.frame(0)
+
+        self.main_frame = ttk.Frame(self.root, padding="17")
+        self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.canvas = tk.Canvas(self.main_frame, width=int(first["width"]), height=int(first["height"]), bg="white",
+                                highlightthickness=0)
+        self.canvas.grid(row=0, column=0, columnspan=4, pady=10)
+
+        # Frame Slider
+        self.frame_slider = tk.Scale(self.main_frame, from_=0, to=len(self.player) - 1, orient=tk.HORIZONTAL,
+                                     length=int(first["width"]), command=self.seek)
+        self.frame_slider.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E))
+
+        # Playback Buttons
+        self.reverse_button = ttk.Button(self.main_frame, text="Reverse", command=lambda: self.replay.play(-1))
+        self.reverse_button.grid(row=2, column=0, padx=5, pady=5)
+        self.pause_button = ttk.Button(self.main_frame, text="Pause", command=lambda: self.replay.pause())
+        self.pause_button.grid(row=2, column=1, padx=5, pady=5)
+        self.play_button = ttk.Button(self.main_frame, text="Play", command=lambda: self.replay.play(1))
+        self.play_button.grid(row=2, column=2, padx=5, pady=5)
+
+        self.scheduler = FrameScheduler(self.canvas, interval=self.player.interval)
+        self.replay = ReplayAnimation(self.canvas, self.player, self.scheduler, on_frame=self.show_frame)
+        self.replay.seek(0)
+
+    def seek(self, value):
+        # Dragging the slider; ignore the echo of show_frame moving it
+        if int(value) != self.replay.index:
+            self.replay.seek(int(value))
+
+    def show_frame(self, index):
+        self.frame_slider.set(index)
 
 class CanvasFrame(tk.Frame):
     def __init__(self, parent, width, height):
@@ -30,18 +159,38 @@ class CanvasFrame(tk.Frame):
         self.title_label = ttk.Label(self, text="Density Simulator", font=("Helvetica", 16))
         self.title_label.grid(row=0, column=0, columnspan=7, pady=10)
 
-        # Initial values for objects
-        self.object_values = {
-            "Custom": 1.0,  # Default value for custom objects
-            "Paper": 0.8,
-            "Ice": 0.92,
-            "Brick": 2.4,
-            "Silicon": 2.33,
-            "Aluminum": 2.7,
-            "Titanium": 4.5,
-            "Iron": 7.87,
-            "Tin Bronze": 8.8
-        }
+        # Canvas for animation
+        self.canvas_width = width
+        self.canvas_height = height
+        # No highlight border, so <Configure> sizes are exactly the drawable area
+        self.canvas = tk.Canvas(self, width=width, height=height, bg="white", highlightthickness=0)
+        self.canvas.grid(row=3, column=0, columnspan=9, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        self.canvas.bind("<Configure>", self.on_canvas_configure)
+        self.rowconfigure(3, weight=1)
+        self.columnconfigure(8, weight=1)
+
+        self.liquid_animation = None
+        self.scene = None
+        self.layered_liquid = None
+        self.cube = None  # Scene slot of the object placed with "Update Object"
+        self.measurement = None  # (mass, volume) entered for that object
+
+    def draw_cached_liquid(self, width, height, density):
+        # The liquid as it looks on its first frame, drawn from the on-disk cache without importing
+        # the simulation; returns the canvas item, or None when nothing is cached for this size
+        cached = read_first_frame(width, height, density)
+        if cached is None:
+            return None
+        coords, fill = cached
+        return self.canvas.create_polygon(coords, fill=fill, outline="")
+
+    def build_controls(self):
+        # Sliders, inputs and buttons are added once the canvas is up
+        from materials import load_catalogue
+
+        # Preset objects, their densities and cube colors come from the material catalogue
+        self.materials = load_catalogue()
+        self.object_values = self.materials.as_dict()
 
         # Liquid Density Slider
         self.density_label = ttk.Label(self, text="Liquid Density (kg/m^3):")
@@ -54,11 +203,12 @@ class CanvasFrame(tk.Frame):
         # Object Selection Dropdown
         self.object_label = ttk.Label(self, text="Select Object:")
         self.object_label.grid(row=1, column=2, sticky=tk.W, padx=5, pady=5)
-        self.preset_objects = list(self.object_values.keys())  # Use the keys from object_values
-        self.object_combobox = ttk.Combobox(self, values=self.preset_objects, state="readonly")
+        self.preset_objects = list(self.materials.names)  # Use the names from the catalogue
+        self.object_combobox = ttk.Combobox(self, values=self.preset_objects)
         self.object_combobox.current(0)  # Default selection
         self.object_combobox.grid(row=2, column=2, sticky=tk.W, padx=5, pady=5)
         self.object_combobox.bind("<<ComboboxSelected>>", self.update_object)
+        self.object_combobox.bind("<KeyRelease>", self.filter_objects)  # Narrow the list while typing
 
         # Object Mass Input
         self.obj_mass_label = ttk.Label(self, text="Object Mass (kg):")
@@ -78,6 +228,10 @@ class CanvasFrame(tk.Frame):
         self.calc_density_value = ttk.Label(self, text="", borderwidth=2, relief="sunken", width=15)
         self.calc_density_value.grid(row=2, column=5, sticky=tk.W, padx=5, pady=5)
 
+        # Chance of floating given measurement error, filled in by a background Monte Carlo sweep
+        self.float_chance_value = ttk.Label(self, text="", width=30)
+        self.float_chance_value.grid(row=1, column=6, sticky=tk.W, padx=5, pady=5)
+
         # Update Button
         self.update_button = ttk.Button(self, text="Update Object", command=self.update_object)
         self.update_button.grid(row=2, column=6, sticky=tk.W, padx=5, pady=5)
@@ -86,24 +240,118 @@ class CanvasFrame(tk.Frame):
         self.reset_button = ttk.Button(self, text="Reset", command=self.reset)
         self.reset_button.grid(row=2, column=7, sticky=tk.W, padx=5, pady=5)
 
-        # Canvas for animation
-        self.canvas = tk.Canvas(self, width=width, height=height, bg="white")
-        self.canvas.grid(row=3, column=0, columnspan=8, sticky=(tk.W, tk.E), pady=10)
+        # Drop All Button
+        self.drop_all_button = ttk.Button(self, text="Drop All", command=self.drop_all)
+        self.drop_all_button.grid(row=2, column=8, sticky=tk.W, padx=5, pady=5)
 
-        self.liquid_animation = None
-        self.cube = None
+        # Physics Mode Toggle
+        self.physics_var = tk.BooleanVar(value=False)
+        self.physics_check = ttk.Checkbutton(self, text="Realistic Physics", variable=self.physics_var,
+                                             command=self.update_physics)
+        self.physics_check.grid(row=1, column=8, sticky=tk.W, padx=5, pady=5)
+
+        # Layered Liquids Toggle
+        self.layers_var = tk.BooleanVar(value=False)
+        self.layers_check = ttk.Checkbutton(self, text="Layered Liquids", variable=self.layers_var,
+                                            command=self.update_layers)
+        self.layers_check.grid(row=1, column=7, sticky=tk.W, padx=5, pady=5)
+
+        # Ripple Surface Toggle
+        self.ripples_var = tk.BooleanVar(value=False)
+        self.ripples_check = ttk.Checkbutton(self, text="Ripples", variable=self.ripples_var,
+                                             command=self.update_ripples)
+        self.ripples_check.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
 
     def set_liquid_animation(self, liquid_animation):
+        from executor import BackgroundExecutor
+        from scene import ObjectScene
+        from scheduler import Coalescer
+
         self.liquid_animation = liquid_animation
+        self.scene = ObjectScene(self.canvas, liquid_animation, self.canvas_width)
+        # Slider drags are applied at most once per frame, with the latest value
+        self.apply_density = Coalescer(liquid_animation.scheduler, "density", self.scene.set_liquid_density)
+        # Heavy work runs in the background and reports back between frames
+        self.executor = BackgroundExecutor(liquid_animation.scheduler)
+        # A window drag fires many <Configure> events; the geometry is rebuilt once per frame at most
+        self.apply_resize = Coalescer(liquid_animation.scheduler, "resize", self.resize_canvas)
+
+    def on_canvas_configure(self, event):
+        if self.liquid_animation:
+            self.apply_resize(event.width, event.height)
+        else:
+            # Still starting up: the liquid will be built at whatever size the canvas has by then
+            self.canvas_width = event.width
+            self.canvas_height = event.height
+
+    def resize_canvas(self, width, height):
+        from layers import LayeredLiquid
+
+        if (width, height) == (self.canvas_width, self.canvas_height):
+            return
+        self.canvas_width = width
+        self.canvas_height = height
+        self.liquid_animation.resize(width, height)
+        if self.scene.physics is not None:
+            self.scene.physics.floor_y = height
+        if self.layered_liquid:
+            # The layers are cheap to rebuild at the new size
+            self.layered_liquid.destroy()
+            self.layered_liquid = LayeredLiquid(self.canvas, width, height, scheduler=self.liquid_animation.scheduler)
+            self.layered_liquid.animate()
+            self.scene.layers = self.layered_liquid
+        self.scene.resize(width)
 
     def update_density(self, value):
         density = float(value)
         if self.liquid_animation:
-            self.liquid_animation.set_density(density)
+            self.apply_density(density)
+            if self.measurement is not None:
+                self.request_float_chance(density)
+
+    def update_physics(self):
+        # Switch between constant-speed motion and the gravity/buoyancy/drag integrator
+        from physics import BuoyancyIntegrator
+
+        if self.physics_var.get():
+            self.scene.set_physics(BuoyancyIntegrator(floor_y=self.canvas_height))
+        else:
+            self.scene.set_physics(None)
+
+    def filter_objects(self, event=None):
+        self.object_combobox.config(values=self.materials.search(self.object_combobox.get()))
+
+    def update_ripples(self):
+        # Simulate the surface so that objects splash into it, or go back to the steady sine
+        self.liquid_animation.set_ripples(self.ripples_var.get())
+
+    def update_layers(self):
+        # Swap the single liquid for a stack of water, oil, soap and honey, or back
+        from layers import LayeredLiquid
+
+        if self.layers_var.get():
+            self.liquid_animation.scheduler.remove("liquid")
+            self.canvas.itemconfig(self.liquid_animation.water_polygon, state="hidden")
+            self.layered_liquid = LayeredLiquid(self.canvas, self.canvas_width, self.canvas_height,
+                                                scheduler=self.liquid_animation.scheduler)
+            self.layered_liquid.animate()
+            self.scene.set_layers(self.layered_liquid)
+        elif self.layered_liquid:
+            self.layered_liquid.destroy()
+            self.layered_liquid = None
+            self.canvas.itemconfig(self.liquid_animation.water_polygon, state="normal")
+            self.liquid_animation.animate()
+            self.scene.set_layers(None)
 
     def update_object(self, event=None):
+        import utils
+
         selected_object = self.object_combobox.get()
 
+        if selected_object not in self.materials:
+            messagebox.showerror("Input Error", "Please select an object from the list.")
+            return
+
         if selected_object == "Custom":
             # Enable the entries for custom object
             self.obj_mass_entry.config(state="normal")
@@ -116,109 +364,92 @@ class CanvasFrame(tk.Frame):
                 obj_mass = float(self.obj_mass_entry.get())
                 obj_volume = float(self.obj_volume_entry.get())
 
-                # Check if mass is within range
-                if obj_mass < 20 or obj_mass > 100:
-                    messagebox.showerror("Input Error", "Mass value must be between 20 and 100.")
-                    return
-
-                # Check if volume is within limit
-                if obj_volume > 15:
-                    messagebox.showerror("Input Error", "Volume value must be 15 or below.")
+                # Check the mass and volume against the same limits the sweep tool applies
+                error = utils.mass_error(obj_mass) or utils.volume_error(obj_volume)
+                if error:
+                    messagebox.showerror("Input Error", error)
                     return
 
             except ValueError:
                 messagebox.showerror("Input Error", "Please enter valid numbers for mass and volume.")
                 return
         else:
-            # Disable the mass entry for preset objects, volume entry remains enabled
-            self.obj_mass_entry.config(state="normal")  # Enable temporarily to insert values
-
             obj_density = self.object_values.get(selected_object, 0)  # Get the density from object_values
 
-            # Use default value for mass and allow user to edit volume
-            obj_mass = obj_density * 25  # default mass = density * 25
-            self.obj_mass_entry.delete(0, tk.END)
-            self.obj_mass_entry.insert(0, f"{obj_mass:.2f}")
-            self.obj_mass_entry.config(state="disabled")  # Make the entry disabled but visible
-
             # If volume is empty or invalid, set to default value
             try:
                 obj_volume = float(self.obj_volume_entry.get())
 
                 # Check if volume is within limit
-                if obj_volume > 15:
-                    messagebox.showerror("Input Error", "Volume value must be 15 or below.")
+                error = utils.volume_error(obj_volume)
+                if error:
+                    messagebox.showerror("Input Error", error)
                     return
 
             except ValueError:
-                obj_volume = 5  # default volume = 25
+                obj_volume = 5  # default volume = 5
                 self.obj_volume_entry.delete(0, tk.END)
                 self.obj_volume_entry.insert(0, f"{obj_volume:.2f}")
 
+            # Disable the mass entry for preset objects, volume entry remains enabled
+            self.obj_mass_entry.config(state="normal")  # Enable temporarily to insert values
+
+            # Mass follows from the preset density and the chosen volume
+            obj_mass = obj_density * obj_volume
+            self.obj_mass_entry.delete(0, tk.END)
+            self.obj_mass_entry.insert(0, f"{obj_mass:.2f}")
+            self.obj_mass_entry.config(state="disabled")  # Make the entry disabled but visible
+
         obj_density = obj_mass / obj_volume
         self.calc_density_value.config(text=f"{obj_density:.2f} kg/m^3")
 
-        # Show result in message box based on the object's properties
-        result = self.check_float_or_sink(obj_density, obj_volume)
-
-        if result == "Sink!":
-            # Create cube first
-            self.create_cube(obj_density, obj_volume, selected_object)
-            # Then animate sinking
-            object_animation = ObjectAnimation(self.canvas, self.cube, self.liquid_animation)
-            object_animation.sink_cube()
-        elif result == "Float!":
-            # Create cube first
-            self.create_cube(obj_density, obj_volume, selected_object)
-            # Then animate floating
-            object_animation = ObjectAnimation(self.canvas, self.cube, self.liquid_animation)
-            object_animation.float_cube()
+        # How close a call it is, given the error in the entered measurements
+        self.measurement = (obj_mass, obj_volume)
+        self.request_float_chance(self.liquid_animation.density)
+
+        # Drop the cube into the tank; the scene moves it to where it floats or sinks
+        self.create_cube(obj_density, obj_volume, selected_object)
+
+    def request_float_chance(self, liquid_density):
+        # A newer request supersedes any sweep still running for older inputs
+        import uncertainty
+
+        obj_mass, obj_volume = self.measurement
+        self.float_chance_value.config(text="Float chance: ...")
+        self.executor.submit("float_chance", uncertainty.sweep, obj_mass, obj_volume, liquid_density,
+                             pool=self.executor.process_pool, cancellable=True, on_result=self.show_float_chance,
+                             on_error=self.show_float_chance_error)
+
+    def show_float_chance(self, result):
+        self.float_chance_value.config(
+            text=f"Float chance: {result.float_probability:.1%} (margin {result.margin_mean:+.2f} ± {result.margin_std:.2f})")
+
+    def show_float_chance_error(self, error):
+        # The sweep failed (a broken process pool, say); the estimate is only extra information
+        self.float_chance_value.config(text="Float chance: unavailable")
 
     def create_cube(self, obj_density, obj_volume, selected_object):
-        # Remove existing cube
-        if self.cube:
-            self.canvas.delete(self.cube)
-
-        # Get liquid animation parameters
-        wave_center = self.liquid_animation.wave_center
-
-        # Calculate cube dimensions based on density and volume
-        mass = obj_density * obj_volume
-        cube_side_length = math.pow(mass, 1 / 3.0) * 10  # Adjust scale for visibility
-        cube_x = 400 - cube_side_length / 2  # Center of the canvas
-
-        # Determine cube_y based on buoyancy
-        result = self.check_float_or_sink(obj_density, obj_volume)
-        if result == "Float!":
-            cube_y = wave_center - 20  # Position just above the liquid
-        else:
-            cube_y = wave_center + 130  # Position below the liquid
-
-        # Determine color based on selected object
-        colors = {
-            "Paper": "#FAF9F6",
-            "Ice": "light blue",
-            "Brick": "#bc4a3c",  # Red brown
-            "Silicon": "#9599a5",
-            "Aluminum": "#848789",
-            "Titanium": "#878681",
-            "Iron": "#d4d7d9",
-            "Tin Bronze": "#cd7f32",
-            "Custom": "black"
-        }
-        cube_color = colors.get(selected_object, "black")
-
-        # Draw cube
-        self.cube = self.canvas.create_rectangle(cube_x, cube_y, cube_x + cube_side_length, cube_y + cube_side_length,
-                                                 fill=cube_color, outline="")
+        # Return the existing cube's rectangle to the pool
+        if self.cube is not None:
+            self.scene.remove(self.cube)
+
+        cube_color = self.materials.color(selected_object)
+        self.cube = self.scene.add(obj_density, obj_volume, cube_color, x=self.canvas_width / 2)  # Center of the canvas
+
+    def drop_all(self):
+        # Drop one of every preset object into the tank at once
+        names = [name for name in self.object_values if name != "Custom"]
+        densities = [self.object_values[name] for name in names]
+        colors = [self.materials.color(name) for name in names]
+        self.scene.add_many(densities, [5] * len(names), colors)
 
     def check_float_or_sink(self, obj_mass, obj_volume):
-        liquid_density = self.liquid_animation.density  # Density of the liquid
-        buoyant_force = liquid_density * obj_volume * 9.81  # Buoyant force: liquid density * object volume * gravity
-        weight = obj_mass * 9.81  # Weight of the object: mass * gravity
+        # The physics lives in the headless buoyancy engine; the frame only supplies the liquid density
+        import buoyancy
 
-        # Compare the weight and buoyant Force to determine if the object floats or sinks
-        if buoyant_force >= weight:
+        result = buoyancy.evaluate(obj_mass, obj_volume, self.liquid_animation.density)
+
+        if result.floats:
             return "Float!"
         else:
             return "Sink!"
@@ -226,17 +457,41 @@ class CanvasFrame(tk.Frame):
     def reset(self):
         # Clear inputs
         self.density_slider.set(1.0)
+        self.object_combobox.config(values=self.preset_objects)
         self.object_combobox.current(0)
         self.obj_mass_entry.delete(0, tk.END)
         self.obj_volume_entry.delete(0, tk.END)
         self.calc_density_value.config(text="")
+        self.float_chance_value.config(text="")
+        self.executor.cancel("float_chance")
+        self.measurement = None
 
-        # Remove the cube from the canvas
-        if self.cube:
-            self.canvas.delete(self.cube)
-            self.cube = None
+        # Remove every object from the canvas
+        self.scene.clear()
+        self.cube = None
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Density Simulator")
+    parser.add_argument("--hud", action="store_true", help="show fps and frame time percentiles on the canvas")
+    parser.add_argument("--metrics-out", metavar="PATH", help="write frame metrics as JSON to PATH on exit")
+    parser.add_argument("--record", metavar="PATH", help="record the session to PATH for replay")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded session instead of simulating")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print the time of each startup milestone as JSON and quit once the UI is ready")
+    args = parser.parse_args()
+
+    startup = StartupTimes()
+    startup.mark("imported")
     root = tk.Tk()
-    app = DensitySimulatorUI(root)
+    if args.replay:
+        app = ReplayUI(root, args.replay)
+    else:
+        if args.startup_report:
+            startup.on_complete = lambda: (startup.dump(), root.after_idle(root.quit))
+        app = DensitySimulatorUI(root, hud=args.hud, metrics_out=args.metrics_out, record=args.record,
+                                 startup=startup)
     root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import bisect
+import functools
+import json
+import os
+import struct
+
+import numpy as np
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "assets", "config", "default_config.json")
+
+# Binary cache layout: header, float64 densities, then NUL-separated UTF-8 names and colours
+CACHE_MAGIC = b"DSMC"
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct("<4sIqqI")  # magic, version, source mtime_ns, source size, material count
+
+
+class MaterialCatalogue:
+    # Material names, densities and colours with indexes for the object picker:
+    # names sorted case-insensitively for prefix search, one lowercase string
+    # for substring search, and densities sorted for range queries.
+    def __init__(self, names, densities, colors):
+        self.names = list(names)
+        self.densities = np.asarray(densities, dtype=np.float64)
+        self.colors = list(colors)
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+        lower = [name.lower() for name in self.names]
+        self._name_order = sorted(range(len(lower)), key=lower.__getitem__)
+        self._sorted_names = [lower[i] for i in self._name_order]
+
+        # Every name on its own line, with the offset where each line starts
+        self._haystack = "\n".join(lower)
+        self._line_starts = []
+        offset = 0
+        for name in lower:
+            self._line_starts.append(offset)
+            offset += len(name) + 1
+
+        self._density_order = np.argsort(self.densities, kind="stable")
+        self._sorted_densities = self.densities[self._density_order]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def density(self, name, default=None):
+        i = self._index.get(name)
+        return default if i is None else float(self.densities[i])
+
+    def color(self, name, default="black"):
+        i = self._index.get(name)
+        return default if i is None else self.colors[i]
+
+    def as_dict(self):
+        return {name: float(density) for name, density in zip(self.names, self.densities)}
+
+    def prefix_search(self, prefix, limit=None):
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        matches = []
+        for position in range(start, len(self._sorted_names)):
+            if not self._sorted_names[position].startswith(prefix):
+                break
+            matches.append(self.names[self._name_order[position]])
+            if limit is not None and len(matches) == limit:
+                break
+        return matches
+
+    def search(self, text, limit=None):
+        # Prefix matches first (alphabetical), then names containing the text elsewhere (catalogue order)
+        if not text:
+            return self.names[:limit] if limit is not None else list(self.names)
+        text = text.lower()
+        matches = self.prefix_search(text, limit)
+        seen = set(matches)
+        position = self._haystack.find(text)
+        while position != -1 and (limit is None or len(matches) < limit):
+            line = bisect.bisect_right(self._line_starts, position) - 1
+            name = self.names[line]
+            if name not in seen:
+                seen.add(name)
+                matches.append(name)
+            # Continue after this line; one hit per name is enough
+            next_line = self._line_starts[line + 1] if line + 1 < len(self._line_starts) else len(self._haystack)
+            position = self._haystack.find(text, next_line)
+        return matches
+
+    def in_density_range(self, low, high):
+        start = np.searchsorted(self._sorted_densities, low, side="left")
+        stop = np.searchsorted(self._sorted_densities, high, side="right")
+        return [self.names[i] for i in self._density_order[start:stop]]
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, encoding="utf-8") as config_file:
+            config = json.load(config_file)
+        materials = config.get("materials", [])
+        return cls([m["name"] for m in materials],
+                   [m["density"] for m in materials],
+                   [m.get("color", "black") for m in materials])
+
+    def write_cache(self, cache_path, source_stat):
+        payload = "\0".join(self.names + self.colors).encode("utf-8")
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temporary_path = cache_path + ".tmp"
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, source_stat.st_mtime_ns,
+                                               source_stat.st_size, len(self)))
+            cache_file.write(self.densities.astype("<f8").tobytes())
+            cache_file.write(payload)
+        os.replace(temporary_path, cache_path)
+
+    @classmethod
+    def read_cache(cls, cache_path, source_stat):
+        # Returns None when the cache is missing or was built from a different config
+        try:
+            with open(cache_path, "rb") as cache_file:
+                data = cache_file.read()
+        except OSError:
+            return None
+        if len(data) < CACHE_HEADER.size:
+            return None
+        magic, version, mtime_ns, size, count = CACHE_HEADER.unpack_from(data)
+        if (magic, version, mtime_ns, size) != (CACHE_MAGIC, CACHE_VERSION, source_stat.st_mtime_ns,
+                                                source_stat.st_size):
+            return None
+        densities_end = CACHE_HEADER.size + 8 * count
+        densities = np.frombuffer(data, dtype="<f8", count=count, offset=CACHE_HEADER.size)
+        strings = data[densities_end:].decode("utf-8").split("\0") if count else []
+        return cls(strings[:count], densities, strings[count:])
+
+
+def cache_path_for(config_path):
+    directory, filename = os.path.split(config_path)
+    return os.path.join(directory, "__pycache__", filename + ".bin")
+
+
+@functools.lru_cache(maxsize=None)
+def load_catalogue(path=CONFIG_PATH, use_cache=True):
+    # Parsed once per process; the binary cache skips JSON parsing on later runs
+    source_stat = os.stat(path)
+    cache_path = cache_path_for(path)
+    if use_cache:
+        catalogue = MaterialCatalogue.read_cache(cache_path, source_stat)
+        if catalogue is not None:
+            return catalogue
+    catalogue = MaterialCatalogue.from_json(path)
+    if use_cache:
+        try:
+            catalogue.write_cache(cache_path, source_stat)
+        except OSError:
+            pass  # A read-only install still works, just without the cache
+    return catalogue
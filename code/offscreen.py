@@ -0,0 +1,321 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from utils import parse_color
+
+FRAME_INTERVAL = 25  # Milliseconds per frame, the same fixed timestep the GUI animates at
+
+
+class HeadlessCanvas:
+    # Implements the part of the tk.Canvas interface the simulator uses and
+    # keeps every item in memory, so scenes can run and be rasterized without
+    # a display. Timers are stored but only fire through run_timers().
+    def __init__(self, width=800, height=600):
+        self.width = width
+        self.height = height
+        self.items = {}
+        self.timers = {}
+        self._next_item = 0
+        self._next_timer = 0
+
+    def _create(self, kind, coords, options):
+        self._next_item += 1
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        self.items[self._next_item] = {"type": kind, "coords": [float(c) for c in coords], **options}
+        return self._next_item
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def coords(self, item, *coords):
+        if not coords:
+            return list(self.items[item]["coords"])
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        self.items[item]["coords"] = [float(c) for c in coords]
+
+    def move(self, item, dx, dy):
+        coords = self.items[item]["coords"]
+        for i in range(0, len(coords), 2):
+            coords[i] += dx
+            coords[i + 1] += dy
+
+    def itemconfig(self, item, **options):
+        self.items[item].update(options)
+
+    itemconfigure = itemconfig
+
+    def batch(self, commands):
+        # A RenderLayer flush: (item, coords or None, options or None) per changed item, applied in one call
+        for item, coords, options in commands:
+            if coords is not None:
+                self.items[item]["coords"] = [float(c) for c in coords]
+            if options:
+                self.items[item].update(options)
+
+    def itemcget(self, item, option):
+        return self.items[item].get(option, "")
+
+    def tag_lower(self, item, below=None):
+        # Move it to the start of the display list (dicts keep insertion order)
+        entry = self.items.pop(item)
+        self.items = {item: entry, **self.items}
+
+    def delete(self, item):
+        self.items.pop(item, None)
+
+    def after(self, delay, callback, *args):
+        self._next_timer += 1
+        self.timers[self._next_timer] = (callback, args)
+        return self._next_timer
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def run_timers(self):
+        # Fire every pending timer once, as a Tk event loop iteration would
+        pending, self.timers = self.timers, {}
+        for callback, args in pending.values():
+            callback(*args)
+
+    def snapshot(self):
+        # Visible polygons and rectangles in display order, as plain tuples for the rasterizer
+        return [(item["type"], tuple(item["coords"]), item.get("fill", "black"))
+                for item in self.items.values()
+                if item["type"] in ("polygon", "rectangle") and item.get("state", "normal") != "hidden"
+                and item.get("fill")]
+
+
+def pack_color(color):
+    # Images are (height, width) little-endian uint32 arrays whose bytes are R, G, B, A in memory order,
+    # so whole pixels are filled with one scalar write and PNG rows are a plain view
+    red, green, blue = parse_color(color)
+    return np.uint32(red | green << 8 | blue << 16 | 0xFF << 24)
+
+
+def to_rgb(image):
+    return image.view(np.uint8).reshape(image.shape + (4,))[..., :3]
+
+
+def fill_polygon(image, coords, pixel):
+    # Even-odd scanline fill, sampling at pixel centres; all rows are handled at once
+    height, width = image.shape[:2]
+    points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    x0, y0 = points[:, 0], points[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+
+    rows = np.arange(height) + 0.5
+    low, high = np.minimum(y0, y1), np.maximum(y0, y1)
+    crosses = (rows[:, None] >= low) & (rows[:, None] < high)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (rows[:, None] - y0) / (y1 - y0)
+    xs = np.where(crosses, x0 + t * (x1 - x0), np.inf)
+    xs.sort(axis=1)
+    xs = xs[:, :crosses.sum(axis=1).max(initial=0)]  # Most edges cross no row; drop the unused columns
+
+    # Pair up crossings into spans; pixel columns whose centres fall inside a span are filled
+    columns = np.arange(width) + 0.5
+    mask = np.zeros((height, width), dtype=bool)
+    for pair in range(xs.shape[1] // 2):
+        mask |= (columns >= xs[:, 2 * pair, None]) & (columns < xs[:, 2 * pair + 1, None])
+    np.copyto(image, pixel, where=mask)
+
+
+def fill_rectangle(image, coords, pixel):
+    height, width = image.shape
+    x1, y1, x2, y2 = coords
+    left, right = sorted((x1, x2))
+    top, bottom = sorted((y1, y2))
+    left, right = int(np.clip(np.ceil(left - 0.5), 0, width)), int(np.clip(np.ceil(right - 0.5), 0, width))
+    top, bottom = int(np.clip(np.ceil(top - 0.5), 0, height)), int(np.clip(np.ceil(bottom - 0.5), 0, height))
+    image[top:bottom, left:right] = pixel
+
+
+def rasterize(items, width, height, background="white"):
+    image = np.empty((height, width), dtype="<u4")
+    image.fill(pack_color(background))
+    for kind, coords, fill in items:
+        if kind == "polygon":
+            fill_polygon(image, coords, pack_color(fill))
+        else:
+            fill_rectangle(image, coords, pack_color(fill))
+    return image
+
+
+def encode_png(image):
+    height, width = image.shape
+    raw = np.empty((height, 1 + 4 * width), dtype=np.uint8)
+    raw[:, 0] = 0  # No per-row filter
+    raw[:, 1:] = image.view(np.uint8).reshape(height, -1)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)  # 8-bit RGBA
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw.tobytes(), 1))
+            + chunk(b"IEND", b""))
+
+
+def frame_delay_cs(index, interval=FRAME_INTERVAL):
+    # GIF delays are whole centiseconds. Each frame gets the rounding error of
+    # the ones before it carried over (25 ms frames alternate 2 and 3 cs), so
+    # frame i always ends at floor((i + 1) * interval / 10) cs and a clip plays
+    # back at its real length.
+    return (index + 1) * interval // 10 - index * interval // 10
+
+
+def encode_gif_frame(image, previous, delay_cs):
+    # One GIF frame covering only the pixels that changed since `previous`.
+    # Pixels are written as uncompressed LZW (a clear code before the table
+    # would grow), which vectorizes with NumPy; the small changed region keeps
+    # the file size reasonable.
+    if previous is not None:
+        changed = image != previous
+        if changed.any():
+            rows, columns = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+            top, bottom, left, right = rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+        else:
+            top, bottom, left, right = 0, 1, 0, 1  # Nothing changed; repaint one pixel to keep the timing
+    else:
+        top, left, bottom, right = 0, 0, image.shape[0], image.shape[1]
+    region = image[top:bottom, left:right]
+
+    values, indices = np.unique(region.reshape(-1), return_inverse=True)
+    if len(values) > 256:
+        raise ValueError("GIF frames are limited to 256 colours")
+    colors = to_rgb(values)
+    color_bits = max(1, int(np.ceil(np.log2(len(colors)))))
+    palette = np.zeros((1 << color_bits, 3), dtype=np.uint8)
+    palette[:len(colors)] = colors
+
+    min_code_size = max(2, color_bits)
+    clear, end = 1 << min_code_size, (1 << min_code_size) + 1
+    code_size = min_code_size + 1
+    run = (1 << code_size) - (1 << min_code_size) - 2  # Literals that fit before the code size would grow
+    indices = indices.reshape(-1)
+    groups = -(-len(indices) // run)
+    codes = np.empty(len(indices) + groups + 1, dtype=np.uint16)
+    literals = np.ones(len(codes), dtype=bool)
+    literals[np.arange(groups) * (run + 1)] = False
+    literals[-1] = False
+    codes[~literals] = clear
+    codes[literals] = indices
+    codes[-1] = end
+    bits = ((codes[:, None] >> np.arange(code_size, dtype=np.uint16)) & 1).astype(np.uint8).reshape(-1)
+    data = np.packbits(bits, bitorder="little").tobytes()
+
+    blocks = b"".join(bytes([len(data[i:i + 255])]) + data[i:i + 255] for i in range(0, len(data), 255))
+    control = struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0x04, delay_cs, 0, 0)  # Leave previous pixels in place
+    descriptor = struct.pack("<BHHHHB", 0x2C, left, top, right - left, bottom - top, 0x80 | (color_bits - 1))
+    return control + descriptor + palette.tobytes() + bytes([min_code_size]) + blocks + b"\x00"
+
+
+def render_chunk(job):
+    # Worker: rasterize a contiguous run of frames and either write PNGs or return GIF frame data
+    frames, first_index, previous_items, width, height, output, kind = job
+    results = []
+    previous = rasterize(previous_items, width, height) if previous_items is not None else None
+    for offset, items in enumerate(frames):
+        image = rasterize(items, width, height)
+        if kind == "png":
+            path = os.path.join(output, f"frame_{first_index + offset:05d}.png")
+            with open(path, "wb") as frame_file:
+                frame_file.write(encode_png(image))
+            results.append(path)
+        else:
+            results.append(encode_gif_frame(image, previous, frame_delay_cs(first_index + offset)))
+        previous = image
+    return results
+
+
+def render_frames(frames, width, height, output, kind="png", workers=None, chunk_size=20):
+    # Rasterize snapshots in a process pool. PNGs are written to the `output`
+    # directory; a GIF is assembled in frame order and written to `output`.
+    if kind == "png":
+        os.makedirs(output, exist_ok=True)
+    jobs = []
+    for start in range(0, len(frames), chunk_size):
+        previous = frames[start - 1] if start else None
+        jobs.append((frames[start:start + chunk_size], start, previous, width, height, output, kind))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = [result for chunk in pool.map(render_chunk, jobs) for result in chunk]
+
+    if kind == "png":
+        return results
+    with open(output, "wb") as gif_file:
+        gif_file.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+        gif_file.write(b"\x21\xFF\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")  # Loop forever
+        for frame in results:
+            gif_file.write(frame)
+        gif_file.write(b"\x3B")
+    return [output]
+
+
+def record_frames(seconds, liquid_density=1.0, objects=(), width=800, height=600, layered=False):
+    # Run the simulator headlessly on a deterministic frame clock: one fixed
+    # timestep per frame, no Tk timers. Returns one canvas snapshot per frame.
+    from layers import LayeredLiquid
+    from scene import ObjectScene
+    from scheduler import FrameScheduler
+    from simulation import LiquidAnimation
+
+    canvas = HeadlessCanvas(width, height)
+    scheduler = FrameScheduler(canvas, interval=FRAME_INTERVAL)
+    liquid = LiquidAnimation(canvas, width, height, density=liquid_density, scheduler=scheduler)
+    scene = ObjectScene(canvas, liquid, width)
+    animations = [liquid, scene]
+    if layered:
+        canvas.itemconfig(liquid.water_polygon, state="hidden")
+        layers = LayeredLiquid(canvas, width, height, scheduler=scheduler)
+        scene.set_layers(layers)
+        animations = [layers, scene]
+    if objects:
+        densities, volumes, colors = zip(*objects)
+        scene.add_many(densities, volumes, colors)
+
+    frames = []
+    for _ in range(int(seconds * 1000 / FRAME_INTERVAL)):
+        for animation in animations:
+            animation.step()
+            animation.render()
+        frames.append(canvas.snapshot())
+    return frames
+
+
+def main():
+    from materials import load_catalogue
+
+    parser = argparse.ArgumentParser(description="Render the density simulator to PNG frames or a GIF without a display.")
+    parser.add_argument("output", help="directory for PNG frames, or a .gif file")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--density", type=float, default=1.0, help="liquid density")
+    parser.add_argument("--objects", nargs="*", default=None, help="catalogue objects to drop (default: all presets)")
+    parser.add_argument("--volume", type=float, default=5)
+    parser.add_argument("--layered", action="store_true", help="use the stacked water/oil/soap/honey tank")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    catalogue = load_catalogue()
+    names = args.objects if args.objects is not None else [name for name in catalogue.names if name != "Custom"]
+    objects = [(catalogue.density(name), args.volume, catalogue.color(name)) for name in names]
+    frames = record_frames(args.seconds, args.density, objects, layered=args.layered)
+    kind = "gif" if args.output.lower().endswith(".gif") else "png"
+    written = render_frames(frames, 800, 600, args.output, kind, workers=args.workers)
+    print(f"Rendered {len(frames)} frames to {args.output} ({len(written)} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import numpy as np
+
+from utils import hex_to_rgb, rgb_to_hex
+
+# Anchor colours for the liquids the density slider walks through. The old
+# step bands (water < 1.0, water/oil < 1.1, oil < 1.3, soap < 1.6, honey) are
+# anchored at their centres and blended linearly in between.
+LIQUID_ANCHORS = [
+    (0.90, "#5cb5e1"),  # Blue (Water)
+    (1.05, "#b39eb5"),  # Purple (Combination of Water and Oil)
+    (1.20, "#ffee8c"),  # Yellow (Oil)
+    (1.45, "#ffd1dc"),  # Pink (Soap)
+    (1.75, "#bc9337"),  # Dark Orange (Honey)
+]
+
+# Range and resolution of the density slider
+DENSITY_MIN = 0.5
+DENSITY_MAX = 2.0
+DENSITY_RESOLUTION = 0.01
+
+
+class DensityColorMap:
+    # Lookup table of liquid colours, one entry per slider position
+    def __init__(self, anchors=LIQUID_ANCHORS, low=DENSITY_MIN, high=DENSITY_MAX, resolution=DENSITY_RESOLUTION):
+        self.low = low
+        self.resolution = resolution
+        count = int(round((high - low) / resolution)) + 1
+        densities = low + np.arange(count) * resolution
+
+        anchor_densities = [density for density, _ in anchors]
+        anchor_rgb = np.array([hex_to_rgb(color) for _, color in anchors], dtype=np.float64)
+        table = np.column_stack([np.interp(densities, anchor_densities, anchor_rgb[:, c]) for c in range(3)])
+
+        self.rgb_table = [tuple(row) for row in np.rint(table).astype(int).tolist()]
+        self.hex_table = [rgb_to_hex(rgb) for rgb in self.rgb_table]
+
+    def index(self, density):
+        index = int(round((density - self.low) / self.resolution))
+        return min(max(index, 0), len(self.hex_table) - 1)
+
+    def rgb(self, density):
+        return self.rgb_table[self.index(density)]
+
+    def color(self, density):
+        return self.hex_table[self.index(density)]
+
+
+# Built once per process and shared by every LiquidAnimation
+LIQUID_COLORS = DensityColorMap()
+
+
+class ColorTransition:
+    # Eases a colour towards a target entirely in Python. advance() returns the
+    # new hex colour only when it changed, and None once the target is reached,
+    # so callers touch Tk only while the colour is actually moving.
+    def __init__(self, rgb, rate=0.05):
+        self.rate = rate
+        self.current = [float(c) for c in rgb]
+        self.target = tuple(rgb)
+        self.color = rgb_to_hex(rgb)
+
+    @property
+    def converged(self):
+        return all(current == target for current, target in zip(self.current, self.target))
+
+    def set_target(self, rgb):
+        self.target = tuple(rgb)
+
+    def advance(self):
+        if self.converged:
+            return None
+        for i in range(3):
+            remaining = self.target[i] - self.current[i]
+            if abs(remaining) < 1:
+                self.current[i] = self.target[i]  # Close enough to snap, otherwise the easing never lands
+            else:
+                self.current[i] += remaining * self.rate
+        color = rgb_to_hex([round(c) for c in self.current])
+        if color == self.color:
+            return None
+        self.color = color
+        return color
@@ -0,0 +1,91 @@
+import numpy as np
+
+import buoyancy
+
+
+class BuoyancyIntegrator:
+    # Continuous vertical dynamics for every object in an ObjectScene.
+    #
+    # Works in canvas units (pixels, seconds, y pointing down). Each object is a
+    # cube of side `size` whose top edge is at `y`; the liquid surface is at
+    # `surface_y`. Per unit mass the forces are
+    #     gravity     g
+    #     buoyancy   -g * (liquid_density / density) * submerged_fraction
+    #     drag       -(linear_drag * v + quadratic_drag * v * |v| / size) * drag_fraction
+    # so a floating cube settles at a draft of size * density / liquid_density and
+    # a sinking one approaches its terminal velocity. The state is advanced with
+    # classic RK4 in fixed substeps, independently of the render rate.
+    #
+    # For stratified liquids, surface_y and liquid_density may instead be arrays
+    # of layer tops and densities (lightest first); buoyancy then sums the
+    # liquid displaced in every layer the cube overlaps.
+    def __init__(self, gravity=980.0, linear_drag=4.0, quadratic_drag=2.0, air_drag=0.05, substep=1 / 240,
+                 floor_y=None):
+        self.gravity = gravity
+        self.linear_drag = linear_drag
+        self.quadratic_drag = quadratic_drag
+        self.air_drag = air_drag  # Fraction of the liquid drag felt above the surface
+        self.substep = substep
+        self.floor_y = floor_y  # Tank bottom; objects stop when their bottom edge reaches it
+        self._accumulator = 0.0
+
+    def submerged_fraction(self, y, size, surface_y):
+        return np.clip((y + size - surface_y) / size, 0.0, 1.0)
+
+    def layer_fractions(self, y, size, layer_tops):
+        # Fraction of each cube inside each layer, shape (objects, layers)
+        layer_bottoms = np.append(layer_tops[1:], np.inf)
+        y = np.asarray(y)[..., None]
+        size = np.asarray(size)[..., None]
+        overlap = np.minimum(y + size, layer_bottoms) - np.maximum(y, layer_tops)
+        return np.clip(overlap / size, 0.0, 1.0)
+
+    def acceleration(self, y, v, size, density, liquid_density, surface_y):
+        if np.ndim(surface_y):
+            fractions = self.layer_fractions(y, size, np.asarray(surface_y))
+            submerged = fractions.sum(axis=-1)
+            lift = self.gravity * (fractions @ np.asarray(liquid_density)) / density
+        else:
+            submerged = self.submerged_fraction(y, size, surface_y)
+            lift = self.gravity * (liquid_density / density) * submerged
+        drag_fraction = self.air_drag + (1 - self.air_drag) * submerged
+        drag = (self.linear_drag * v + self.quadratic_drag * v * np.abs(v) / size) * drag_fraction
+        return self.gravity - lift - drag
+
+    def rk4(self, y, v, dt, size, density, liquid_density, surface_y):
+        # One RK4 step for all objects at once; returns the new (y, v)
+        def a(y, v):
+            return self.acceleration(y, v, size, density, liquid_density, surface_y)
+
+        k1y, k1v = v, a(y, v)
+        k2y, k2v = v + 0.5 * dt * k1v, a(y + 0.5 * dt * k1y, v + 0.5 * dt * k1v)
+        k3y, k3v = v + 0.5 * dt * k2v, a(y + 0.5 * dt * k2y, v + 0.5 * dt * k2v)
+        k4y, k4v = v + dt * k3v, a(y + dt * k3y, v + dt * k3v)
+        y = y + dt / 6 * (k1y + 2 * k2y + 2 * k3y + k4y)
+        v = v + dt / 6 * (k1v + 2 * k2v + 2 * k3v + k4v)
+        return y, v
+
+    def advance(self, y, v, elapsed, size, density, liquid_density, surface_y):
+        # Run as many fixed substeps as fit in `elapsed` seconds and carry the rest over
+        self._accumulator += elapsed
+        steps = int(self._accumulator / self.substep)
+        self._accumulator -= steps * self.substep
+        for _ in range(steps):
+            y, v = self.rk4(y, v, self.substep, size, density, liquid_density, surface_y)
+            if self.floor_y is not None:
+                resting = y + size >= self.floor_y
+                y = np.where(resting, self.floor_y - size, y)
+                v = np.where(resting & (v > 0), 0.0, v)
+        return y, v
+
+    def equilibrium_y(self, size, density, liquid_density, surface_y):
+        # Where each object comes to rest: floating at its draft (or across an interface), or on the floor
+        floor_y = self.floor_y if self.floor_y is not None else np.inf
+        return buoyancy.rest_positions(density, size, surface_y, liquid_density, floor_y)
+
+    def terminal_velocity(self, size, density, liquid_density):
+        # Fully submerged: g * (1 - liquid/density) = linear * v + quadratic * v^2 / size
+        net = self.gravity * (1 - liquid_density / density)
+        a = self.quadratic_drag / size
+        b = self.linear_drag
+        return np.sign(net) * (-b + np.sqrt(b * b + 4 * a * np.abs(net))) / (2 * a)
@@ -0,0 +1,304 @@
+import os
+import struct
+import warnings
+
+import numpy as np
+
+from layers import LayeredLiquid
+from palette import LIQUID_COLORS
+from scene import CanvasItemPool
+from wave_geometry import WaveGeometry, lod_step
+
+# File layout: a 64-byte header followed by `capacity` fixed-size frame records.
+#   magic, version, max_objects, interval (ms), capacity (frames), frames written
+HEADER = struct.Struct("<4sHHIQQ")
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u2"), ("max_objects", "<u2"), ("interval", "<u4"),
+                         ("capacity", "<u8"), ("written", "<u8")])  # The same fields, for mapping in place
+HEADER_SIZE = 64
+MAGIC = b"DSRR"
+VERSION = 1
+
+# Mode flags, one bit each
+MODE_LAYERS = 1
+MODE_PHYSICS = 2
+MODE_RIPPLES = 4
+
+# Input events seen since the previous frame, derived from the state itself
+EVENT_DENSITY = 1
+EVENT_OBJECTS = 2
+EVENT_MODE = 4
+EVENT_RESIZE = 8
+
+GROWTH = 2400  # Frames added each time an unbounded recording fills up: one minute at 40 fps
+MAX_OBJECTS = 0xFFFF  # The header stores max_objects in 16 bits
+WIDEN_CHUNK = 4096  # Frames copied at a time when the object slots are widened
+
+
+def frame_dtype(max_objects):
+    # One tick of the simulation. Objects are stored by scene slot; only the
+    # first `count` slots are meaningful.
+    return np.dtype([
+        ("tick", "<u4"),  # Fixed steps since recording started
+        ("events", "<u2"),
+        ("flags", "u1"),
+        ("count", "<u2"),
+        ("width", "<u2"),
+        ("height", "<u2"),
+        ("offset", "<i4"),  # Wave phase of whichever liquid is showing
+        ("liquid_density", "<f4"),
+        ("x", "<f4", (max_objects,)),
+        ("y", "<f4", (max_objects,)),
+        ("vy", "<f4", (max_objects,)),
+        ("size", "<f4", (max_objects,)),
+        ("rgb", "<u4", (max_objects,)),
+        ("alive", "u1", (max_objects,)),
+    ])
+
+
+class SessionRecorder:
+    # Writes the scene's state once per scheduler tick into a memory-mapped
+    # file of fixed-size records, so any frame can be read back directly.
+    #
+    # Each tick is one row of a preallocated structured array: a handful of
+    # scalar fields plus slices of the scene's arrays, with no allocation and
+    # no Tk calls. With `max_frames` the file is a ring holding the most recent
+    # frames, which keeps an always-on recorder bounded; without it the file
+    # grows a minute at a time. When the scene holds more objects than
+    # `max_objects`, every record is widened in place to the scene's capacity,
+    # so a recording never loses objects. The header is mapped too and its frame count is bumped after
+    # every frame, so a session that is killed before close() can still be
+    # played back up to its last frame.
+    def __init__(self, path, scene, max_objects=64, max_frames=None, interval=25):
+        self.path = path
+        self.scene = scene
+        self.max_objects = max_objects
+        self.max_frames = max_frames
+        self.interval = interval
+        self.dtype = frame_dtype(max_objects)
+        self.count = 0
+        self.tick = 0
+        self._previous = None
+        self._dropping = False
+        capacity = max_frames or GROWTH
+        with open(path, "wb") as session_file:
+            session_file.write(HEADER.pack(MAGIC, VERSION, max_objects, interval, capacity, 0))
+            session_file.write(bytes(HEADER_SIZE - HEADER.size))
+        self.header = np.memmap(path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+        self._map(capacity)
+
+    def _map(self, capacity):
+        with open(self.path, "r+b") as session_file:
+            session_file.truncate(HEADER_SIZE + capacity * self.dtype.itemsize)
+        self.capacity = capacity
+        self.frames = np.memmap(self.path, dtype=self.dtype, mode="r+", offset=HEADER_SIZE, shape=(capacity,))
+        self.header["capacity"] = capacity
+
+    def _widen(self, max_objects):
+        # Rewrites the records with room for more objects. Each widened record starts at or after where
+        # the old one did, so copying from the last frame backwards never overwrites a frame not yet moved.
+        old_dtype, old_max = self.dtype, self.max_objects
+        self.frames.flush()
+        del self.frames
+        self.max_objects = max_objects
+        self.dtype = frame_dtype(max_objects)
+        self.header["max_objects"] = max_objects
+        self._map(self.capacity)
+        old = np.memmap(self.path, dtype=old_dtype, mode="r", offset=HEADER_SIZE, shape=(self.capacity,))
+        for stop in range(self.capacity, 0, -WIDEN_CHUNK):
+            start = max(0, stop - WIDEN_CHUNK)
+            chunk = np.array(old[start:stop])
+            widened = np.zeros(stop - start, dtype=self.dtype)
+            for name in old_dtype.names:
+                if chunk[name].ndim > 1:
+                    widened[name][:, :old_max] = chunk[name]
+                else:
+                    widened[name] = chunk[name]
+            self.frames[start:stop] = widened
+        del old
+
+    def attach(self, scheduler):
+        scheduler.add_observer(self.capture)
+
+    def capture(self, steps=1):
+        if self.count == self.capacity and self.max_frames is None:
+            self.frames.flush()
+            self._map(self.capacity + GROWTH)
+
+        scene = self.scene
+        if scene.count > self.max_objects:
+            if self.max_objects < MAX_OBJECTS:
+                self._widen(min(max(scene.capacity, scene.count), MAX_OBJECTS))
+            if scene.count > self.max_objects and not self._dropping:
+                warnings.warn(f"{self.path}: only the first {self.max_objects} objects are recorded")
+                self._dropping = True
+        liquid = scene.liquid_animation
+        layers = scene.layers
+        self.tick += steps
+        flags = ((MODE_LAYERS if layers is not None else 0) | (MODE_PHYSICS if scene.physics is not None else 0)
+                 | (MODE_RIPPLES if liquid.ripples is not None else 0))
+        n = min(scene.count, self.max_objects)
+
+        frame = self.frames[self.count % self.capacity]
+        frame["tick"] = self.tick
+        frame["flags"] = flags
+        frame["count"] = n
+        frame["width"] = liquid.width
+        frame["height"] = liquid.height
+        frame["offset"] = layers.offset if layers is not None else liquid.offset
+        frame["liquid_density"] = scene.liquid_density
+        frame["x"][:n] = scene.x[:n]
+        frame["y"][:n] = scene.y[:n]
+        frame["vy"][:n] = scene.vy[:n]
+        frame["size"][:n] = scene.size[:n]
+        frame["rgb"][:n] = scene.rgb[:n]
+        frame["alive"][:n] = scene.alive[:n]
+
+        state = (scene.liquid_density, len(scene), scene.count, flags, liquid.width, liquid.height)
+        previous = self._previous or state
+        frame["events"] = ((EVENT_DENSITY if state[0] != previous[0] else 0)
+                           | (EVENT_OBJECTS if state[1:3] != previous[1:3] else 0)
+                           | (EVENT_MODE if state[3] != previous[3] else 0)
+                           | (EVENT_RESIZE if state[4:] != previous[4:] else 0))
+        self._previous = state
+        self.count += 1
+        self.header["written"] = self.count  # Only once the frame itself is in place
+
+    def flush(self):
+        # The maps are already shared with the file; this pushes them to disk
+        self.frames.flush()
+        self.header.flush()
+
+    def close(self):
+        self.flush()
+        if self.max_frames is None:
+            # Drop the unused tail of the last growth step
+            self.header["capacity"] = self.count
+            self.header.flush()
+            del self.frames, self.header
+            with open(self.path, "r+b") as session_file:
+                session_file.truncate(HEADER_SIZE + self.count * self.dtype.itemsize)
+
+
+class SessionPlayer:
+    # Read-only view of a recording. frame(i) is a direct index into the
+    # memory-mapped records, so seeking anywhere costs the same as the next frame.
+    def __init__(self, path):
+        with open(path, "rb") as session_file:
+            magic, version, max_objects, interval, capacity, written = HEADER.unpack(
+                session_file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a density simulator recording")
+        self.max_objects = max_objects
+        self.interval = interval
+        self.capacity = capacity
+        self.written = written
+        dtype = frame_dtype(max_objects)
+        stored = (os.path.getsize(path) - HEADER_SIZE) // dtype.itemsize
+        if stored:
+            self.frames = np.memmap(path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(stored,))
+        else:
+            self.frames = np.empty(0, dtype=dtype)  # Nothing to map
+        # A ring recording that wrapped starts at its oldest surviving frame
+        self.first = written - min(written, capacity)
+
+    def __len__(self):
+        return self.written - self.first
+
+    def frame(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.frames[(self.first + index) % self.capacity]
+
+
+class ReplayAnimation:
+    # Draws recorded frames on a canvas. seek() jumps straight to any frame;
+    # play() runs forwards (direction=1) or backwards (-1) on the scheduler.
+    def __init__(self, canvas, player, scheduler, on_frame=None):
+        self.player = player
+        self.scheduler = scheduler
+        self.canvas = scheduler.render_layer(canvas)
+        self.on_frame = on_frame
+        self.index = 0
+        self.direction = 1
+        self.pool = CanvasItemPool(self.canvas)
+        self.items = {}  # Slot -> (canvas item, rgb)
+        self.geometry = {}  # (width, height) -> WaveGeometry
+        self.layers = None
+        self.color = None
+        self.water_polygon = self.canvas.create_polygon(0, 0, 0, 0, 0, 0, fill="", outline="")
+        self.canvas.tag_lower(self.water_polygon)
+
+    def seek(self, index):
+        self.index = max(0, min(index, len(self.player) - 1))
+        self.render()
+
+    def play(self, direction=1):
+        self.direction = direction
+        self.scheduler.add("replay", self)
+
+    def pause(self):
+        self.scheduler.remove("replay")
+
+    def step(self):
+        next_index = self.index + self.direction
+        if not 0 <= next_index < len(self.player):
+            return False
+        self.index = next_index
+        return True
+
+    def render(self):
+        frame = self.player.frame(self.index)
+        self.draw_liquid(frame)
+        self.draw_objects(frame)
+        if self.on_frame is not None:
+            self.on_frame(self.index)
+
+    def draw_liquid(self, frame):
+        width, height = int(frame["width"]), int(frame["height"])
+        layered = bool(frame["flags"] & MODE_LAYERS)
+        if layered:
+            if self.layers is None or (self.layers.width, self.layers.height) != (width, height):
+                if self.layers is not None:
+                    self.layers.destroy()
+                self.layers = LayeredLiquid(self.canvas, width, height, scheduler=self.scheduler)
+            self.layers.offset = int(frame["offset"])
+            self.layers.render()
+        elif self.layers is not None:
+            self.layers.destroy()
+            self.layers = None
+        self.canvas.itemconfig(self.water_polygon, state="hidden" if layered else "normal")
+        if layered:
+            return
+
+        key = (width, height)
+        if key not in self.geometry:
+            self.geometry[key] = WaveGeometry(width, height, height - 200, step=lod_step(4, 50))
+        self.canvas.coords(self.water_polygon, self.geometry[key].update(int(frame["offset"])).tolist())
+        # Replays show the density's own colour at once instead of easing towards it
+        color = LIQUID_COLORS.color(float(frame["liquid_density"]))
+        if color != self.color:
+            self.canvas.itemconfig(self.water_polygon, fill=color)
+            self.color = color
+
+    def draw_objects(self, frame):
+        count = int(frame["count"])
+        alive = frame["alive"][:count]
+        for slot in list(self.items):
+            if slot >= count or not alive[slot]:
+                self.pool.release(self.items.pop(slot)[0])
+        x1 = frame["x"][:count].tolist()
+        y1 = frame["y"][:count].tolist()
+        size = frame["size"][:count].tolist()
+        rgb = frame["rgb"][:count].tolist()
+        for slot in np.flatnonzero(alive).tolist():
+            color = f"#{rgb[slot]:06x}"
+            item = self.items.get(slot)
+            if item is None:
+                item = (self.pool.acquire(color), rgb[slot])
+                self.items[slot] = item
+            elif item[1] != rgb[slot]:
+                self.canvas.itemconfig(item[0], fill=color)
+                item = self.items[slot] = (item[0], rgb[slot])
+            self.canvas.coords(item[0], [x1[slot], y1[slot], x1[slot] + size[slot], y1[slot] + size[slot]])
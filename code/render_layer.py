@@ -0,0 +1,137 @@
+class RenderLayer:
+    # Sits between the simulation classes and a tk.Canvas and keeps a copy of
+    # every item's coords and options in Python.
+    #
+    # coords(), move() and itemconfig() only record what differs from that
+    # copy; reads are answered from it without asking Tk. The FrameScheduler
+    # flushes the recorded changes once per frame, after every render(), as a
+    # single batch: one Tcl script on a real canvas, or the canvas's own
+    # batch() when it has one. Changes made outside a tick (a click, a
+    # resize) are sent at once. Creating, deleting and restacking items go straight to
+    # the canvas, and anything else is passed through untouched.
+    def __init__(self, canvas, scheduler):
+        self.canvas = canvas
+        self.scheduler = scheduler
+        self.items = {}  # Item -> {"coords": [...], option: value}
+        self.dirty = {}  # Item -> [coords or None, {option: value}]
+        self.flushes = 0
+
+    def __getattr__(self, name):
+        return getattr(self.canvas, name)
+
+    def _state(self, item):
+        state = self.items.get(item)
+        if state is None:
+            # Created behind our back, e.g. straight on the canvas: read it once
+            state = self.items[item] = {"coords": list(self.canvas.coords(item))}
+        return state
+
+    def _create(self, create, coords, options):
+        item = create(*coords, **options)
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        self.items[item] = {"coords": [float(c) for c in coords], **options}
+        return item
+
+    def create_polygon(self, *coords, **options):
+        return self._create(self.canvas.create_polygon, coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create(self.canvas.create_rectangle, coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create(self.canvas.create_text, coords, options)
+
+    def coords(self, item, *coords):
+        if not coords:
+            return list(self._state(item)["coords"])
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        self._set_coords(item, list(coords))
+
+    def _set_coords(self, item, coords):
+        # Called for every moving object every frame, so the bookkeeping is inlined
+        state = self.items.get(item) or self._state(item)
+        if coords == state["coords"]:
+            return
+        state["coords"] = coords
+        changes = self.dirty.get(item)
+        if changes is None:
+            self.dirty[item] = [coords, None]
+        else:
+            changes[0] = coords
+        if not self.scheduler.ticking:
+            self.flush()
+
+    def move(self, item, dx, dy):
+        old = self._state(item)["coords"]
+        if len(old) == 4:
+            self._set_coords(item, [old[0] + dx, old[1] + dy, old[2] + dx, old[3] + dy])
+        else:
+            self._set_coords(item, [value + (dy if i % 2 else dx) for i, value in enumerate(old)])
+
+    def itemconfig(self, item, **options):
+        state = self._state(item)
+        changed = {name: value for name, value in options.items() if state.get(name) != value}
+        if not changed:
+            return
+        state.update(changed)
+        changes = self.dirty.setdefault(item, [None, None])
+        if changes[1] is None:
+            changes[1] = changed
+        else:
+            changes[1].update(changed)
+        if not self.scheduler.ticking:
+            self.flush()
+
+    itemconfigure = itemconfig
+
+    def itemcget(self, item, option):
+        state = self._state(item)
+        if option not in state:
+            state[option] = self.canvas.itemcget(item, option)
+        return state[option]
+
+    def tag_lower(self, item, *below):
+        self.canvas.tag_lower(item, *below)
+
+    def delete(self, item):
+        self.items.pop(item, None)
+        self.dirty.pop(item, None)
+        self.canvas.delete(item)
+
+    def flush(self):
+        if not self.dirty:
+            return
+        # (item, coords or None, options or None) for every item that changed
+        commands = [(item, coords, options) for item, (coords, options) in self.dirty.items()]
+        self.dirty = {}
+        self.flushes += 1
+        batch = getattr(self.canvas, "batch", None)
+        if batch is not None:
+            batch(commands)
+        else:
+            self.canvas.tk.eval(tcl_script(str(self.canvas), commands))
+
+
+# Characters that would end a word or start a substitution in a Tcl script
+TCL_ESCAPES = str.maketrans({char: "\\" + char for char in '\\{}[]$"; '})
+TCL_ESCAPES.update({ord("\n"): "\\n", ord("\t"): "\\t", ord("\r"): "\\r"})
+
+
+def tcl_quote(value):
+    # Any option value, text included, as exactly one Tcl word with nothing substituted
+    value = str(value)
+    return value.translate(TCL_ESCAPES) if value else "{}"
+
+
+def tcl_script(path, commands):
+    # One Tcl command per change, evaluated in a single round-trip
+    lines = []
+    for item, coords, options in commands:
+        if coords is not None:
+            lines.append(f"{path} coords {item} {' '.join(map(str, map(float, coords)))}")
+        if options:
+            lines.append(f"{path} itemconfigure {item} "
+                         + " ".join(f"-{name} {tcl_quote(value)}" for name, value in options.items()))
+    return "\n".join(lines)
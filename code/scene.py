@@ -0,0 +1,274 @@
+import numpy as np
+
+import buoyancy
+import utils
+
+
+class CanvasItemPool:
+    # Reuses canvas rectangles instead of deleting and recreating them
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.free = []
+
+    def acquire(self, color):
+        if self.free:
+            item = self.free.pop()
+            self.canvas.itemconfig(item, fill=color, state="normal")
+        else:
+            item = self.canvas.create_rectangle(0, 0, 0, 0, fill=color, outline="")
+        return item
+
+    def release(self, item):
+        self.canvas.itemconfig(item, state="hidden")
+        self.free.append(item)
+
+
+class ObjectScene:
+    # All objects in the tank, stored as parallel arrays (struct of arrays).
+    #
+    # step() advances every moving object in one vectorized pass and render()
+    # pushes only the objects whose position changed to the canvas. The scene
+    # registers with the liquid's FrameScheduler and drops out of it once
+    # everything has come to rest.
+    #
+    # Without a physics integrator objects glide at a constant speed to fixed
+    # float/sink targets; with a BuoyancyIntegrator they are driven by gravity,
+    # buoyancy and drag and settle at their real equilibrium draft.
+    speed = 2  # Pixels per step, same as ObjectAnimation
+    float_offset = -20  # Rest position relative to the surface when floating, as in ObjectAnimation
+    sink_offset = 130  # ...and when sinking
+    drop_height = 100  # New objects start this far above the surface
+
+    def __init__(self, canvas, liquid_animation, width, capacity=64, physics=None):
+        self.width = width
+        self.liquid_animation = liquid_animation
+        self.scheduler = liquid_animation.scheduler
+        self.canvas = self.scheduler.render_layer(canvas)
+        self.physics = physics
+        self.layers = None  # LayeredLiquid when the tank holds stratified liquids
+        self.liquid_density = liquid_animation.density
+        self._critical_index = None  # Rebuilt lazily after objects are added or removed
+        self.pool = CanvasItemPool(self.canvas)
+        self.count = 0  # Slots in use, including removed ones waiting for reuse
+        self.free_slots = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.density = np.zeros(capacity)
+        self.volume = np.zeros(capacity)
+        self.target_y = np.zeros(capacity)
+        self.rendered_y = np.full(capacity, np.nan)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.moving = np.zeros(capacity, dtype=bool)
+        self.items = np.zeros(capacity, dtype=np.int64)
+        self.rgb = np.zeros(capacity, dtype=np.uint32)  # Fill colour packed as 0xRRGGBB
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in
+               ("x", "y", "vy", "size", "density", "volume", "target_y", "rendered_y", "alive", "moving", "items",
+                "rgb")}
+        self._allocate(2 * len(self.x))
+        for name, values in old.items():
+            getattr(self, name)[:len(values)] = values
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def add(self, density, volume, color, x, y=None):
+        return int(self.add_many([density], [volume], [color], [x], y)[0])
+
+    def add_many(self, densities, volumes, colors, xs=None, y=None):
+        densities = np.asarray(densities, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        count = len(densities)
+        if xs is None:
+            xs = self.spread(count)
+        if y is None:
+            y = self.liquid_surface() - self.drop_height  # Dropped in from above the liquid
+
+        slots = np.empty(count, dtype=np.int64)
+        for i in range(count):
+            if self.free_slots:
+                slots[i] = self.free_slots.pop()
+            else:
+                if self.count == self.capacity:
+                    self._grow()
+                slots[i] = self.count
+                self.count += 1
+            self.items[slots[i]] = self.pool.acquire(colors[i])
+            self.rgb[slots[i]] = self.pack_rgb(colors[i])
+
+        # Same scale as CanvasFrame.create_cube
+        self.size[slots] = np.cbrt(densities * volumes) * 10
+        self.x[slots] = np.asarray(xs, dtype=np.float64) - self.size[slots] / 2
+        self.y[slots] = y
+        self.vy[slots] = 0
+        self.density[slots] = densities
+        self.volume[slots] = volumes
+        self.rendered_y[slots] = np.nan
+        self.alive[slots] = True
+        self._critical_index = None
+        self.retarget(slots)
+        return slots
+
+    def pack_rgb(self, color):
+        # Colours are only kept for recordings; Tk names we don't know are recorded as black
+        try:
+            red, green, blue = utils.parse_color(color)
+        except ValueError:
+            return 0
+        return red << 16 | green << 8 | blue
+
+    def spread(self, count):
+        # Evenly spaced x centres across the visible canvas
+        return (np.arange(count) + 0.5) * self.width / max(count, 1)
+
+    def resize(self, width):
+        # Keep every object at the same relative position across the new width
+        n = self.count
+        half = self.size[:n] / 2
+        self.x[:n] = (self.x[:n] + half) * (width / self.width) - half  # x is the left edge; scale the centre
+        self.width = width
+        self.rendered_y[:n] = np.nan  # x changed, so every item needs new coords
+        self.retarget()
+
+    def remove(self, slot):
+        if not self.alive[slot]:
+            return
+        self.alive[slot] = False
+        self.moving[slot] = False
+        self.pool.release(int(self.items[slot]))
+        self.free_slots.append(slot)
+        self._critical_index = None
+
+    def clear(self):
+        for slot in np.flatnonzero(self.alive[:self.count]):
+            self.remove(int(slot))
+        self.scheduler.remove("scene")
+
+    @property
+    def critical_index(self):
+        if self._critical_index is None:
+            slots = np.flatnonzero(self.alive[:self.count])
+            self._critical_index = buoyancy.CriticalDensityIndex(self.density[slots], slots)
+        return self._critical_index
+
+    def set_liquid_density(self, density):
+        # Re-evaluate only the objects whose float/sink state flips between the two densities
+        self.liquid_animation.set_density(density)
+        if self.layers is not None:
+            # The slider only drives the single liquid, which is not in the tank right now
+            self.liquid_density = density
+            return np.empty(0, dtype=np.int64)
+        slots = self.critical_index.flipped(self.liquid_density, density)
+        if self.physics is not None:
+            # Floating drafts depend on the liquid density too, so those objects move as well
+            slots = np.union1d(slots, self.critical_index.floating(density))
+        self.liquid_density = density
+        if len(slots):
+            self.retarget(slots)
+        return slots
+
+    def set_layers(self, layers):
+        # Switch between the single liquid and a LayeredLiquid (None switches back)
+        self.layers = layers
+        self.retarget()
+
+    def liquid_surface(self):
+        return self.layers.wave_center if self.layers is not None else self.liquid_animation.wave_center
+
+    def liquid_profile(self):
+        # Layer tops and densities for the physics integrator; a single liquid is one surface and density
+        if self.layers is not None:
+            return self.layers.tops, self.layers.densities
+        return self.liquid_animation.wave_center, self.liquid_animation.density
+
+    def set_physics(self, physics):
+        self.physics = physics
+        self.retarget()
+
+    def retarget(self, slots=None):
+        if slots is None:
+            slots = np.flatnonzero(self.alive[:self.count])
+        wave_center = self.liquid_animation.wave_center
+        liquid_density = self.liquid_animation.density
+        if self.physics is not None:
+            surface_y, liquid_density = self.liquid_profile()
+            self.target_y[slots] = self.physics.equilibrium_y(self.size[slots], self.density[slots], liquid_density,
+                                                              surface_y)
+        elif self.layers is not None:
+            # Come to rest on the interface between the layers the density falls between
+            self.target_y[slots] = buoyancy.rest_positions(self.density[slots], self.size[slots], self.layers.tops,
+                                                           self.layers.densities, self.layers.height)
+        else:
+            # Rest just above the liquid when floating, below it when sinking (as ObjectAnimation did)
+            result = buoyancy.evaluate(self.density[slots] * self.volume[slots], self.volume[slots], liquid_density)
+            self.target_y[slots] = np.where(result.floats, wave_center + self.float_offset,
+                                            wave_center + self.sink_offset)
+        self.moving[slots] = True
+        self.scheduler.add("scene", self)
+
+    def step(self):
+        if self.physics is not None:
+            return self.step_physics()
+        n = self.count
+        moving = self.moving[:n]
+        remaining = self.target_y[:n] - self.y[:n]
+        dy = np.where(moving, np.clip(remaining, -self.speed, self.speed), 0)
+        self.y[:n] += dy
+        self.vy[:n] = dy * 1000 / self.scheduler.interval  # Pixels per second, as in physics mode
+        if self.liquid_animation.ripples is not None:
+            self.splash(slice(0, n), self.y[:n] - dy)
+        moving &= self.y[:n] != self.target_y[:n]
+        return bool(moving.any())
+
+    def step_physics(self):
+        slots = np.flatnonzero(self.moving[:self.count])
+        if not len(slots):
+            return False
+        size = self.size[slots]
+        surface_y, liquid_density = self.liquid_profile()
+        y, v = self.physics.advance(self.y[slots], self.vy[slots], self.scheduler.interval / 1000, size,
+                                    self.density[slots], liquid_density, surface_y)
+
+        # Snap objects that have come to rest onto their equilibrium and stop stepping them
+        target_y = self.target_y[slots]
+        settled = (np.abs(v) < 0.5) & (np.abs(y - target_y) < 0.5)
+        y[settled] = target_y[settled]
+        v[settled] = 0
+        old_y = self.y[slots]
+        self.y[slots] = y
+        self.vy[slots] = v
+        self.moving[slots[settled]] = False
+        self.splash(slots, old_y)
+        return bool(self.moving[:self.count].any())
+
+    def splash(self, slots, old_y):
+        # Objects whose bottom edge crossed a simulated surface this step make ripples
+        ripples = self.liquid_animation.ripples
+        if ripples is None or self.layers is not None:
+            return
+        size = self.size[slots]
+        ripples.splash(self.x[slots], size, old_y + size, self.y[slots] + size, self.vy[slots],
+                       self.liquid_animation.wave_center)
+
+    def render(self):
+        n = self.count
+        changed = np.flatnonzero(self.alive[:n] & (self.rendered_y[:n] != self.y[:n]))
+        if not len(changed):
+            return
+        x1 = self.x[changed]
+        y1 = self.y[changed]
+        x2 = x1 + self.size[changed]
+        y2 = y1 + self.size[changed]
+        for item, coords in zip(self.items[changed].tolist(), np.column_stack((x1, y1, x2, y2)).tolist()):
+            self.canvas.coords(item, coords)
+        self.rendered_y[changed] = y1
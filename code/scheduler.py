@@ -0,0 +1,151 @@
+import time
+
+from instrumentation import count_timers
+from render_layer import RenderLayer
+
+
+class FrameScheduler:
+    # Owns the single Tk timer that drives every animation.
+    #
+    # Animations are registered under a key and must provide step(), which
+    # advances them by one fixed timestep and returns False once they have
+    # nothing left to do. An optional render() is called once per tick after
+    # all of that tick's steps, so catching up never repeats canvas work.
+    # Registering under an existing key replaces the old animation, and the
+    # timer stops itself when no animation is left. Pass a FrameMetrics to time
+    # every tick and every animation's step and render. Observers are called
+    # with the number of steps at the end of every tick that advanced time.
+    # Canvas changes made through render_layer() are sent to Tk in one batch
+    # per canvas after every render() of the tick.
+    def __init__(self, widget, interval=25, max_steps=4, clock=time.perf_counter, metrics=None):
+        self.widget = widget
+        self.interval = interval  # Fixed timestep in milliseconds
+        self.max_steps = max_steps  # Steps run per tick before frames are dropped
+        self.clock = clock
+        self.animations = {}
+        self.dropped_frames = 0
+        self.metrics = metrics
+        self.observers = []
+        self.render_layers = {}  # Canvas -> RenderLayer
+        self.ticking = False
+        self._after_id = None
+        self._last_time = None
+        self._accumulator = 0.0
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def add(self, key, animation):
+        self.animations[key] = animation
+        self.start()
+
+    def render_layer(self, canvas):
+        # The one RenderLayer of this canvas, shared by every animation drawing on it
+        if isinstance(canvas, RenderLayer):
+            return canvas
+        layer = self.render_layers.get(canvas)
+        if layer is None:
+            layer = self.render_layers[canvas] = RenderLayer(canvas, self)
+        return layer
+
+    def add_observer(self, callback):
+        self.observers.append(callback)
+
+    def remove(self, key):
+        self.animations.pop(key, None)
+        if not self.animations:
+            self.stop()
+
+    def start(self):
+        if self._after_id is None and self.animations:
+            self._last_time = self.clock()
+            self._accumulator = 0.0
+            self._after_id = self.widget.after(self.interval, self.tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def tick(self):
+        self._after_id = None
+        self.ticking = True
+
+        try:
+            now = self.clock()
+            gap_ms = (now - self._last_time) * 1000
+            self._accumulator += gap_ms
+            self._last_time = now
+            dropped = 0
+
+            # The small tolerance keeps a tick that lands exactly on the interval from losing a step to rounding
+            steps = int((self._accumulator + 1e-6) // self.interval)
+            self._accumulator -= steps * self.interval
+            if steps > self.max_steps:
+                # Fell too far behind: skip the backlog instead of trying to replay it
+                dropped = steps - self.max_steps
+                self.dropped_frames += dropped
+                steps = self.max_steps
+
+            metrics = self.metrics
+            for key, animation in list(self.animations.items()):
+                if metrics is not None:
+                    started = self.clock()
+                active = True
+                for _ in range(steps):
+                    if not animation.step():
+                        active = False
+                        break
+                if steps and hasattr(animation, "render"):
+                    if metrics is not None:
+                        rendered = self.clock()
+                        metrics.record_group(f"{key}.step", (rendered - started) * 1000)
+                        started = rendered
+                    animation.render()
+                    if metrics is not None:
+                        metrics.record_group(f"{key}.render", (self.clock() - started) * 1000)
+                # The animation may have been replaced while it was stepping
+                if not active and self.animations.get(key) is animation:
+                    del self.animations[key]
+
+            if steps:
+                if metrics is not None:
+                    started = self.clock()
+                for layer in self.render_layers.values():
+                    layer.flush()
+                if metrics is not None and self.render_layers:
+                    metrics.record_group("flush", (self.clock() - started) * 1000)
+                for observer in self.observers:
+                    observer(steps)
+        finally:
+            # A step, render or observer that raises must not leave later changes made outside a tick
+            # held back; whatever was drawn before it raised is sent as well
+            self.ticking = False
+            for layer in self.render_layers.values():
+                layer.flush()
+
+        if self.animations:
+            delay = max(1, int(self.interval - self._accumulator))
+            self._after_id = self.widget.after(delay, self.tick)
+
+        if metrics is not None:
+            metrics.record_frame((self.clock() - now) * 1000, gap_ms, dropped, count_timers(self.widget))
+
+
+class Coalescer:
+    # Collapses a burst of calls into a single call on the next tick, made with
+    # the most recent arguments. Used to apply slider drags at most once per frame.
+    def __init__(self, scheduler, key, callback):
+        self.scheduler = scheduler
+        self.key = key
+        self.callback = callback
+        self.args = ()
+
+    def __call__(self, *args):
+        self.args = args
+        self.scheduler.add(self.key, self)
+
+    def step(self):
+        self.callback(*self.args)
+        return False
@@ -0,0 +1,472 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import struct
+import time
+
+import numpy as np
+
+import buoyancy
+from instrumentation import FrameMetrics
+from materials import load_catalogue
+from palette import LIQUID_COLORS
+from scene import ObjectScene
+import utils
+
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BUFFERED = 64 * 1024  # Bytes queued for a client before its frames are dropped instead of queued
+
+# Binary frame sent to every client each tick:
+#   tick, wave offset, flags, [liquid density, liquid colour], changed object count,
+#   then (slot, y * Y_SCALE) per object that moved since the last frame
+FRAME_HEADER = struct.Struct("<IIB")
+DENSITY_PART = struct.Struct("<fI")
+COUNT_PART = struct.Struct("<H")
+FLAG_DENSITY = 1
+DELTA_DTYPE = np.dtype([("slot", "<u2"), ("y", "<i2")])
+Y_SCALE = 8  # Object heights are sent in 1/8 px
+
+
+class SessionBank:
+    # The state of every connected session, stored as (sessions x objects) arrays.
+    #
+    # Each session is one tank with its own liquid density, wave phase and up
+    # to `max_objects` objects that glide to their float/sink positions exactly
+    # as in ObjectScene. step() advances all sessions in one vectorized pass and
+    # frames() encodes what changed for each of them, so the per-tick cost is a
+    # few array operations plus one short bytes object per client.
+    def __init__(self, width=800, height=600, max_objects=16, capacity=64):
+        self.width = width
+        self.height = height
+        self.wave_center = height - 200  # Same as LiquidAnimation
+        self.max_objects = max_objects
+        self.tick = 0
+        self.count = 0
+        self.free_sessions = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        shape = (capacity, self.max_objects)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.offset = np.zeros(capacity, dtype=np.uint32)
+        self.liquid_density = np.ones(capacity)
+        self.density_dirty = np.zeros(capacity, dtype=bool)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.size = np.zeros(shape)
+        self.density = np.zeros(shape)
+        self.volume = np.zeros(shape)
+        self.target_y = np.zeros(shape)
+        self.sent_y = np.full(shape, np.nan)
+        self.alive = np.zeros(shape, dtype=bool)
+        self.moving = np.zeros(shape, dtype=bool)
+
+    def _grow(self):
+        names = ("active", "offset", "liquid_density", "density_dirty", "x", "y", "size", "density", "volume",
+                 "target_y", "sent_y", "alive", "moving")
+        old = {name: getattr(self, name) for name in names}
+        self._allocate(2 * len(self.active))
+        for name, values in old.items():
+            getattr(self, name)[:len(values)] = values
+
+    def __len__(self):
+        return int(self.active.sum())
+
+    def open(self):
+        if self.free_sessions:
+            session = self.free_sessions.pop()
+        else:
+            if self.count == len(self.active):
+                self._grow()
+            session = self.count
+            self.count += 1
+        self.active[session] = True
+        self.offset[session] = 0
+        self.liquid_density[session] = 1.0
+        self.density_dirty[session] = True
+        self.alive[session] = False
+        self.moving[session] = False
+        return session
+
+    def close(self, session):
+        self.active[session] = False
+        self.alive[session] = False
+        self.moving[session] = False
+        self.free_sessions.append(session)
+
+    def set_density(self, session, density):
+        self.liquid_density[session] = density
+        self.density_dirty[session] = True
+        self.retarget(session)
+
+    def add_object(self, session, density, volume):
+        # Returns the new object's slot, or None when the tank is full
+        free = np.flatnonzero(~self.alive[session])
+        if not len(free):
+            return None
+        slot = int(free[0])
+        size = float(np.cbrt(density * volume) * 10)  # Same scale as ObjectScene
+        used = int(self.alive[session].sum())
+        # Spread objects across the tank in the order they were dropped
+        self.x[session, slot] = (used % 8 + 0.5) * self.width / 8 - size / 2
+        self.y[session, slot] = self.wave_center - ObjectScene.drop_height
+        self.size[session, slot] = size
+        self.density[session, slot] = density
+        self.volume[session, slot] = volume
+        self.sent_y[session, slot] = np.nan
+        self.alive[session, slot] = True
+        self.retarget(session)
+        return slot
+
+    def clear(self, session):
+        self.alive[session] = False
+        self.moving[session] = False
+
+    def retarget(self, session):
+        alive = self.alive[session]
+        density = self.density[session]
+        volume = self.volume[session]
+        result = buoyancy.evaluate(density * volume, volume, self.liquid_density[session])
+        self.target_y[session] = np.where(result.floats, self.wave_center + ObjectScene.float_offset,
+                                          self.wave_center + ObjectScene.sink_offset)
+        self.moving[session] = alive & (self.y[session] != self.target_y[session])
+
+    def step(self):
+        # One fixed timestep for every session at once
+        self.tick += 1
+        self.offset[self.active] += 1
+        remaining = self.target_y - self.y
+        np.clip(remaining, -ObjectScene.speed, ObjectScene.speed, out=remaining)
+        remaining *= self.moving
+        self.y += remaining
+        self.moving &= self.y != self.target_y
+
+    def frames(self, sessions):
+        # Encoded frame for each of the given sessions, in the same order; None for a session whose
+        # state cannot be encoded, so that one bad session never costs the others their frame
+        sessions = np.asarray(sessions, dtype=np.int64)
+        changed = self.alive[:self.count] & (self.y[:self.count] != self.sent_y[:self.count])
+        rows, slots = np.nonzero(changed)
+        deltas = np.empty(len(rows), dtype=DELTA_DTYPE)
+        deltas["slot"] = slots
+        deltas["y"] = np.rint(self.y[rows, slots] * Y_SCALE)
+        self.sent_y[rows, slots] = self.y[rows, slots]
+        data = deltas.tobytes()
+        starts = np.searchsorted(rows, sessions, side="left").tolist()
+        stops = np.searchsorted(rows, sessions, side="right").tolist()
+
+        size = DELTA_DTYPE.itemsize
+        frames = []
+        for session, start, stop in zip(sessions.tolist(), starts, stops):
+            try:
+                parts = [FRAME_HEADER.pack(self.tick, int(self.offset[session]),
+                                           FLAG_DENSITY if self.density_dirty[session] else 0)]
+                if self.density_dirty[session]:
+                    density = float(self.liquid_density[session])
+                    parts.append(DENSITY_PART.pack(density, int(LIQUID_COLORS.color(density)[1:], 16)))
+                parts.append(COUNT_PART.pack(stop - start))
+                parts.append(data[start * size:stop * size])
+                frames.append(b"".join(parts))
+            except (ValueError, OverflowError, struct.error):
+                frames.append(None)
+        self.density_dirty[sessions] = False
+        return frames
+
+
+def decode_frame(data):
+    # Inverse of SessionBank.frames, for clients and tests
+    tick, offset, flags = FRAME_HEADER.unpack_from(data)
+    position = FRAME_HEADER.size
+    frame = {"tick": tick, "offset": offset}
+    if flags & FLAG_DENSITY:
+        frame["density"], color = DENSITY_PART.unpack_from(data, position)
+        frame["color"] = f"#{color:06x}"
+        position += DENSITY_PART.size
+    (count,) = COUNT_PART.unpack_from(data, position)
+    position += COUNT_PART.size
+    deltas = np.frombuffer(data, dtype=DELTA_DTYPE, count=count, offset=position)
+    frame["objects"] = {int(slot): y / Y_SCALE for slot, y in zip(deltas["slot"], deltas["y"])}
+    return frame
+
+
+def websocket_frame(payload, opcode=0x2):
+    # Server frames are never masked
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_websocket_message(reader):
+    # Returns (opcode, payload) of the next client frame; fragmented messages are not used by our clients
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        payload = (np.frombuffer(payload, dtype=np.uint8) ^ np.resize(np.frombuffer(mask, dtype=np.uint8),
+                                                                        length)).tobytes()
+    return first & 0x0F, payload
+
+
+class SimulatorServer:
+    # Serves the simulator to browsers on localhost: GET / is a small canvas
+    # client, GET /ws opens a WebSocket session and GET /stats reports tick
+    # timing. One asyncio task ticks every session on the shared fixed timestep.
+    def __init__(self, host="127.0.0.1", port=8765, interval=25, max_steps=4, bank=None):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.max_steps = max_steps
+        self.bank = bank if bank is not None else SessionBank()
+        self.materials = load_catalogue()
+        self.metrics = FrameMetrics()
+        self.clients = {}  # Session -> StreamWriter
+        self.dropped_frames = 0
+        self.server = None
+        self._clock_task = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._clock_task = asyncio.get_running_loop().create_task(self.run_clock())
+        return self
+
+    async def stop(self):
+        self._clock_task.cancel()
+        self.server.close()
+        for writer in list(self.clients.values()):
+            writer.close()
+        await self.server.wait_closed()
+
+    async def run_clock(self):
+        # Fixed timestep with an accumulator, like FrameScheduler, but on the event loop's clock
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        accumulator = 0.0
+        while True:
+            await asyncio.sleep(max(0.0, (self.interval - accumulator) / 1000))
+            now = loop.time()
+            gap_ms = (now - last) * 1000
+            accumulator += gap_ms
+            last = now
+            steps = int((accumulator + 1e-6) // self.interval)
+            accumulator -= steps * self.interval
+            dropped = max(0, steps - self.max_steps)
+            for _ in range(min(steps, self.max_steps)):
+                self.bank.step()
+            started = time.perf_counter()
+            self.broadcast()
+            self.metrics.record_frame((time.perf_counter() - started) * 1000, gap_ms, dropped, len(self.clients))
+
+    def broadcast(self):
+        if not self.clients:
+            return
+        sessions = list(self.clients)
+        for session, frame in zip(sessions, self.bank.frames(sessions)):
+            if frame is None:
+                # Disconnect the one client whose session broke instead of stopping the clock for everyone
+                self.clients[session].close()
+                continue
+            transport = self.clients[session].transport
+            if transport.get_write_buffer_size() > MAX_BUFFERED:
+                # A slow client skips frames rather than queueing them; the next frame still carries every move
+                self.bank.sent_y[session] = np.nan
+                self.bank.density_dirty[session] = True
+                self.dropped_frames += 1
+                continue
+            transport.write(websocket_frame(frame))
+
+    async def handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        request_line = lines[0].split(" ")
+        if len(request_line) < 2:
+            self.respond(writer, "400 Bad Request", "text/plain", b"Bad request")
+            return
+        method, path = request_line[:2]
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if method == "GET" and path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            if "sec-websocket-key" not in headers:
+                self.respond(writer, "400 Bad Request", "text/plain", b"Missing Sec-WebSocket-Key")
+                return
+            await self.serve_session(reader, writer, headers["sec-websocket-key"])
+        elif method == "GET" and path == "/stats":
+            self.respond(writer, "200 OK", "application/json", json.dumps(self.stats()).encode())
+        elif method == "GET" and path == "/":
+            self.respond(writer, "200 OK", "text/html; charset=utf-8", CLIENT_PAGE.encode())
+        else:
+            self.respond(writer, "404 Not Found", "text/plain", b"Not found")
+
+    def respond(self, writer, status, content_type, body):
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        writer.close()
+
+    def stats(self):
+        return {"sessions": len(self.bank), "dropped_client_frames": self.dropped_frames, **self.metrics.summary()}
+
+    async def serve_session(self, reader, writer, key):
+        accept = base64.b64encode(hashlib.sha1(key.encode() + WS_GUID).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        session = self.bank.open()
+        hello = {"type": "hello", "width": self.bank.width, "height": self.bank.height,
+                 "wave_center": self.bank.wave_center, "amplitude": 4, "period": 50, "interval": self.interval,
+                 "y_scale": Y_SCALE, "materials": [name for name in self.materials.names if name != "Custom"]}
+        writer.write(websocket_frame(json.dumps(hello).encode(), opcode=0x1))
+        self.clients[session] = writer
+        try:
+            while True:
+                opcode, payload = await read_websocket_message(reader)
+                if opcode == 0x8:  # Close
+                    writer.write(websocket_frame(payload[:2], opcode=0x8))
+                    break
+                if opcode == 0x9:  # Ping
+                    writer.write(websocket_frame(payload, opcode=0xA))
+                elif opcode == 0x1:
+                    self.handle_input(session, writer, json.loads(payload))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            del self.clients[session]
+            self.bank.close(session)
+            writer.close()
+
+    def handle_input(self, session, writer, message):
+        # The same inputs as the desktop controls: density slider, drop an object, reset.
+        # Anything malformed is ignored, as the desktop slider and picker would never send it.
+        if not isinstance(message, dict):
+            return
+        kind = message.get("type")
+        if kind == "density":
+            try:
+                density = float(message["value"])
+            except (KeyError, TypeError, ValueError):
+                return
+            if not math.isfinite(density):  # json accepts NaN and Infinity
+                return
+            self.bank.set_density(session, min(max(density, 0.5), 2.0))
+        elif kind == "add":
+            name = message.get("material")
+            if not isinstance(name, str) or name not in self.materials:
+                return
+            density = self.materials.density(name)
+            slot = self.bank.add_object(session, density, 5.0)
+            if slot is not None:
+                added = {"type": "object", "slot": slot, "x": float(self.bank.x[session, slot]),
+                         "size": float(self.bank.size[session, slot]),
+                         "color": utils.rgb_to_hex(utils.parse_color(self.materials.color(name)))}
+                writer.write(websocket_frame(json.dumps(added).encode(), opcode=0x1))
+        elif kind == "reset":
+            self.bank.clear(session)
+            self.bank.set_density(session, 1.0)
+            writer.write(websocket_frame(json.dumps({"type": "clear"}).encode(), opcode=0x1))
+
+
+CLIENT_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Density Simulator</title></head>
+<body style="font-family: Helvetica, sans-serif">
+<h2>Density Simulator</h2>
+<label>Liquid density <input id="density" type="range" min="0.5" max="2" step="0.01" value="1"></label>
+<select id="material"></select> <button id="add">Drop</button> <button id="reset">Reset</button>
+<br><canvas id="tank" style="border: 1px solid #ccc"></canvas>
+<script>
+const canvas = document.getElementById("tank"), ctx = canvas.getContext("2d");
+const socket = new WebSocket(`ws://${location.host}/ws`);
+socket.binaryType = "arraybuffer";
+let config = null, offset = 0, color = "#5cb5e1";
+const objects = new Map();
+const send = (message) => socket.send(JSON.stringify(message));
+document.getElementById("density").oninput = (e) => send({type: "density", value: +e.target.value});
+document.getElementById("add").onclick = () => send({type: "add", material: document.getElementById("material").value});
+document.getElementById("reset").onclick = () => { document.getElementById("density").value = 1; send({type: "reset"}); };
+socket.onmessage = (event) => {
+  if (typeof event.data === "string") {
+    const message = JSON.parse(event.data);
+    if (message.type === "hello") {
+      config = message;
+      canvas.width = config.width; canvas.height = config.height;
+      const select = document.getElementById("material");
+      for (const name of config.materials) select.add(new Option(name, name));
+    } else if (message.type === "object") {
+      objects.set(message.slot, {x: message.x, y: 0, size: message.size, color: message.color});
+    } else if (message.type === "clear") {
+      objects.clear();
+    }
+    return;
+  }
+  const view = new DataView(event.data);
+  offset = view.getUint32(4, true);
+  let position = 9;
+  if (view.getUint8(8) & 1) {
+    color = "#" + view.getUint32(position + 4, true).toString(16).padStart(6, "0");
+    position += 8;
+  }
+  const count = view.getUint16(position, true);
+  position += 2;
+  for (let i = 0; i < count; i++, position += 4) {
+    const object = objects.get(view.getUint16(position, true));
+    if (object) object.y = view.getInt16(position + 2, true) / config.y_scale;
+  }
+  draw();
+};
+function draw() {
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  ctx.fillStyle = color;
+  ctx.beginPath();
+  ctx.moveTo(0, config.height);
+  for (let x = 0; x <= config.width; x += 16) {
+    ctx.lineTo(x, config.wave_center + config.amplitude * Math.sin((x + offset) / config.period));
+  }
+  ctx.lineTo(config.width, config.height);
+  ctx.fill();
+  for (const object of objects.values()) {
+    ctx.fillStyle = object.color;
+    ctx.fillRect(object.x, object.y, object.size, object.size);
+  }
+}
+</script>
+</body></html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the density simulator to browsers on this machine.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    async def serve():
+        server = await SimulatorServer(args.host, args.port).start()
+        print(f"Serving on http://{server.host}:{server.port}/", flush=True)
+        await server.server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
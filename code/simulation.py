@@ -1,108 +1,154 @@
-import tkinter as tk
-import math
-import time
+from wave_geometry import DEFAULT_TOLERANCE, WaveGeometry, lod_step
+from ripples import RippleSurface
+from scheduler import FrameScheduler
+from palette import LIQUID_COLORS, ColorTransition
+import utils
 
 class LiquidAnimation:
-    def __init__(self, canvas, width, height, density=17):
-        self.canvas = canvas
-        self.width = 1400
+    def __init__(self, canvas, width, height, density=17, scheduler=None, step=None, tolerance=DEFAULT_TOLERANCE):
+        # Every animation on this canvas shares one tick, and one batch of canvas changes per tick
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler(canvas)
+        self.canvas = self.scheduler.render_layer(canvas)
+        self.width = width
         self.height = height
         self.wave_center = height - 200 # Adjust this value to change the position of the water lines
         self.amplitude = 4
         self.period = 50
         self.offset = 0
         self.density = density # Liquid density
+        # Colour state lives in Python, so Tk is never asked for the current fill
+        self.color_transition = ColorTransition(LIQUID_COLORS.rgb(density))
         self.water_polygon = None
+        self.ripples = None  # RippleSurface when the surface is simulated instead of a fixed sine
+        # Column spacing: fixed if given, otherwise as wide as the error tolerance allows
+        self.sample_step = step
+        self.tolerance = tolerance
+        # Precomputed sine tables; each frame only phase-shifts them into a reused buffer
+        self.wave = self.build_geometry()
         self.create_water()
 
+    def build_geometry(self):
+        step = self.sample_step if self.sample_step is not None else lod_step(self.amplitude, self.period, self.tolerance)
+        if self.ripples is not None:
+            step = min(step, self.ripples.column_step)  # Fine enough to show a splash
+        return WaveGeometry(self.width, self.height, self.wave_center, self.amplitude, self.period, step)
+
+    def resize(self, width, height):
+        # Follow the canvas size; the polygon is rebuilt for the new width at the same level of detail
+        if (width, height) == (self.width, self.height):
+            return
+        self.width = width
+        self.height = height
+        self.wave_center = height - 200
+        if self.ripples is not None:
+            self.ripples = RippleSurface(width)
+        self.wave = self.build_geometry()
+        self.render()
+
     def create_water(self):
-        water_coords = [(0, self.height)]
-        for x in range(0, self.width + 1, 17):  # Ensure it covers the full width
-            y = self.wave_center + self.amplitude * math.sin((x + self.offset) / self.period)
-        water_coords.append((x, y))
-        water_coords.append((self.width, self.height))
-        water_coords_flat = [coord for point in water_coords for coord in point]  # Flatten the list
-        self.water_polygon = self.canvas.create_polygon(tuple(water_coords_flat), fill=self.get_color(), outline="")
+        water_coords = self.wave.update(self.offset)
+        self.water_polygon = self.canvas.create_polygon(water_coords.tolist(), fill=self.color_transition.color, outline="")
 
     def animate(self):
-        self.offset += 1
-        water_coords = [(0, self.height)]
-        for x in range(0, self.width + 1, 17):  # Ensure it covers the full width
-            y = self.wave_center + self.amplitude * math.sin((x + self.offset) / self.period)
-            water_coords.append((x, y))
-        water_coords.append((self.width, self.height))
-        water_coords_flat = [coord for point in water_coords for coord in point]  # Flatten the list
-        self.canvas.coords(self.water_polygon, tuple(water_coords_flat))
+        self.scheduler.add("liquid", self)
 
-        # Update color based on density
-        new_color = self.get_color()
-        self.transition_color(new_color)
+    def set_ripples(self, enabled):
+        # Switch between the analytic sine and a wave-equation surface that objects splash into
+        self.ripples = RippleSurface(self.width) if enabled else None
+        self.wave = self.build_geometry()
 
-        self.canvas.after(25, self.animate)
+    def step(self):
+        self.offset += 1
+        if self.ripples is not None:
+            self.ripples.step(self.scheduler.interval / 1000)
+        return True  # The surface never stops moving
+
+    def render(self):
+        if self.ripples is not None:
+            # The grid is only downsampled to the polygon's columns here, once per frame
+            water_coords = self.wave.set_heights(self.ripples.sample(self.wave.columns))
+        else:
+            water_coords = self.wave.update(self.offset)
+        self.canvas.coords(self.water_polygon, water_coords.tolist())
+
+        # Ease the color towards the target set by the density
+        self.transition_color()
 
     def set_density(self, density):
         self.density = density
+        self.color_transition.set_target(LIQUID_COLORS.rgb(density))
 
     def get_color(self):
-        # Determine the color based on density
-        if self.density < 1.0:
-            return "#5cb5e1"  # Blue (Water)
-        elif self.density < 1.1:
-            return "#b39eb5"  # Purple (Combination of Water and Oil)
-        elif self.density < 1.3:
-            return "#FFEE8C"  # Yellow (Oil)
-        elif self.density < 1.6:
-            return "#FFD1DC"  # Pink (Soap)
-        else:
-            return "#BC9337"  # Dark Orange (Honey)
+        # Determine the color based on density, blended between the water, oil, soap and honey anchors
+        return LIQUID_COLORS.color(self.density)
 
-    def transition_color(self, new_color):
-        # Smoothly transition the color
-        current_color = self.canvas.itemcget(self.water_polygon, "fill")
-        current_rgb = self.hex_to_rgb(current_color)
-        new_rgb = self.hex_to_rgb(new_color)
-        step = 0.05
-
-        # Interpolate between the current color and the new color
-        interpolated_rgb = [
-            int(current_rgb[i] + (new_rgb[i] - current_rgb[i]) * step)
-            for i in range(3)
-        ]
-
-        interpolated_color = self.rgb_to_hex(interpolated_rgb)
-
-        # Update the color of the polygon
-        self.canvas.itemconfig(self.water_polygon, fill=interpolated_color)
+    def transition_color(self, new_color=None):
+        # Smoothly transition the color, only calling Tk while it is still changing
+        if new_color is not None:
+            self.color_transition.set_target(self.hex_to_rgb(new_color))
+        interpolated_color = self.color_transition.advance()
+        if interpolated_color is not None:
+            self.canvas.itemconfig(self.water_polygon, fill=interpolated_color)
 
     def hex_to_rgb(self, hex_color):
-        return [int(hex_color[i:i + 2], 16) for i in range(1, 7, 2)]
+        return utils.hex_to_rgb(hex_color)
 
     def rgb_to_hex(self, rgb_color):
-        return f'#{rgb_color[0]:02x}{rgb_color[1]:02x}{rgb_color[2]:02x}'
+        return utils.rgb_to_hex(rgb_color)
 
 class ObjectAnimation:
-    def __init__(self, canvas, cube_id, liquid_animation):
-        self.canvas = canvas
+    def __init__(self, canvas, cube_id, liquid_animation, scheduler=None, key=None):
         self.cube_id = cube_id
         self.liquid_animation = liquid_animation
+        self.scheduler = scheduler if scheduler is not None else liquid_animation.scheduler
+        self.canvas = self.scheduler.render_layer(canvas)
+        # Registering under the same key replaces the previous animation, so a recreated cube cancels the old motion
+        self.key = key if key is not None else ("object", cube_id)
+        self.x = None
+        self.y = None
+        self.size = None
+        self.target_y = None
+        self.direction = 0
+        self.pending_dy = 0
 
     def move_up(self, target_y):
-        x1, y1, x2, y2 = self.canvas.coords(self.cube_id)
-        if y1 > target_y:
-            self.canvas.move(self.cube_id, 0, -2)
-            self.canvas.after(25, self.move_up, target_y)  # Move every 25 milliseconds
-        else:
-            # Object has reached the target position
-            pass
+        self.start(target_y, -1)
 
     def move_down(self, target_y):
+        self.start(target_y, 1)
+
+    def start(self, target_y, direction):
         x1, y1, x2, y2 = self.canvas.coords(self.cube_id)
-        if y1 < target_y:
-            self.canvas.move(self.cube_id, 0, 2)
-            self.canvas.after(25, self.move_down, target_y)  # Move every 25 milliseconds
-        else:
-            # Object has reached the target position
-            pass
+        self.x = x1
+        self.y = y1
+        self.size = y2 - y1
+        self.target_y = target_y
+        self.direction = direction
+        self.scheduler.add(self.key, self)
+
+    def step(self):
+        if (self.direction < 0 and self.y > self.target_y) or (self.direction > 0 and self.y < self.target_y):
+            self.y += 2 * self.direction
+            self.pending_dy += 2 * self.direction
+            self.splash(2 * self.direction)
+            return True
+        # Object has reached the target position
+        return False
+
+    def splash(self, dy):
+        # Disturb a simulated surface when the cube's bottom edge crosses it
+        ripples = self.liquid_animation.ripples
+        if ripples is None:
+            return
+        surface_y = self.liquid_animation.wave_center
+        bottom = self.y + self.size
+        if (bottom - dy < surface_y) != (bottom < surface_y):
+            ripples.splash_at(self.x, self.size, dy * 1000 / self.scheduler.interval)
+
+    def render(self):
+        if self.pending_dy:
+            self.canvas.move(self.cube_id, 0, self.pending_dy)
+            self.pending_dy = 0
 
     def sink_cube(self):
         wave_center = self.liquid_animation.wave_center
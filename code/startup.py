@@ -0,0 +1,83 @@
+import array
+import json
+import os
+import struct
+import time
+
+# Only the standard library is imported here: this module runs before numpy
+# and the simulation modules are loaded, so that the window can show the
+# liquid straight away and everything else is built after that first paint.
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+FRAME_CACHE_PATH = os.path.join(CODE_DIR, "__pycache__", "first_frame.bin")
+
+# Cache layout: header, the key it was built for, the fill colour, then float64 polygon coords
+FRAME_MAGIC = b"DSFF"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("<4sIII")  # magic, version, key length, coordinate count
+
+# The first frame is computed by these modules; editing any of them invalidates the cache
+FRAME_SOURCES = ("simulation.py", "wave_geometry.py", "palette.py")
+
+# Points in a launch recorded by StartupTimes, in the order they happen
+MILESTONES = ("imported", "first_paint", "first_frame", "ready")
+
+
+def frame_key(width, height, density):
+    stats = [os.stat(os.path.join(CODE_DIR, name)) for name in FRAME_SOURCES]
+    parts = [f"{width}x{height}", repr(float(density))] + [f"{stat.st_mtime_ns}:{stat.st_size}" for stat in stats]
+    return ";".join(parts).encode("utf-8")
+
+
+def read_first_frame(width, height, density, path=FRAME_CACHE_PATH):
+    # (polygon coords, fill) of the liquid's first frame, or None when the cache is missing or stale
+    try:
+        with open(path, "rb") as cache_file:
+            data = cache_file.read()
+        key = frame_key(width, height, density)
+    except OSError:
+        return None
+    if len(data) < FRAME_HEADER.size:
+        return None
+    magic, version, key_length, count = FRAME_HEADER.unpack_from(data)
+    start = FRAME_HEADER.size
+    if (magic, version) != (FRAME_MAGIC, FRAME_VERSION) or data[start:start + key_length] != key:
+        return None
+    start += key_length
+    if len(data) != start + 7 + 8 * count:
+        return None  # Cut short by an interrupted write
+    fill = data[start:start + 7].decode("ascii")  # "#rrggbb"
+    coords = array.array("d")
+    coords.frombytes(data[start + 7:])
+    return coords.tolist(), fill
+
+
+def write_first_frame(width, height, density, coords, fill, path=FRAME_CACHE_PATH):
+    key = frame_key(width, height, density)
+    coords = array.array("d", coords)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as cache_file:
+        cache_file.write(FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, len(key), len(coords)))
+        cache_file.write(key)
+        cache_file.write(fill.encode("ascii"))
+        cache_file.write(coords.tobytes())
+    os.replace(temporary_path, path)
+
+
+class StartupTimes:
+    # Wall-clock time of each milestone of a launch. The startup benchmark
+    # compares them with the moment it spawned the process.
+    def __init__(self, on_complete=None):
+        self.times = {}
+        self.on_complete = on_complete
+
+    def mark(self, name):
+        if name in self.times:
+            return
+        self.times[name] = time.time()
+        if self.on_complete is not None and all(milestone in self.times for milestone in MILESTONES):
+            self.on_complete()
+
+    def dump(self):
+        print(json.dumps(self.times), flush=True)
@@ -0,0 +1,216 @@
+import argparse
+import json
+import math
+import struct
+import sys
+import time
+
+import numpy as np
+
+import buoyancy
+from materials import load_catalogue
+import utils
+
+# Columns of every output row. The material is an index into the material list
+# stored with the table (and written out by name in CSV).
+COLUMNS = [
+    ("material", "<u2"),
+    ("liquid_density", "<f4"),
+    ("volume", "<f4"),
+    ("mass", "<f4"),
+    ("object_density", "<f4"),
+    ("floats", "u1"),
+    ("net_force", "<f4"),
+    ("submerged_fraction", "<f4"),
+]
+
+# Columnar file: magic, version, metadata length, JSON metadata, then row groups
+# of (row count, each column's values back to back), ending with a zero count
+TABLE_MAGIC = b"DSSW"
+TABLE_VERSION = 1
+TABLE_HEADER = struct.Struct("<4sII")
+ROW_GROUP = struct.Struct("<I")
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def parse_values(text):
+    # "0.5:2.0:0.01" is an inclusive range, "1,5,10" a list, "5" a single value.
+    # A range never goes past stop, even when the step does not divide it evenly.
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        if step <= 0:
+            raise ValueError(f"step must be positive in {text!r}")
+        count = max(0, math.floor((stop - start) / step + 1e-9) + 1)
+        return np.round(start + step * np.arange(count), 10)
+    return np.array([float(part) for part in text.split(",")])
+
+
+class SweepGrid:
+    # Every combination of material, volume and liquid density, plus mass for
+    # the Custom material, whose density follows from mass and volume.
+    #
+    # Measurements are checked with the same rules as CanvasFrame.update_object:
+    # presets only have their volume checked, Custom objects their mass too.
+    # The rules apply to each axis on its own, so invalid values are dropped
+    # from the axes up front and every generated row is valid.
+    def __init__(self, catalogue, materials, liquid_densities, volumes, masses):
+        self.material_names = list(materials)
+        self.liquid_densities = np.asarray(liquid_densities, dtype=np.float64)
+        all_volumes = np.asarray(volumes, dtype=np.float64)
+        all_masses = np.asarray(masses, dtype=np.float64)
+        self.volumes = all_volumes[utils.valid_volume(all_volumes)]
+        self.masses = all_masses[utils.valid_mass(all_masses)]
+
+        # One block per material: (material index, preset density or None for Custom)
+        self.blocks = []
+        for index, name in enumerate(self.material_names):
+            if name not in catalogue:
+                raise ValueError(f"Unknown material {name!r}")
+            self.blocks.append((index, None if name == "Custom" else catalogue.density(name)))
+
+        self.rejected = 0
+        for _, density in self.blocks:
+            full = len(all_volumes) * len(self.liquid_densities) * (len(all_masses) if density is None else 1)
+            self.rejected += full - self.block_size(density)
+
+    def block_size(self, density):
+        size = len(self.volumes) * len(self.liquid_densities)
+        return size * len(self.masses) if density is None else size
+
+    def __len__(self):
+        return sum(self.block_size(density) for _, density in self.blocks)
+
+    def chunks(self, chunk_rows=DEFAULT_CHUNK_ROWS):
+        # Yields dicts of column arrays of at most chunk_rows rows, in grid order
+        for index, density in self.blocks:
+            if density is None:
+                shape = (len(self.masses), len(self.volumes), len(self.liquid_densities))
+            else:
+                shape = (len(self.volumes), len(self.liquid_densities))
+            size = self.block_size(density)
+            for start in range(0, size, chunk_rows):
+                flat = np.arange(start, min(start + chunk_rows, size))
+                *outer, liquid_index = np.unravel_index(flat, shape)
+                volume = self.volumes[outer[-1]]
+                mass = self.masses[outer[0]] if density is None else density * volume
+                yield evaluate_chunk(index, mass, volume, self.liquid_densities[liquid_index])
+
+
+def evaluate_chunk(material, mass, volume, liquid_density):
+    result = buoyancy.evaluate(mass, volume, liquid_density)
+    return {
+        "material": np.full(len(mass), material, dtype=np.uint16),
+        "liquid_density": liquid_density,
+        "volume": volume,
+        "mass": mass,
+        "object_density": mass / volume,
+        "floats": result.floats,
+        "net_force": result.net_force,
+        "submerged_fraction": result.submerged_fraction,
+    }
+
+
+class TableWriter:
+    # Compact columnar output: each chunk becomes one row group, so memory stays
+    # bounded by the chunk size however large the grid is
+    def __init__(self, path, material_names):
+        self.file = open(path, "wb")
+        metadata = json.dumps({"columns": COLUMNS, "materials": material_names}).encode()
+        self.file.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, len(metadata)) + metadata)
+
+    def write(self, chunk):
+        self.file.write(ROW_GROUP.pack(len(chunk["material"])))
+        for name, dtype in COLUMNS:
+            self.file.write(np.ascontiguousarray(chunk[name], dtype=dtype).tobytes())
+
+    def close(self):
+        self.file.write(ROW_GROUP.pack(0))
+        self.file.close()
+
+
+class CsvWriter:
+    def __init__(self, path, material_names):
+        self.file = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+        self.material_names = material_names
+        self.file.write(",".join(name for name, _ in COLUMNS) + "\n")
+
+    def write(self, chunk):
+        names = np.array(self.material_names, dtype=object)[chunk["material"]]
+        row = "%s,%.6g,%.6g,%.6g,%.6g,%d,%.6g,%.6g\n"
+        self.file.writelines(map(row.__mod__, zip(
+            names.tolist(), *(chunk[name].tolist() for name, _ in COLUMNS[1:]))))
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def read_row_groups(path):
+    # Yields (material names, dict of column arrays) per row group of a columnar sweep file
+    with open(path, "rb") as table_file:
+        magic, version, length = TABLE_HEADER.unpack(table_file.read(TABLE_HEADER.size))
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not a sweep table")
+        metadata = json.loads(table_file.read(length))
+        while True:
+            (rows,) = ROW_GROUP.unpack(table_file.read(ROW_GROUP.size))
+            if not rows:
+                return
+            group = {}
+            for name, dtype in metadata["columns"]:
+                dtype = np.dtype(dtype)
+                group[name] = np.frombuffer(table_file.read(rows * dtype.itemsize), dtype=dtype)
+            yield metadata["materials"], group
+
+
+def read_table(path):
+    # Whole table in memory; use read_row_groups for large files
+    groups = list(read_row_groups(path))
+    if not groups:
+        return [], {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+    return groups[0][0], {name: np.concatenate([group[name] for _, group in groups]) for name, _ in COLUMNS}
+
+
+def run_sweep(grid, output, format="table", chunk_rows=DEFAULT_CHUNK_ROWS):
+    writer = (CsvWriter if format == "csv" else TableWriter)(output, grid.material_names)
+    rows = 0
+    try:
+        for chunk in grid.chunks(chunk_rows):
+            writer.write(chunk)
+            rows += len(chunk["material"])
+    finally:
+        writer.close()
+    return rows
+
+
+def main():
+    catalogue = load_catalogue()
+    presets = [name for name in catalogue.names if name != "Custom"]
+    parser = argparse.ArgumentParser(description="Evaluate float/sink over a grid of materials, volumes and "
+                                                 "liquid densities.")
+    parser.add_argument("output", help="output file ('-' writes CSV to stdout)")
+    parser.add_argument("--materials", default=",".join(presets),
+                        help="comma-separated material names; include Custom to sweep masses as well")
+    parser.add_argument("--densities", default="0.5:2.0:0.01", help="liquid densities, start:stop:step or a list")
+    parser.add_argument("--volumes", default="1:15:1", help="object volumes, start:stop:step or a list")
+    parser.add_argument("--masses", default="20:100:1", help="masses for the Custom material")
+    parser.add_argument("--format", choices=("table", "csv"), default=None,
+                        help="columnar binary table or CSV (default: from the file extension)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.output == "-" or args.output.endswith(".csv") else "table")
+    try:
+        densities, volumes, masses = (parse_values(text) for text in (args.densities, args.volumes, args.masses))
+    except ValueError as error:
+        parser.error(str(error))
+    grid = SweepGrid(catalogue, args.materials.split(","), densities, volumes, masses)
+    started = time.perf_counter()
+    rows = run_sweep(grid, args.output, format, args.chunk_rows)
+    print(f"{rows} rows in {time.perf_counter() - started:.2f} s"
+          f" ({grid.rejected} combinations outside the mass/volume limits skipped)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The simulator modules import each other as top-level modules (they are run
+# from inside code/), so make that directory importable for the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
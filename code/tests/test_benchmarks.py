@@ -0,0 +1,16 @@
+from benchmarks import suite
+
+
+def test_tk_calls_per_frame_do_not_regress():
+    # Latency is too noisy for CI, but the number of Tk calls per frame is deterministic
+    baselines = suite.load_baselines()
+    results = {name: {"tk_calls_per_frame": suite.measure(suite.CASES[name])["tk_calls_per_frame"]}
+               for name in suite.CASES}
+    assert suite.compare(results, baselines) == []
+
+
+def test_compare_flags_regressions():
+    baselines = {"case": {"p50_us": 100.0, "tk_calls_per_frame": 2.0}}
+    assert suite.compare({"case": {"p50_us": 140.0, "tk_calls_per_frame": 2.0}}, baselines, threshold=0.5) == []
+    assert len(suite.compare({"case": {"p50_us": 160.0, "tk_calls_per_frame": 2.0}}, baselines, threshold=0.5)) == 1
+    assert len(suite.compare({"case": {"p50_us": 100.0, "tk_calls_per_frame": 2.5}}, baselines)) == 1
@@ -0,0 +1,46 @@
+import numpy as np
+
+import buoyancy
+
+
+def test_single_object_floats_when_lighter_than_liquid():
+    result = buoyancy.evaluate(4.0, 5.0, 1.0)
+    assert bool(result.floats)
+    assert np.isclose(result.submerged_fraction, 0.8)
+    assert np.isclose(result.net_force, 1.0 * 9.81)
+
+
+def test_single_object_sinks_when_denser_than_liquid():
+    result = buoyancy.evaluate(12.0, 5.0, 2.0)
+    assert not bool(result.floats)
+    assert result.submerged_fraction == 1.0
+    assert result.net_force < 0
+
+
+def test_neutral_buoyancy_counts_as_floating():
+    assert bool(buoyancy.evaluate(5.0, 5.0, 1.0).floats)
+
+
+def test_batch_broadcasts_objects_against_liquids():
+    masses = np.array([1.0, 2.0, 3.0])
+    volumes = np.full(3, 2.0)
+    liquids = np.array([0.5, 1.0, 2.0])[:, None]
+
+    result = buoyancy.evaluate(masses, volumes, liquids)
+
+    assert result.floats.shape == (3, 3)
+    assert result.floats.tolist() == [
+        [True, False, False],
+        [True, True, False],
+        [True, True, True],
+    ]
+    assert np.all(result.submerged_fraction <= 1.0)
+
+
+def test_critical_index_returns_only_flipped_objects():
+    index = buoyancy.CriticalDensityIndex([0.8, 2.7, 0.92, 1.2, 1.5], ids=[10, 11, 12, 13, 14])
+
+    assert sorted(index.flipped(1.0, 1.6).tolist()) == [13, 14]
+    assert sorted(index.flipped(1.6, 1.0).tolist()) == [13, 14]
+    assert index.flipped(1.0, 1.1).tolist() == []
+    assert sorted(index.floating(1.0).tolist()) == [10, 12]
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from benchmarks.fake_canvas import RecordingCanvas
+from executor import BackgroundExecutor
+from scheduler import FrameScheduler
+import uncertainty
+
+
+def make_executor():
+    canvas = RecordingCanvas()
+    return canvas, BackgroundExecutor(FrameScheduler(canvas, clock=time.perf_counter))
+
+
+def run_until(canvas, condition, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+        canvas.run_timers()
+
+
+def test_results_are_delivered_on_a_tick():
+    canvas, executor = make_executor()
+    results = []
+    try:
+        executor.submit("sum", sum, [1, 2, 3], on_result=results.append)
+        # Nothing is delivered outside the frame loop, even once the job has finished
+        executor.jobs["sum"].future.result()
+        assert results == []
+        run_until(canvas, lambda: results)
+    finally:
+        executor.shutdown()
+    assert results == [6]
+    assert not executor.pending("sum")
+
+
+def test_a_new_submission_supersedes_the_old_one():
+    canvas, executor = make_executor()
+    release = threading.Event()
+    results = []
+
+    def slow(value, cancel_event):
+        release.wait(5)
+        return value, cancel_event.is_set()
+
+    try:
+        first = executor.submit("job", slow, "old", on_result=results.append, cancellable=True)
+        executor.submit("job", slow, "new", on_result=results.append, cancellable=True)
+        assert first.cancelled
+        release.set()
+        run_until(canvas, lambda: results)
+        run_until(canvas, lambda: "executor" not in executor.scheduler.animations, timeout=2)
+    finally:
+        executor.shutdown()
+    assert results == [("new", False)]
+
+
+def test_errors_go_to_on_error():
+    canvas, executor = make_executor()
+    errors = []
+    try:
+        executor.submit("bad", int, "not a number", on_error=errors.append)
+        run_until(canvas, lambda: errors)
+    finally:
+        executor.shutdown()
+    assert isinstance(errors[0], ValueError)
+
+
+def test_sweep_runs_on_the_process_pool():
+    canvas, executor = make_executor()
+    executor.processes = 1
+    results = []
+    try:
+        executor.submit("float_chance", uncertainty.sweep, 49.0, 50.0, 1.0, samples=20_000, chunk_size=5_000,
+                        seed=3, pool=executor.process_pool, cancellable=True, on_result=results.append)
+        run_until(canvas, lambda: results)
+    finally:
+        executor.shutdown()
+    assert 0.5 < results[0].float_probability < 1.0
+
+
+class FakeLabel:
+    def __init__(self):
+        self.text = ""
+
+    def config(self, text):
+        self.text = text
+
+
+def test_a_failed_float_chance_sweep_is_shown(monkeypatch):
+    from main import CanvasFrame
+
+    def broken_sweep(*args, **kwargs):
+        raise RuntimeError("process pool is broken")
+    monkeypatch.setattr(uncertainty, "sweep", broken_sweep)
+
+    canvas, executor = make_executor()
+    frame = type("Frame", (), {})()  # Only what request_float_chance touches, without a Tk window
+    frame.measurement = (49.0, 50.0)
+    frame.executor = executor
+    frame.float_chance_value = FakeLabel()
+    frame.show_float_chance = lambda result: CanvasFrame.show_float_chance(frame, result)
+    frame.show_float_chance_error = lambda error: CanvasFrame.show_float_chance_error(frame, error)
+    try:
+        CanvasFrame.request_float_chance(frame, 1.0)
+        assert frame.float_chance_value.text == "Float chance: ..."
+        run_until(canvas, lambda: not executor.pending("float_chance"))
+    finally:
+        executor.shutdown()
+    assert frame.float_chance_value.text == "Float chance: unavailable"
@@ -0,0 +1,87 @@
+import json
+
+import numpy as np
+
+from benchmarks.fake_canvas import RecordingCanvas
+from instrumentation import FrameMetrics, PerformanceHUD, RingBuffer, count_timers
+from scheduler import FrameScheduler
+
+
+class SteppingClock:
+    # Every reading is 1 ms after the previous one, so each timed section is measurable
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.001
+        return self.now
+
+
+class Idle:
+    def step(self):
+        return True
+
+    def render(self):
+        pass
+
+
+def test_ring_buffer_keeps_the_newest_samples_in_order():
+    buffer = RingBuffer(4)
+    for value in range(6):
+        buffer.append(value)
+    assert buffer.recent().tolist() == [2, 3, 4, 5]
+    assert buffer.count == 6
+
+
+def test_summary_percentiles_and_fps():
+    metrics = FrameMetrics(capacity=100)
+    for i in range(100):
+        metrics.record_frame(frame_ms=i + 1, gap_ms=25.0, dropped=1 if i == 50 else 0, timers=2)
+    summary = metrics.summary()
+    assert summary["frames"] == 100
+    assert summary["fps"] == 40.0
+    assert np.isclose(summary["frame_ms_p95"], np.percentile(np.arange(1, 101), 95), atol=1e-3)
+    assert summary["dropped_frames"] == 1
+    assert summary["live_timers"] == 2
+
+
+def test_scheduler_records_frames_and_groups_only_when_enabled():
+    canvas = RecordingCanvas()
+    metrics = FrameMetrics()
+    scheduler = FrameScheduler(canvas, clock=SteppingClock(), interval=1, metrics=metrics)
+    scheduler.add("idle", Idle())
+    for _ in range(5):
+        canvas.run_timers()
+
+    assert metrics.frames == 5
+    assert set(metrics.groups) == {"idle.step", "idle.render"}
+    # The rescheduled tick is the one live timer
+    assert metrics.timers.recent()[-1] == 1
+    assert count_timers(canvas) == 1
+
+    plain = FrameScheduler(RecordingCanvas(), clock=SteppingClock(), interval=1)
+    plain.add("idle", Idle())
+    plain.widget.run_timers()
+    assert plain.metrics is None
+
+
+def test_hud_shows_fps_and_dump_writes_json(tmp_path):
+    canvas = RecordingCanvas()
+    metrics = FrameMetrics()
+    scheduler = FrameScheduler(canvas, clock=SteppingClock(), interval=1, metrics=metrics)
+    hud = PerformanceHUD(canvas, metrics, scheduler, every=2)
+    hud.show()
+    for _ in range(4):
+        canvas.run_timers()
+    assert "fps" in canvas.itemcget(hud.text, "text")
+
+    path = tmp_path / "metrics.json"
+    metrics.dump(path)
+    data = json.loads(path.read_text())
+    assert data["summary"]["frames"] == 4
+    assert len(data["frame_ms"]) == 4
+    assert "hud.render" in data["groups_ms"]
+
+    hud.hide()
+    assert canvas.itemcget(hud.text, "text") == ""
+    assert "hud" not in scheduler.animations
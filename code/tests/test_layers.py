@@ -0,0 +1,60 @@
+import numpy as np
+
+import buoyancy
+from benchmarks.fake_canvas import RecordingCanvas
+from benchmarks.suite import FrameClock
+from layers import DEFAULT_LAYERS, LayeredLiquid, LiquidLayer
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation
+
+
+def test_layers_are_stacked_lightest_first():
+    canvas = RecordingCanvas()
+    layers = LayeredLiquid(canvas, 800, 600, list(reversed(DEFAULT_LAYERS)))
+    assert [layer.name for layer in layers.layers] == ["Water", "Oil", "Soap", "Honey"]
+    assert layers.tops.tolist() == [360, 420, 480, 540]
+
+
+def test_interface_lookup_bisects_layer_densities():
+    layers = LayeredLiquid(RecordingCanvas(), 800, 600)
+    assert layers.interface_y(np.array([0.8, 1.1, 1.5, 2.7])).tolist() == [360, 420, 540, 600]
+
+
+def test_render_updates_every_surface_in_one_pass():
+    canvas = RecordingCanvas()
+    clock = FrameClock()
+    layers = LayeredLiquid(canvas, 800, 600, scheduler=FrameScheduler(canvas, clock=clock))
+    layers.animate()
+    canvas.reset_calls()
+    clock.advance()
+    canvas.run_timers()
+    # Every surface moved, and all of them reach the canvas in one batch
+    assert canvas.calls == {"batch": 1}
+    surface = canvas.items[layers.polygons[1]]["coords"][3::2][:-1]
+    assert all(abs(y - 420) <= 2 for y in surface)
+
+
+def test_rest_positions_straddle_the_interface():
+    tops, densities = [360.0, 420.0], [1.0, 2.0]
+    y = buoyancy.rest_positions([0.5, 1.5, 3.0], [20.0, 20.0, 20.0], tops, densities, 600)
+    # Half of the 0.5 cube is under water, half of the 1.5 cube is below the water/second layer interface
+    assert y.tolist() == [350.0, 410.0, 580.0]
+
+
+def test_scene_objects_settle_between_layers():
+    canvas = RecordingCanvas()
+    scheduler = FrameScheduler(canvas)
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=scheduler)
+    scene = ObjectScene(canvas, liquid, 800)
+    layers = LayeredLiquid(canvas, 800, 600, [LiquidLayer("Light", 1.0, 100, "blue"),
+                                              LiquidLayer("Heavy", 2.0, 100, "brown")], scheduler=scheduler)
+    scene.set_layers(layers)
+    slot = scene.add(1.5, 5, "white", x=400)
+
+    for _ in range(1000):
+        if not scene.step():
+            break
+
+    size = scene.size[slot]
+    assert scene.y[slot] == 500 - size / 2
@@ -0,0 +1,47 @@
+import json
+import os
+
+import materials
+from materials import MaterialCatalogue
+
+
+def make_catalogue():
+    return MaterialCatalogue(["Paper", "Ice", "Iron", "Tin Bronze", "Iridium"],
+                             [0.8, 0.92, 7.87, 8.8, 22.56],
+                             ["white", "light blue", "grey", "#cd7f32", "silver"])
+
+
+def test_default_config_has_the_presets():
+    catalogue = materials.load_catalogue(use_cache=False)
+    assert catalogue.names[0] == "Custom"
+    assert catalogue.density("Ice") == 0.92
+    assert catalogue.color("Brick") == "#bc4a3c"
+
+
+def test_prefix_and_substring_search():
+    catalogue = make_catalogue()
+    assert catalogue.prefix_search("i") == ["Ice", "Iridium", "Iron"]
+    assert catalogue.search("ir") == ["Iridium", "Iron"]
+    assert catalogue.search("on") == ["Iron", "Tin Bronze"]
+    assert catalogue.search("e", limit=2) == ["Paper", "Ice"]
+
+
+def test_density_range_query():
+    catalogue = make_catalogue()
+    assert catalogue.in_density_range(0.9, 8.8) == ["Ice", "Iron", "Tin Bronze"]
+
+
+def test_binary_cache_round_trip(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"materials": [
+        {"name": "Cork", "density": 0.24, "color": "tan"},
+        {"name": "Lead", "density": 11.34},
+    ]}))
+
+    first = materials.load_catalogue(str(config_path))
+    assert os.path.exists(materials.cache_path_for(str(config_path)))
+
+    cached = MaterialCatalogue.read_cache(materials.cache_path_for(str(config_path)), os.stat(config_path))
+    assert cached.names == first.names == ["Cork", "Lead"]
+    assert cached.colors == ["tan", "black"]
+    assert cached.density("Lead") == 11.34
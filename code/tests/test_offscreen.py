@@ -0,0 +1,105 @@
+import os
+import struct
+import subprocess
+import sys
+import zlib
+
+import numpy as np
+
+import offscreen
+
+
+def decode_png(data):
+    width, height = struct.unpack(">II", data[16:24])
+    length = struct.unpack(">I", data[33:37])[0]
+    raw = np.frombuffer(zlib.decompress(data[41:41 + length]), dtype=np.uint8)
+    return raw.reshape(height, 1 + 4 * width)[:, 1:].reshape(height, width, 4)[..., :3]
+
+
+def decode_lzw(data, min_code_size):
+    # Plain GIF LZW decoder, enough to check the encoder's output
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little")
+    clear, end = 1 << min_code_size, (1 << min_code_size) + 1
+    position, code_size, table, previous, out = 0, min_code_size + 1, None, None, []
+    while True:
+        code = int(sum(int(bit) << i for i, bit in enumerate(bits[position:position + code_size])))
+        position += code_size
+        if code == clear:
+            table = [[i] for i in range(clear)] + [None, None]
+            code_size, previous = min_code_size + 1, None
+            continue
+        if code == end:
+            return out
+        entry = table[code] if code < len(table) else table[previous] + table[previous][:1]
+        out.extend(entry)
+        if previous is not None:
+            table.append(table[previous] + entry[:1])
+            if len(table) == 1 << code_size and code_size < 12:
+                code_size += 1
+        previous = code
+
+
+def test_rasterizes_wave_polygon_and_rectangles():
+    items = [
+        ("polygon", (0, 10, 0, 5, 9, 5, 9, 10), "#5cb5e1"),
+        ("rectangle", (2, 2, 4, 4), "black"),
+    ]
+    image = offscreen.to_rgb(offscreen.rasterize(items, 10, 10))
+
+    assert image[0, 0].tolist() == [255, 255, 255]
+    assert image[7, 4].tolist() == [0x5c, 0xb5, 0xe1]
+    assert image[4, 8].tolist() == [255, 255, 255]
+    assert image[3, 3].tolist() == [0, 0, 0]
+    assert image[5:, :9].reshape(-1, 3).tolist() == [[0x5c, 0xb5, 0xe1]] * 45
+
+
+def test_png_round_trip():
+    image = offscreen.rasterize([("rectangle", (1, 1, 3, 2), "#102030")], 4, 3)
+    decoded = decode_png(offscreen.encode_png(image))
+    assert np.array_equal(decoded, offscreen.to_rgb(image))
+
+
+def test_gif_frame_decodes_to_the_changed_region():
+    previous = offscreen.rasterize([], 40, 30)
+    image = offscreen.rasterize([("rectangle", (5, 6, 25, 16), "#cd7f32")], 40, 30)
+    frame = offscreen.encode_gif_frame(image, previous, 2)
+
+    descriptor = frame.index(b"\x2C")
+    left, top, width, height, flags = struct.unpack("<HHHHB", frame[descriptor + 1:descriptor + 10])
+    assert (left, top, width, height) == (5, 6, 20, 10)
+    palette_size = 3 << ((flags & 7) + 1)
+    palette = np.frombuffer(frame[descriptor + 10:descriptor + 10 + palette_size], dtype=np.uint8).reshape(-1, 3)
+
+    position = descriptor + 10 + palette_size
+    min_code_size = frame[position]
+    position += 1
+    data = b""
+    while frame[position]:
+        data += frame[position + 1:position + 1 + frame[position]]
+        position += 1 + frame[position]
+
+    pixels = palette[decode_lzw(data, min_code_size)].reshape(height, width, 3)
+    assert np.array_equal(pixels, offscreen.to_rgb(image)[6:16, 5:25])
+
+
+def test_recorded_frames_are_deterministic():
+    objects = [(0.8, 5, "white"), (2.7, 5, "#848789")]
+    first = offscreen.record_frames(0.5, objects=objects)
+    second = offscreen.record_frames(0.5, objects=objects)
+    assert len(first) == 20
+    assert first == second
+    assert first[0] != first[-1]
+
+
+def test_gif_delays_add_up_to_the_clip_length():
+    delays = [offscreen.frame_delay_cs(index, 25) for index in range(400)]
+    assert set(delays) == {2, 3}
+    assert sum(delays) == 400 * 25 // 10  # 10 s of 25 ms frames
+
+
+def test_headless_recording_does_not_need_tk():
+    code_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", "import sys, offscreen; offscreen.record_frames(0.05); "
+                             "print('tkinter' in sys.modules)"], cwd=code_dir, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip() == "False"
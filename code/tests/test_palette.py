@@ -0,0 +1,27 @@
+from palette import LIQUID_COLORS, ColorTransition, DensityColorMap
+
+
+def test_color_map_covers_slider_range():
+    assert len(LIQUID_COLORS.hex_table) == 151
+    assert LIQUID_COLORS.color(0.5) == "#5cb5e1"
+    assert LIQUID_COLORS.color(2.0) == "#bc9337"
+    # Out of range densities clamp to the ends
+    assert LIQUID_COLORS.color(17) == "#bc9337"
+
+
+def test_color_map_blends_between_anchors():
+    color_map = DensityColorMap(anchors=[(0.5, "#000000"), (1.5, "#c8c8c8")], low=0.5, high=1.5)
+    assert color_map.rgb(1.0) == (100, 100, 100)
+
+
+def test_transition_converges_and_then_stops():
+    transition = ColorTransition((0, 0, 0))
+    transition.set_target((255, 128, 10))
+    changes = 0
+    for _ in range(1000):
+        if transition.advance() is not None:
+            changes += 1
+    assert transition.converged
+    assert transition.color == "#ff800a"
+    assert transition.advance() is None
+    assert 0 < changes < 1000
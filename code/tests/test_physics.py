@@ -0,0 +1,37 @@
+import numpy as np
+
+from physics import BuoyancyIntegrator
+
+
+def test_sinking_object_reaches_terminal_velocity():
+    physics = BuoyancyIntegrator()
+    size, density = np.array([20.0]), np.array([2.7])
+    y, v = np.array([500.0]), np.array([0.0])  # Already fully submerged below a surface at 400
+
+    y, v = physics.advance(y, v, 5.0, size, density, 1.0, 400)
+
+    assert np.allclose(v, physics.terminal_velocity(size, density, 1.0), rtol=1e-3)
+
+
+def test_floating_object_settles_at_its_draft():
+    physics = BuoyancyIntegrator()
+    size, density = np.array([20.0, 30.0]), np.array([0.5, 0.9])
+    y, v = np.array([350.0, 300.0]), np.zeros(2)
+
+    y, v = physics.advance(y, v, 20.0, size, density, 1.0, 400)
+
+    assert np.allclose(y, physics.equilibrium_y(size, density, 1.0, 400), atol=1e-3)
+    assert np.allclose(v, 0, atol=1e-3)
+
+
+def test_substeps_are_independent_of_frame_length():
+    size, density = np.array([20.0]), np.array([1.5])
+    coarse, fine = BuoyancyIntegrator(), BuoyancyIntegrator()
+    y0, v0 = np.array([380.0]), np.array([0.0])
+
+    y1, v1 = coarse.advance(y0, v0, 1.0, size, density, 1.0, 400)
+    y2, v2 = y0, v0
+    for _ in range(40):
+        y2, v2 = fine.advance(y2, v2, 0.025, size, density, 1.0, 400)
+
+    assert np.allclose(y1, y2, atol=1e-6)
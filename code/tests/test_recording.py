@@ -0,0 +1,138 @@
+import numpy as np
+
+from benchmarks.fake_canvas import RecordingCanvas
+from benchmarks.suite import FrameClock
+import recording
+from recording import EVENT_DENSITY, EVENT_OBJECTS, ReplayAnimation, SessionPlayer, SessionRecorder
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation
+
+
+def make_world():
+    canvas = RecordingCanvas()
+    clock = FrameClock()
+    scheduler = FrameScheduler(canvas, clock=clock)
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=scheduler)
+    liquid.animate()
+    scene = ObjectScene(canvas, liquid, 800)
+    return canvas, clock, scheduler, scene
+
+
+def run(canvas, clock, frames):
+    for _ in range(frames):
+        clock.advance()
+        canvas.run_timers()
+
+
+def record_session(path, max_frames=None, close=True):
+    canvas, clock, scheduler, scene = make_world()
+    recorder = SessionRecorder(str(path), scene, max_frames=max_frames)
+    recorder.attach(scheduler)
+    snapshots = []
+
+    def snapshot(steps):
+        snapshots.append((scene.liquid_animation.offset, scene.y[:scene.count].copy()))
+    scheduler.add_observer(snapshot)
+
+    run(canvas, clock, 10)
+    scene.add_many([0.5, 2.0, 7.0], [5.0, 5.0, 5.0], ["#ff0000", "black", "light blue"])
+    run(canvas, clock, 40)
+    scene.set_liquid_density(1.5)
+    run(canvas, clock, 50)
+    if close:
+        recorder.close()
+    return snapshots
+
+
+def test_any_frame_can_be_read_back(tmp_path):
+    path = tmp_path / "session.dsr"
+    snapshots = record_session(path)
+    player = SessionPlayer(str(path))
+    assert len(player) == len(snapshots) == 100
+
+    for index in (99, 0, 57, 10, 11):
+        frame = player.frame(index)
+        offset, ys = snapshots[index]
+        assert frame["offset"] == offset
+        assert np.allclose(frame["y"][:frame["count"]], ys)
+    assert player.frame(10)["events"] & EVENT_OBJECTS
+    assert player.frame(50)["events"] & EVENT_DENSITY
+    assert player.frame(-1)["liquid_density"] == 1.5
+
+
+def test_unclosed_recording_is_readable(tmp_path):
+    # As left behind by a crash: close() never ran
+    for max_frames in (None, 30):
+        path = tmp_path / f"crashed-{max_frames}.dsr"
+        snapshots = record_session(path, max_frames=max_frames, close=False)
+        player = SessionPlayer(str(path))
+        assert len(player) == min(100, max_frames or 100)
+        assert player.frame(-1)["offset"] == snapshots[99][0]
+
+
+def test_ring_recording_keeps_the_latest_frames(tmp_path):
+    path = tmp_path / "ring.dsr"
+    snapshots = record_session(path, max_frames=30)
+    player = SessionPlayer(str(path))
+    assert len(player) == 30
+    assert player.frame(0)["offset"] == snapshots[70][0]
+    assert player.frame(29)["offset"] == snapshots[99][0]
+
+
+def test_unbounded_recording_grows(tmp_path, monkeypatch):
+    monkeypatch.setattr(recording, "GROWTH", 16)
+    path = tmp_path / "grown.dsr"
+    snapshots = record_session(path)
+    player = SessionPlayer(str(path))
+    assert len(player) == 100
+    assert player.frame(99)["offset"] == snapshots[99][0]
+
+
+def test_replay_draws_recorded_positions_in_both_directions(tmp_path):
+    path = tmp_path / "session.dsr"
+    snapshots = record_session(path)
+    player = SessionPlayer(str(path))
+
+    canvas = RecordingCanvas()
+    clock = FrameClock()
+    scheduler = FrameScheduler(canvas, clock=clock)
+    shown = []
+    replay = ReplayAnimation(canvas, player, scheduler, on_frame=shown.append)
+    replay.seek(60)
+    ys = sorted(canvas.coords(item)[1] for item, _ in replay.items.values())
+    assert np.allclose(ys, sorted(snapshots[60][1]), atol=1e-3)
+
+    replay.play(-1)
+    run(canvas, clock, 5)
+    assert shown[-1] == 55
+    replay.seek(98)
+    replay.play(1)
+    run(canvas, clock, 5)
+    assert shown[-1] == 99
+    assert "replay" not in scheduler.animations
+
+    replay.seek(0)
+    assert replay.items == {}  # No objects had been dropped yet
+
+
+def test_recording_widens_when_the_scene_outgrows_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(recording, "WIDEN_CHUNK", 7)  # Several chunks, the first one partial
+    path = tmp_path / "session.dsr"
+    canvas, clock, scheduler, scene = make_world()
+    recorder = SessionRecorder(str(path), scene, max_objects=4)
+    recorder.attach(scheduler)
+    scene.add_many([0.5, 2.0, 7.0], [5.0] * 3, ["black"] * 3)
+    run(canvas, clock, 30)
+    early = scene.y[:3].copy()
+    scene.add_many([0.5] * 100, [5.0] * 100, ["black"] * 100)
+    run(canvas, clock, 20)
+    recorder.close()
+
+    player = SessionPlayer(str(path))
+    assert player.max_objects >= 103 and len(player) == 50
+    assert np.allclose(player.frame(29)["y"][:3], early)
+    assert player.frame(29)["count"] == 3 and not player.frame(29)["alive"][3:].any()
+    last = player.frame(-1)
+    assert last["count"] == 103
+    assert np.allclose(last["y"][:103], scene.y[:103])
@@ -0,0 +1,97 @@
+import tkinter
+
+import pytest
+
+from benchmarks.fake_canvas import RecordingCanvas
+from benchmarks.suite import FrameClock
+from render_layer import RenderLayer, tcl_script
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation, ObjectAnimation
+
+
+def test_unchanged_values_never_reach_the_canvas():
+    canvas = RecordingCanvas()
+    layer = FrameScheduler(canvas).render_layer(canvas)
+    item = layer.create_rectangle(0, 0, 10, 10, fill="black")
+    canvas.reset_calls()
+    layer.coords(item, [0, 0, 10, 10])
+    layer.itemconfig(item, fill="black")
+    assert layer.itemcget(item, "fill") == "black"
+    assert layer.coords(item) == [0, 0, 10, 10]
+    assert canvas.call_count == 0
+
+    # Outside a tick a change is sent at once
+    layer.move(item, 5, 0)
+    assert canvas.calls == {"batch": 1}
+    assert canvas.coords(item) == [5, 0, 15, 10]
+
+
+def test_one_batch_per_frame_however_many_objects_move():
+    canvas = RecordingCanvas()
+    clock = FrameClock()
+    scheduler = FrameScheduler(canvas, clock=clock)
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=scheduler)
+    liquid.animate()
+    scene = ObjectScene(canvas, liquid, 800)
+    scene.add_many([0.5, 2.0] * 25, [5.0] * 50, ["black"] * 50)
+    cubes = [canvas.create_rectangle(i, 0, i + 10, 10) for i in range(10)]
+    for cube in cubes:
+        ObjectAnimation(canvas, cube, liquid).sink_cube()
+
+    for _ in range(5):
+        canvas.reset_calls()
+        clock.advance()
+        canvas.run_timers()
+        assert canvas.calls == {"batch": 1}
+    assert canvas.coords(cubes[0])[1] == 10
+    assert canvas.coords(int(scene.items[0]))[1] == scene.y[0]
+
+
+def test_deleted_items_drop_their_pending_changes():
+    canvas = RecordingCanvas()
+    scheduler = FrameScheduler(canvas)
+    layer = RenderLayer(canvas, scheduler)
+    item = layer.create_polygon(0, 0, 1, 1, 2, 0)
+    scheduler.ticking = True  # As if inside a frame
+    layer.coords(item, [0, 0, 1, 2, 2, 0])
+    layer.delete(item)
+    layer.flush()
+    assert canvas.calls["batch"] == 0
+
+
+def test_tcl_script_sends_each_change_once():
+    script = tcl_script(".c", [(3, [1, 2.5, 3, 4], None), (7, None, {"fill": "#5cb5e1", "state": "hidden"})])
+    assert script.splitlines() == [".c coords 3 1.0 2.5 3.0 4.0",
+                                   ".c itemconfigure 7 -fill #5cb5e1 -state hidden"]
+
+
+def test_tcl_script_keeps_any_value_intact():
+    # What tk.eval sees on a real canvas: .c stands in for the canvas command and records its arguments
+    interpreter = tkinter.Tcl()
+    interpreter.eval("proc .c {args} {lappend ::calls $args}")
+    values = ["a}b", "a{b", "ends with \\", "[exit]", "$x", 'say "hi"; bye', "two\nlines", ""]
+    interpreter.eval(tcl_script(".c", [(1, [0, 1], {"text": value}) for value in values]))
+    calls = interpreter.splitlist(interpreter.getvar("calls"))
+    assert [interpreter.splitlist(call)[-1] for call in calls[1::2]] == values
+
+
+class Failing:
+    def step(self):
+        raise RuntimeError("broken animation")
+
+
+def test_a_failing_tick_does_not_hold_back_later_changes():
+    canvas = RecordingCanvas()
+    clock = FrameClock()
+    scheduler = FrameScheduler(canvas, clock=clock)
+    layer = scheduler.render_layer(canvas)
+    item = layer.create_rectangle(0, 0, 10, 10)
+    scheduler.add("broken", Failing())
+    clock.advance()
+    with pytest.raises(RuntimeError):
+        canvas.run_timers()
+    assert not scheduler.ticking
+
+    layer.move(item, 5, 0)
+    assert canvas.coords(item) == [5, 0, 15, 10]
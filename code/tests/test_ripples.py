@@ -0,0 +1,69 @@
+import numpy as np
+
+from benchmarks.fake_canvas import RecordingCanvas
+from ripples import RippleSurface
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation
+
+
+def test_disturbance_spreads_reflects_and_decays():
+    surface = RippleSurface(400, damping=1.0)
+    surface.disturb(100, 20, 5.0)
+    assert abs(surface.heights.mean()) < 1e-9
+
+    for _ in range(10):
+        surface.step(0.025)
+    # After 0.25 s the pulse has split and travelled wave_speed * t = 50 px each way
+    peaks = np.flatnonzero(surface.heights > 0.5 * surface.heights.max())
+    assert peaks.min() < 60 and peaks.max() > 140
+
+    for _ in range(30):
+        surface.step(0.025)
+    # The left half has bounced off the wall at x = 0 and is coming back
+    assert surface.heights[:100].max() > 0.5
+
+    for _ in range(600):
+        surface.step(0.025)
+    assert np.abs(surface.heights).max() < 0.05
+    assert abs(surface.heights.mean()) < 1e-9
+
+
+def test_substeps_respect_the_cfl_limit():
+    surface = RippleSurface(100, cell=1, wave_speed=200)
+    surface.step(0.025)
+    assert surface.substeps * 0.9 >= 200 * 0.025
+
+
+def test_only_crossing_objects_splash():
+    surface = RippleSurface(400)
+    xs = np.array([50.0, 150.0, 250.0])
+    sizes = np.full(3, 20.0)
+    old_bottoms = np.array([395.0, 395.0, 410.0])
+    new_bottoms = np.array([405.0, 397.0, 412.0])
+    assert surface.splash(xs, sizes, old_bottoms, new_bottoms, np.full(3, 80.0), 400.0) == 1
+    # Only the first object's column is pushed down; elsewhere is just the level correction
+    assert surface.heights[60] > 3
+    assert np.isclose(surface.heights[160], surface.heights[260])
+
+
+def test_sample_downsamples_to_polygon_columns():
+    surface = RippleSurface(100)
+    surface.heights[:] = np.arange(101)
+    assert surface.sample(np.array([0.0, 17.0, 34.0, 100.0])).tolist() == [0, 17, 34, 100]
+
+
+def test_objects_dropped_into_a_ripple_surface_disturb_it():
+    canvas = RecordingCanvas()
+    scheduler = FrameScheduler(canvas, clock=lambda: 0.0)
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=scheduler)
+    liquid.set_ripples(True)
+    scene = ObjectScene(canvas, liquid, 800)
+    scene.add(2.0, 5.0, "black", x=400)
+    for _ in range(200):
+        liquid.step()
+        scene.step()
+    assert np.abs(liquid.ripples.heights).max() > 0
+    liquid.render()
+    surface = canvas.coords(liquid.water_polygon)[3:-2:2]
+    assert len(set(surface)) > 1
@@ -0,0 +1,90 @@
+import numpy as np
+
+from benchmarks.fake_canvas import RecordingCanvas
+from physics import BuoyancyIntegrator
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation
+
+
+def make_scene():
+    canvas = RecordingCanvas()
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=FrameScheduler(canvas))
+    return canvas, liquid, ObjectScene(canvas, liquid, 800, capacity=2)
+
+
+def run_until_still(scene, limit=1000):
+    for _ in range(limit):
+        if not scene.step():
+            break
+    scene.render()
+
+
+def test_objects_move_to_float_and_sink_targets():
+    canvas, liquid, scene = make_scene()
+    floating = scene.add(0.8, 5, "white", x=200)
+    sinking = scene.add(2.7, 5, "grey", x=600)
+
+    run_until_still(scene)
+
+    assert scene.y[floating] == liquid.wave_center - 20
+    assert scene.y[sinking] == liquid.wave_center + 130
+    assert canvas.items[int(scene.items[sinking])]["coords"][1] == liquid.wave_center + 130
+
+
+def test_storage_grows_past_capacity():
+    canvas, liquid, scene = make_scene()
+    slots = scene.add_many(np.full(500, 0.9), np.full(500, 5.0), ["white"] * 500)
+    assert len(scene) == 500
+    assert scene.capacity >= 500
+    assert len(set(slots.tolist())) == 500
+
+
+def test_removed_rectangles_are_reused():
+    canvas, liquid, scene = make_scene()
+    first = scene.add(0.8, 5, "white", x=200)
+    item = int(scene.items[first])
+    scene.remove(first)
+    second = scene.add(2.7, 5, "grey", x=200)
+
+    assert int(scene.items[second]) == item
+    assert canvas.calls["create_rectangle"] == 1
+    assert canvas.items[item]["state"] == "normal"
+
+
+def test_render_only_touches_moved_objects():
+    canvas, liquid, scene = make_scene()
+    scene.add_many([0.8, 2.7], [5, 5], ["white", "grey"])
+    run_until_still(scene)
+    canvas.reset_calls()
+
+    scene.render()
+    assert canvas.call_count == 0
+
+
+def test_physics_mode_settles_at_equilibrium_draft():
+    canvas, liquid, scene = make_scene()
+    scene.set_physics(BuoyancyIntegrator(floor_y=600))
+    floating = scene.add(0.5, 8, "white", x=200)
+    sinking = scene.add(2.7, 5, "grey", x=600)
+
+    run_until_still(scene, limit=5000)
+
+    size = scene.size[floating]
+    draft = scene.y[floating] + size - liquid.wave_center
+    assert abs(draft - size * 0.5) < 0.6
+    assert scene.y[sinking] + scene.size[sinking] == 600
+    assert not scene.moving.any()
+
+
+def test_density_change_retargets_only_flipped_objects():
+    canvas, liquid, scene = make_scene()
+    scene.add_many([0.8, 1.2, 2.7], [5, 5, 5], ["white"] * 3)
+    run_until_still(scene)
+
+    flipped = scene.set_liquid_density(1.5)
+
+    assert flipped.tolist() == [1]
+    assert scene.moving.tolist()[:3] == [False, True, False]
+    run_until_still(scene)
+    assert scene.y[1] == liquid.wave_center - 20
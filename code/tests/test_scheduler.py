@@ -0,0 +1,108 @@
+from scheduler import Coalescer, FrameScheduler
+
+
+class FakeWidget:
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Counter:
+    def __init__(self, limit=None):
+        self.steps = 0
+        self.renders = 0
+        self.limit = limit
+
+    def step(self):
+        self.steps += 1
+        return self.limit is None or self.steps < self.limit
+
+    def render(self):
+        self.renders += 1
+
+
+def run_tick(widget, clock, elapsed_ms):
+    clock.now += elapsed_ms / 1000
+    (after_id, callback), = widget.pending.items()
+    del widget.pending[after_id]
+    callback()
+
+
+def test_single_timer_drives_all_animations():
+    widget, clock = FakeWidget(), FakeClock()
+    scheduler = FrameScheduler(widget, clock=clock)
+    first, second = Counter(), Counter()
+    scheduler.add("a", first)
+    scheduler.add("b", second)
+    assert len(widget.pending) == 1
+
+    run_tick(widget, clock, 25)
+    assert (first.steps, first.renders) == (1, 1)
+    assert (second.steps, second.renders) == (1, 1)
+    assert len(widget.pending) == 1
+
+
+def test_replacing_a_key_cancels_the_old_animation():
+    widget, clock = FakeWidget(), FakeClock()
+    scheduler = FrameScheduler(widget, clock=clock)
+    old, new = Counter(), Counter()
+    scheduler.add("cube", old)
+    scheduler.add("cube", new)
+
+    run_tick(widget, clock, 25)
+    assert old.steps == 0
+    assert new.steps == 1
+
+
+def test_falling_behind_drops_frames_and_renders_once():
+    widget, clock = FakeWidget(), FakeClock()
+    scheduler = FrameScheduler(widget, max_steps=4, clock=clock)
+    animation = Counter()
+    scheduler.add("a", animation)
+
+    run_tick(widget, clock, 250)
+    assert animation.steps == 4
+    assert animation.renders == 1
+    assert scheduler.dropped_frames == 6
+
+
+def test_pauses_when_nothing_is_moving():
+    widget, clock = FakeWidget(), FakeClock()
+    scheduler = FrameScheduler(widget, clock=clock)
+    scheduler.add("a", Counter(limit=2))
+
+    run_tick(widget, clock, 25)
+    assert scheduler.running
+    run_tick(widget, clock, 25)
+    assert not scheduler.running
+    assert widget.pending == {}
+
+
+def test_coalescer_applies_latest_value_once_per_tick():
+    widget, clock = FakeWidget(), FakeClock()
+    scheduler = FrameScheduler(widget, clock=clock)
+    applied = []
+    apply = Coalescer(scheduler, "density", applied.append)
+
+    for value in (1.0, 1.1, 1.2):
+        apply(value)
+    run_tick(widget, clock, 25)
+
+    assert applied == [1.2]
+    assert not scheduler.running
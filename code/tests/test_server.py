@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import numpy as np
+
+from benchmarks.fake_canvas import RecordingCanvas
+from benchmarks.server_load import connect, masked_frame
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from server import SessionBank, SimulatorServer, decode_frame, read_websocket_message
+from simulation import LiquidAnimation
+
+
+def test_bank_moves_objects_like_the_scene():
+    canvas = RecordingCanvas()
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=FrameScheduler(canvas))
+    scene = ObjectScene(canvas, liquid, 800)
+    bank = SessionBank()
+    session = bank.open()
+    for density in (0.5, 2.0, 0.9):
+        scene.add(density, 5.0, "black", x=400)
+        bank.add_object(session, density, 5.0)
+    for _ in range(120):
+        scene.step()
+        bank.step()
+    assert np.allclose(bank.y[session, :3], scene.y[:3])
+
+    scene.set_liquid_density(1.5)
+    bank.set_density(session, 1.5)
+    for _ in range(120):
+        scene.step()
+        bank.step()
+    assert np.allclose(bank.y[session, :3], scene.y[:3])
+
+
+def test_frames_carry_only_what_changed():
+    bank = SessionBank(capacity=2)
+    first, second, third = bank.open(), bank.open(), bank.open()  # Grows past the initial capacity
+    bank.add_object(second, 2.0, 5.0)
+    bank.step()
+    frames = [decode_frame(frame) for frame in bank.frames([first, second, third])]
+    assert frames[0]["density"] == 1.0 and frames[0]["objects"] == {}
+    assert frames[1]["objects"] == {0: bank.y[second, 0]}
+
+    # Nothing new for the idle sessions: a bare header with the wave phase
+    bank.step()
+    frames = [decode_frame(frame) for frame in bank.frames([first, third])]
+    assert all("density" not in frame and frame["objects"] == {} for frame in frames)
+    assert frames[0]["offset"] == 2
+
+    bank.close(second)
+    assert len(bank) == 2
+    assert bank.open() == second
+
+
+def test_malformed_input_is_ignored():
+    server = SimulatorServer(port=0)
+    session = server.bank.open()
+    for message in ([1, 2], "density", {"type": "density"}, {"type": "density", "value": None},
+                    {"type": "density", "value": "abc"}, json.loads('{"type": "density", "value": NaN}'),
+                    {"type": "density", "value": float("inf")}, {"type": "add", "material": ["Iron"]}):
+        server.handle_input(session, None, message)
+    assert server.bank.liquid_density[session] == 1.0
+    server.handle_input(session, None, {"type": "density", "value": "5"})
+    assert server.bank.liquid_density[session] == 2.0
+
+
+def test_one_bad_session_does_not_cost_the_others_their_frame():
+    bank = SessionBank()
+    first, second = bank.open(), bank.open()
+    bank.liquid_density[first] = float("nan")  # Cannot be coloured
+    bank.density_dirty[[first, second]] = True
+    frames = bank.frames([first, second])
+    assert frames[0] is None
+    assert decode_frame(frames[1])["density"] == 1.0
+
+
+async def upgrade_without_key():
+    server = await SimulatorServer(port=0).start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n\r\n")
+        status = await reader.readline()
+        writer.close()
+        return status
+    finally:
+        await server.stop()
+
+
+def test_upgrade_without_key_is_rejected():
+    assert asyncio.run(upgrade_without_key()).startswith(b"HTTP/1.1 400")
+
+
+async def exercise_server(clients):
+    server = await SimulatorServer(port=0).start()
+    try:
+        connections = [await connect("127.0.0.1", server.port) for _ in range(clients)]
+        hellos = [json.loads((await read_websocket_message(reader))[1]) for reader, _ in connections]
+
+        reader, writer = connections[0]
+        writer.write(masked_frame(json.dumps({"type": "add", "material": "Iron"}).encode()))
+        writer.write(masked_frame(json.dumps({"type": "density", "value": 1.7}).encode()))
+        added, moved, density = None, {}, None
+        for _ in range(40):
+            opcode, payload = await read_websocket_message(reader)
+            if opcode == 0x1:
+                added = json.loads(payload)
+            else:
+                frame = decode_frame(payload)
+                moved.update(frame["objects"])
+                density = frame.get("density", density)
+
+        # Every other client kept receiving frames
+        for other_reader, _ in connections[1:]:
+            opcode, payload = await read_websocket_message(other_reader)
+            assert opcode == 0x2
+        stats = server.stats()
+        for _, other_writer in connections:
+            other_writer.close()
+        return hellos, added, moved, density, stats
+    finally:
+        await server.stop()
+
+
+def test_server_streams_sessions_over_websockets():
+    hellos, added, moved, density, stats = asyncio.run(exercise_server(20))
+    assert len(hellos) == 20 and hellos[0]["type"] == "hello" and "Iron" in hellos[0]["materials"]
+    assert added["type"] == "object" and added["color"].startswith("#")
+    assert added["slot"] in moved
+    assert abs(density - 1.7) < 1e-6
+    assert stats["sessions"] == 20
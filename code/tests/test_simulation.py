@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+
+from benchmarks.fake_canvas import RecordingCanvas
+from scene import ObjectScene
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation
+from wave_geometry import WaveGeometry, lod_step
+
+
+def reference_coords(width, height, wave_center, amplitude, period, step, offset):
+    coords = [0, height]
+    segments = math.ceil(width / step)
+    for i in range(segments + 1):
+        x = width * i / segments
+        coords += [x, wave_center + amplitude * math.sin((x + offset) / period)]
+    return coords + [width, height]
+
+
+def test_wave_geometry_matches_sine_loop():
+    geometry = WaveGeometry(1400, 600, 400, amplitude=4, period=50, step=17)
+    for offset in (0, 1, 37, 1000):
+        expected = reference_coords(1400, 600, 400, 4, 50, 17, offset)
+        assert np.allclose(geometry.update(offset), expected)
+
+
+def test_wave_geometry_reuses_its_buffer():
+    geometry = WaveGeometry(800, 600, 400)
+    first = geometry.update(1)
+    second = geometry.update(2)
+    assert first is second
+    assert np.shares_memory(geometry.ys, second)
+
+
+def test_lod_polygon_stays_within_tolerance():
+    for tolerance in (0.1, 0.25, 1.0):
+        geometry = WaveGeometry(800, 600, 400, amplitude=4, period=50, step=lod_step(4, 50, tolerance))
+        for offset in (0, 13, 77):
+            coords = geometry.update(offset)
+            xs = np.linspace(0, 800, 4001)
+            polygon = np.interp(xs, coords[2:-2:2], coords[3:-2:2])
+            exact = 400 + 4 * np.sin((xs + offset) / 50)
+            assert np.abs(polygon - exact).max() <= tolerance * 1.01
+
+
+def test_liquid_follows_the_canvas_size():
+    canvas = RecordingCanvas()
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=FrameScheduler(canvas))
+    coords = canvas.coords(liquid.water_polygon)
+    assert coords[-2:] == [800, 600]
+    assert len(coords) < 2 * 40  # Far fewer vertices than one every 17 px
+
+    tables = liquid.wave.columns
+    liquid.resize(1600, 900)
+    coords = canvas.coords(liquid.water_polygon)
+    assert coords[-2:] == [1600, 900]
+    assert liquid.wave_center == 700
+    liquid.resize(800, 600)
+    assert liquid.wave.columns is tables  # Cached tables are reused
+
+
+def test_scene_resize_keeps_relative_positions():
+    canvas = RecordingCanvas()
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=FrameScheduler(canvas))
+    scene = ObjectScene(canvas, liquid, 800)
+    slot = scene.add(0.5, 5.0, "black", x=200)
+    liquid.resize(1600, 900)
+    scene.resize(1600)
+    assert scene.x[slot] + scene.size[slot] / 2 == 400
+    assert scene.target_y[slot] == liquid.wave_center - 20
+    scene.render()
+    assert canvas.coords(int(scene.items[slot]))[0] == scene.x[slot]
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.fake_canvas import RecordingCanvas
+from scheduler import FrameScheduler
+from simulation import LiquidAnimation
+import startup
+from startup import MILESTONES, StartupTimes, read_first_frame, write_first_frame
+
+
+def test_first_frame_cache_round_trip(tmp_path):
+    path = str(tmp_path / "first_frame.bin")
+    canvas = RecordingCanvas()
+    liquid = LiquidAnimation(canvas, 800, 600, density=1.0, scheduler=FrameScheduler(canvas))
+    coords = canvas.coords(liquid.water_polygon)
+    assert read_first_frame(800, 600, 1.0, path) is None
+
+    write_first_frame(800, 600, 1.0, coords, liquid.color_transition.color, path)
+    assert read_first_frame(800, 600, 1.0, path) == (coords, canvas.itemcget(liquid.water_polygon, "fill"))
+    # Cached for one size and density only
+    assert read_first_frame(1024, 600, 1.0, path) is None
+    assert read_first_frame(800, 600, 1.5, path) is None
+
+    with open(path, "r+b") as cache_file:
+        cache_file.truncate(os.path.getsize(path) - 4)
+    assert read_first_frame(800, 600, 1.0, path) is None
+
+
+def test_cache_is_invalidated_by_the_simulation_sources(tmp_path, monkeypatch):
+    path = str(tmp_path / "first_frame.bin")
+    write_first_frame(800, 600, 1.0, [0, 600, 800, 600], "#5cb5e1", path)
+    monkeypatch.setattr(startup, "FRAME_SOURCES", startup.FRAME_SOURCES + ("layers.py",))
+    assert read_first_frame(800, 600, 1.0, path) is None
+
+
+def test_startup_times_report_once_every_milestone_is_reached():
+    completed = []
+    times = StartupTimes(on_complete=lambda: completed.append(dict(times.times)))
+    for name in MILESTONES[:-1]:
+        times.mark(name)
+    times.mark(MILESTONES[0])
+    assert completed == []
+    times.mark(MILESTONES[-1])
+    assert list(completed[0]) == list(MILESTONES)
+
+
+def test_entry_point_imports_no_simulation_modules():
+    code_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", "import sys, main; print(sorted({'numpy', 'simulation', "
+                             "'scheduler', 'materials'} & set(sys.modules)))"],
+                            cwd=code_dir, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+import buoyancy
+from materials import MaterialCatalogue
+from sweep import SweepGrid, parse_values, read_row_groups, read_table, run_sweep
+
+
+def make_catalogue():
+    return MaterialCatalogue(["Custom", "Ice", "Iron"], [1.0, 0.92, 7.87], ["black", "light blue", "grey"])
+
+
+def test_parse_values():
+    assert parse_values("0.5:0.8:0.1").tolist() == [0.5, 0.6, 0.7, 0.8]
+    assert parse_values("1,5,10").tolist() == [1, 5, 10]
+    # A step that does not divide the range stops short of it rather than past it
+    assert parse_values("1:15:4").tolist() == [1, 5, 9, 13]
+    assert parse_values("0.5:2.0:0.4").tolist() == [0.5, 0.9, 1.3, 1.7]
+    assert parse_values("0.5:2.0:0.01")[-1] == 2.0
+    with pytest.raises(ValueError):
+        parse_values("1:2:0")
+
+
+def test_grid_skips_measurements_the_gui_rejects():
+    grid = SweepGrid(make_catalogue(), ["Ice", "Custom"], [0.9, 1.0], [0, 5, 15, 20], [10, 50, 100])
+    assert grid.volumes.tolist() == [5, 15]
+    assert grid.masses.tolist() == [50, 100]
+    assert len(grid) == 2 * 2 + 2 * 2 * 2
+    assert grid.rejected == (4 * 2 + 3 * 4 * 2) - len(grid)
+
+
+def test_table_round_trip_matches_buoyancy(tmp_path):
+    grid = SweepGrid(make_catalogue(), ["Ice", "Iron", "Custom"], parse_values("0.5:2:0.05"), [1, 5, 15],
+                     [20, 60])
+    path = tmp_path / "sweep.dsw"
+    assert run_sweep(grid, str(path), chunk_rows=7) == len(grid)
+    assert len(list(read_row_groups(str(path)))) > 1
+
+    names, table = read_table(str(path))
+    assert names == ["Ice", "Iron", "Custom"]
+    assert len(table["floats"]) == len(grid)
+    expected = buoyancy.evaluate(table["mass"].astype(float), table["volume"].astype(float),
+                                 table["liquid_density"].astype(float))
+    assert np.array_equal(table["floats"], expected.floats)
+    # Presets keep their density; Custom rows follow from mass and volume
+    ice = table["material"] == 0
+    assert np.allclose(table["object_density"][ice], 0.92)
+    assert not table["floats"][table["material"] == 1].any()
+
+
+def test_csv_output(tmp_path):
+    grid = SweepGrid(make_catalogue(), ["Ice"], [0.9, 1.0], [5], [])
+    path = tmp_path / "sweep.csv"
+    run_sweep(grid, str(path), format="csv")
+    lines = path.read_text().splitlines()
+    assert lines[0].startswith("material,liquid_density")
+    assert [line.split(",")[5] for line in lines[1:]] == ["0", "1"]
+    assert lines[1].startswith("Ice,0.9,5,4.6,0.92")
+
+
+def test_more_than_256_materials(tmp_path):
+    names = [f"Material {i}" for i in range(300)]
+    catalogue = MaterialCatalogue(names, np.linspace(0.5, 2.0, 300), ["black"] * 300)
+    grid = SweepGrid(catalogue, names, [1.0], [5], [])
+    path = tmp_path / "sweep.dsw"
+    run_sweep(grid, str(path))
+    _, table = read_table(str(path))
+    assert table["material"].tolist() == list(range(300))
@@ -0,0 +1,40 @@
+from concurrent.futures import CancelledError
+from math import erf, sqrt
+import threading
+
+import numpy as np
+import pytest
+
+from uncertainty import sweep
+
+
+def test_sweep_matches_the_normal_approximation():
+    # Only the liquid density is uncertain: margin ~ N(1.0 - 0.98, 0.01)
+    result = sweep(49.0, 50.0, 1.0, mass_error=0.0, volume_error=0.0, liquid_error=0.01, samples=200_000,
+                   chunk_size=50_000, seed=1, workers=1)
+    expected = 0.5 * (1 + erf(2 / sqrt(2)))
+    assert abs(result.float_probability - expected) < 0.005
+    assert abs(result.margin_mean - 0.02) < 1e-3
+    assert abs(result.margin_std - 0.01) < 1e-3
+    assert result.histogram.sum() == 200_000
+    assert len(result.bin_edges) == len(result.histogram) + 1
+
+
+def test_pool_and_serial_runs_give_the_same_result():
+    kwargs = dict(samples=100_000, chunk_size=25_000, seed=7)
+    serial = sweep(50.0, 5.0, 10.1, workers=1, **kwargs)
+    pooled = sweep(50.0, 5.0, 10.1, workers=2, **kwargs)
+    assert serial.float_probability == pooled.float_probability
+    assert np.array_equal(serial.histogram, pooled.histogram)
+
+
+def test_clear_cases_are_certain():
+    assert sweep(10.0, 5.0, 1.0, samples=10_000, workers=1).float_probability == 0.0
+    assert sweep(1.0, 5.0, 1.0, samples=10_000, workers=1).float_probability == 1.0
+
+
+def test_a_set_cancel_event_abandons_the_sweep():
+    event = threading.Event()
+    event.set()
+    with pytest.raises(CancelledError):
+        sweep(1.0, 5.0, 1.0, samples=10_000, chunk_size=1_000, workers=1, cancel_event=event)
@@ -0,0 +1,15 @@
+from utils import hex_to_rgb, mass_error, rgb_to_hex, valid_volume, volume_error
+
+
+def test_hex_round_trip():
+    assert hex_to_rgb("#5cb5e1") == [0x5c, 0xb5, 0xe1]
+    assert rgb_to_hex([0x5c, 0xb5, 0xe1]) == "#5cb5e1"
+
+
+def test_measurement_limits():
+    assert mass_error(20) is None and mass_error(100) is None
+    assert "between 20 and 100" in mass_error(19.9)
+    assert volume_error(15) is None
+    assert "15 or below" in volume_error(15.5)
+    assert "above 0" in volume_error(0)
+    assert valid_volume([0, 1, 15, 16]).tolist() == [False, True, True, False]
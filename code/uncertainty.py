@@ -0,0 +1,115 @@
+from collections import namedtuple
+from concurrent.futures import CancelledError, FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import buoyancy
+
+DEFAULT_SAMPLES = 1_000_000
+DEFAULT_CHUNK_SIZE = 250_000
+DEFAULT_BINS = 40
+DEFAULT_RELATIVE_ERROR = 0.02  # Measurement error assumed for mass and volume entries (1 sigma)
+DEFAULT_LIQUID_ERROR = 0.01  # One step of the density slider
+
+# Result of a Monte Carlo sweep:
+#   samples           - number of (mass, volume, liquid density) draws
+#   float_probability - fraction of draws in which the object floats
+#   margin_mean       - mean of liquid density minus object density; floats when >= 0
+#   margin_std        - its standard deviation
+#   histogram         - draws per margin bin; the outer bins also hold everything beyond them
+#   bin_edges         - len(histogram) + 1 margin values
+SweepResult = namedtuple("SweepResult", ["samples", "float_probability", "margin_mean", "margin_std", "histogram",
+                                         "bin_edges"])
+
+
+def margin_range(mass, volume, liquid_density, mass_error, volume_error, liquid_error, spread=5):
+    # Histogram range fixed before sampling: the nominal margin plus or minus `spread`
+    # first-order standard deviations, so every worker bins the same way
+    density = mass / volume
+    sigma = np.sqrt(liquid_error ** 2 + density ** 2 * ((mass_error / mass) ** 2 + (volume_error / volume) ** 2))
+    if sigma == 0:
+        sigma = 0.1
+    nominal = liquid_density - density
+    return nominal - spread * sigma, nominal + spread * sigma
+
+
+def sample_margins(rng, count, mass, volume, liquid_density, mass_error, volume_error, liquid_error):
+    # Normally distributed measurements; mass and volume cannot go below zero
+    masses = np.maximum(rng.normal(mass, mass_error, count), 0.0)
+    volumes = np.maximum(rng.normal(volume, volume_error, count), np.finfo(np.float64).tiny)
+    liquid_densities = rng.normal(liquid_density, liquid_error, count)
+    result = buoyancy.evaluate(masses, volumes, liquid_densities)
+    # Net force per unit of displaced weight is the density margin
+    return result.net_force / (buoyancy.GRAVITY * volumes)
+
+
+def sweep_chunk(job):
+    # Worker: sample one chunk and write its margins straight into the shared block
+    name, samples, start, stop, parameters, seed = job
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        margins = np.ndarray(samples, dtype=np.float64, buffer=block.buf)
+        margins[start:stop] = sample_margins(np.random.default_rng(seed), stop - start, *parameters)
+        del margins  # The view must go before the block can be closed
+    finally:
+        block.close()
+    return stop - start
+
+
+def run_chunks(jobs, pool, cancel_event):
+    # Wait for every chunk, giving up early (and dropping chunks not yet started) once cancelled
+    futures = [pool.submit(sweep_chunk, job) for job in jobs]
+    pending = futures
+    while pending:
+        if cancel_event is not None and cancel_event.is_set():
+            for future in pending:
+                future.cancel()
+            raise CancelledError()
+        done, pending = wait(pending, timeout=0.05, return_when=FIRST_EXCEPTION)
+        for future in done:
+            future.result()  # Re-raise a worker's error
+
+
+def sweep(mass, volume, liquid_density, mass_error=None, volume_error=None, liquid_error=DEFAULT_LIQUID_ERROR,
+          samples=DEFAULT_SAMPLES, chunk_size=DEFAULT_CHUNK_SIZE, bins=DEFAULT_BINS, seed=None, workers=None,
+          pool=None, cancel_event=None):
+    # Monte Carlo estimate of how likely an object is to float given measurement
+    # error. Chunks are sampled and evaluated vectorized across a process pool;
+    # each worker writes its margins into one shared-memory array instead of
+    # pickling them back. Every chunk has its own seed spawned from `seed`, so
+    # the result does not depend on the number of workers. Setting `cancel_event`
+    # abandons the sweep between chunks with CancelledError.
+    if mass_error is None:
+        mass_error = mass * DEFAULT_RELATIVE_ERROR
+    if volume_error is None:
+        volume_error = volume * DEFAULT_RELATIVE_ERROR
+    parameters = (mass, volume, liquid_density, mass_error, volume_error, liquid_error)
+    starts = range(0, samples, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+
+    block = shared_memory.SharedMemory(create=True, size=max(samples, 1) * 8)
+    try:
+        jobs = [(block.name, samples, start, min(start + chunk_size, samples), parameters, chunk_seed)
+                for start, chunk_seed in zip(starts, seeds)]
+        if pool is not None:
+            run_chunks(jobs, pool, cancel_event)
+        elif len(jobs) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as own_pool:
+                run_chunks(jobs, own_pool, cancel_event)
+        else:
+            for job in jobs:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CancelledError()
+                sweep_chunk(job)
+
+        margins = np.ndarray(samples, dtype=np.float64, buffer=block.buf)
+        low, high = margin_range(*parameters)
+        histogram, bin_edges = np.histogram(np.clip(margins, low, high), bins=bins, range=(low, high))
+        result = SweepResult(samples, float(np.count_nonzero(margins >= 0) / samples), float(np.mean(margins)),
+                             float(np.std(margins)), histogram, bin_edges)
+        del margins
+    finally:
+        block.close()
+        block.unlink()
+    return result
@@ -0,0 +1,59 @@
+import numpy as np
+
+# Limits on the measurements a user may enter for an object
+MIN_MASS = 20
+MAX_MASS = 100
+MAX_VOLUME = 15
+
+# Tk colour names used by the simulator; anything else must be given as hex
+NAMED_COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "light blue": (173, 216, 230),
+}
+
+
+def hex_to_rgb(hex_color):
+    return [int(hex_color[i:i + 2], 16) for i in range(1, 7, 2)]
+
+
+def rgb_to_hex(rgb_color):
+    return f'#{int(rgb_color[0]):02x}{int(rgb_color[1]):02x}{int(rgb_color[2]):02x}'
+
+
+def parse_color(color):
+    if color.startswith("#"):
+        digits = color[1:]
+        if len(digits) == 3:
+            digits = "".join(c * 2 for c in digits)
+        return tuple(int(digits[i:i + 2], 16) for i in range(0, 6, 2))
+    try:
+        return NAMED_COLORS[color.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown colour {color!r}; use a hex colour") from None
+
+
+def valid_mass(mass):
+    # Works on single values and on whole arrays of them
+    mass = np.asarray(mass)
+    return (mass >= MIN_MASS) & (mass <= MAX_MASS)
+
+
+def valid_volume(volume):
+    volume = np.asarray(volume)
+    return (volume > 0) & (volume <= MAX_VOLUME)
+
+
+def mass_error(mass):
+    # Message to show for an out-of-range mass, or None if it is fine
+    if not valid_mass(mass):
+        return f"Mass value must be between {MIN_MASS} and {MAX_MASS}."
+    return None
+
+
+def volume_error(volume):
+    if volume > MAX_VOLUME:
+        return f"Volume value must be {MAX_VOLUME} or below."
+    if not valid_volume(volume):
+        return "Volume value must be above 0."
+    return None
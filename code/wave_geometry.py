@@ -0,0 +1,77 @@
+from functools import lru_cache
+import math
+
+import numpy as np
+
+DEFAULT_TOLERANCE = 0.25  # Pixels the polygon may stray from the true sine
+
+
+def lod_step(amplitude, period, tolerance=DEFAULT_TOLERANCE):
+    # Widest column spacing whose straight segments stay within `tolerance` px
+    # of the sine. A chord of length s on a curve of curvature k bulges by about
+    # k * s^2 / 8, and the sine's curvature peaks at amplitude / period^2.
+    if amplitude <= 0:
+        return math.inf
+    return period * math.sqrt(8 * tolerance / amplitude)
+
+
+def column_count(width, step):
+    # Columns needed to cover [0, width] with spacing at most `step`, both edges included
+    return max(1, math.ceil(width / step)) + 1
+
+
+@lru_cache(maxsize=32)
+def wave_tables(width, count, period):
+    # Column positions and their sine/cosine, shared read-only by every polygon of
+    # this size so that resizing back to a size seen before costs nothing
+    xs = np.linspace(0, width, count)
+    tables = (xs, np.sin(xs / period), np.cos(xs / period))
+    for table in tables:
+        table.flags.writeable = False
+    return tables
+
+
+class WaveGeometry:
+    # Builds the liquid polygon for LiquidAnimation.
+    #
+    # The sine profile is tabulated once per column. Since
+    #     sin((x + offset) / period) = sin(x / period) * cos(offset / period)
+    #                                 + cos(x / period) * sin(offset / period)
+    # every frame is a phase shift of the two tables: two scaled multiply-adds
+    # written straight into a preallocated flat coordinate buffer. Columns are
+    # spread evenly over the full width, at most `step` pixels apart.
+    def __init__(self, width, height, wave_center, amplitude=4, period=50, step=17):
+        self.width = width
+        self.height = height
+        self.wave_center = wave_center
+        self.amplitude = amplitude
+        self.period = period
+        self.step = step
+
+        xs, self._sin, self._cos = wave_tables(width, column_count(width, step), period)
+        self.columns = xs
+        self._scratch = np.empty_like(xs)
+
+        # Flat polygon: bottom-left corner, one (x, y) per column, bottom-right corner
+        self.coords = np.empty(2 * (len(xs) + 2), dtype=np.float64)
+        self.coords[0:2] = (0, height)
+        self.coords[2:-2:2] = xs
+        self.coords[-2:] = (width, height)
+        self.ys = self.coords[3:-2:2]  # View onto the y slots, written in place every frame
+
+    @property
+    def point_count(self):
+        return len(self.ys)
+
+    def update(self, offset):
+        phase = offset / self.period
+        np.multiply(self._sin, self.amplitude * math.cos(phase), out=self.ys)
+        np.multiply(self._cos, self.amplitude * math.sin(phase), out=self._scratch)
+        self.ys += self._scratch
+        self.ys += self.wave_center
+        return self.coords
+
+    def set_heights(self, heights):
+        # Surface displaced by `heights` per column instead of the sine, e.g. from a RippleSurface
+        np.add(heights, self.wave_center, out=self.ys)
+        return self.coords